@@ -0,0 +1,148 @@
+"""Cache de agregaciones compartido entre sesiones.
+
+Muchas sesiones miran las mismas vistas (rango completo, sin filtros, la
+localización más popular) y cada una volvía a hacer los mismos groupby.
+``memo`` guarda el resultado de una agregación en un cache del proceso,
+compartido por todas las sesiones, con clave:
+
+    (dataset, versión de los datos, filtros normalizados, id de la agregación)
+
+- Los filtros se normalizan: el orden de una selección múltiple no importa
+  y las fechas se comparan por su valor.
+- Tamaño acotado en bytes (``AGREGADOS_MAX_MB``) con expulsión LRU.
+- Cuando un dataset aparece con una versión nueva (se recargaron los datos)
+  se descartan todas sus entradas anteriores.
+- Contadores de aciertos, fallos y expulsiones en ``estadisticas()``.
+- Varias sesiones que fallan la misma clave a la vez esperan un único
+  cálculo (``vuelo.py``).
+
+Los valores devueltos son compartidos: quien los usa no debe modificarlos.
+
+Variables de entorno:
+    AGREGADOS_MAX_MB (256)
+"""
+import datetime
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import tiempos
+import vuelo
+
+MAX_BYTES = int(os.environ.get('AGREGADOS_MAX_MB', '256')) * 2**20
+
+
+def normalizar(valor):
+    """Forma canónica y hashable de un estado de filtros."""
+    if isinstance(valor, dict):
+        return tuple(sorted((str(k), normalizar(v)) for k, v in valor.items()))
+    if isinstance(valor, (list, set, frozenset)):
+        return tuple(sorted((normalizar(v) for v in valor), key=repr))
+    if isinstance(valor, tuple):
+        return tuple(normalizar(v) for v in valor)
+    if isinstance(valor, (pd.Timestamp, datetime.datetime)):
+        return pd.Timestamp(valor).isoformat()
+    if isinstance(valor, datetime.date):
+        return valor.isoformat()
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return valor
+
+
+def tamano(valor):
+    """Bytes aproximados que ocupa un resultado en memoria."""
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        uso = valor.memory_usage(deep=True, index=True)
+        return int(uso.sum() if isinstance(valor, pd.DataFrame) else uso)
+    if isinstance(valor, np.ndarray):
+        return int(valor.nbytes)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamano(v) for v in valor.values())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(tamano(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+class CacheAgregados:
+    """LRU por bytes de resultados de agregaciones, invalidado por versión de dataset."""
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entradas = OrderedDict()
+        self._versiones = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+
+    def obtener(self, dataset, version, filtros, agregacion, calcular):
+        """Resultado cacheado de ``calcular()`` para esta clave, o lo calcula y guarda."""
+        clave = (dataset, normalizar(version), normalizar(filtros), agregacion)
+        with self._lock:
+            if self._versiones.get(dataset) != clave[1]:
+                self._invalidar(dataset)
+                self._versiones[dataset] = clave[1]
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return self._entradas[clave][0]
+            self.fallos += 1
+
+        # Se calcula fuera del lock para no bloquear las demás claves; las
+        # sesiones que piden esta misma clave a la vez esperan un único cálculo.
+        valor = vuelo.compartido((id(self), clave), calcular)
+        peso = tamano(valor)
+        with self._lock:
+            if peso > self.max_bytes or self._versiones.get(dataset) != clave[1]:
+                return valor
+            if clave not in self._entradas:
+                self._entradas[clave] = (valor, peso)
+                self._bytes += peso
+            while self._bytes > self.max_bytes:
+                _, (_, liberado) = self._entradas.popitem(last=False)
+                self._bytes -= liberado
+                self.expulsiones += 1
+        return valor
+
+    def _invalidar(self, dataset):
+        for clave in [c for c in self._entradas if c[0] == dataset]:
+            self._bytes -= self._entradas.pop(clave)[1]
+
+    def estadisticas(self):
+        """Aciertos, fallos, expulsiones, entradas y bytes ocupados."""
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+                'expulsiones': self.expulsiones,
+                'entradas': len(self._entradas),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+CACHE = CacheAgregados()
+
+
+def memo(dataset, version, filtros, agregacion, calcular):
+    """Atajo a ``CACHE.obtener`` (el cache compartido por todo el proceso)."""
+    with tiempos.etapa('agregacion', agregacion):
+        return CACHE.obtener(dataset, version, filtros, agregacion, calcular)
+
+
+def estadisticas():
+    return CACHE.estadisticas()
+
+
+def resumen():
+    """Texto corto con los contadores, para el sidebar."""
+    e = CACHE.estadisticas()
+    return (f"Cache de agregados: {e['aciertos']:,} aciertos / {e['fallos']:,} fallos "
+            f"({e['tasa_aciertos']:.0%}) · {e['bytes'] / 2**20:,.1f} MB")
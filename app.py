@@ -1,15 +1,27 @@
 # app.py
+import os
 import streamlit as st
 import pandas as pd
 import numpy as np
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, text
 import plotly.express as px
-from datetime import datetime
+from datetime import datetime, timedelta
+
+import agregados
+from conexion import get_engine, uri_de
+from consultas import EXPR_INSTRUCTOR, FROM_ASISTENCIAS
+import fitness
+from muestreo import serie_reducida
+from paneles import panel
+import refresco
+from tabla import tabla_paginada
+import tiempos
 
 # ----------------------------------------------
 # CONFIGURACIÓN DE ESTILO (AZUL MARINO)
 # ----------------------------------------------
 st.set_page_config(page_title="Dashboard Club Fitness", layout="wide")
+tiempos.iniciar("fitness")
 
 # CSS para personalizar colores
 st.markdown("""
@@ -77,54 +89,112 @@ st.markdown("""
 
 # Paleta para Plotly
 COLOR_MARINO = ["#0A2342", "#185ADB", "#39A9DB", "#A2D6F9"]
+DIAS_SEMANA = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
 
 # ----------------------------------------------
 # CONEXIÓN A BASE DE DATOS
 # ----------------------------------------------
-DB_CONFIG = {
-    "user": "sql10810884",
-    "password": "9ZKaWJmkeq",
-    "host": "sql10.freesqldatabase.com",
-    "port": 3306,
-    "database": "sql10810884",
-}
-
-@st.cache_resource
-def get_engine():
-    conn_str = (
-        f"mysql+pymysql://{DB_CONFIG['user']}:{DB_CONFIG['password']}"
-        f"@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
-    )
-    return create_engine(conn_str)
-
-MAIN_QUERY = """
-SELECT 
-    a.id_asistencia,
-    a.fecha_inicio,
-    a.hora_inicio,
-    a.intensidad_percibida,
-    s.id_socios,
-    CONCAT(s.nombre, ' ', IFNULL(s.apellido_paterno,'')) AS socio,
-    c.id_clase,
-    c.nombre AS clase,
-    c.zona AS sala,
-    i.id_instructor,
-    CONCAT(i.nombre, ' ', IFNULL(i.apellido_paterno,'')) AS instructor
-FROM asistencia a
-JOIN socios s ON a.id_socio = s.id_socios
-LEFT JOIN socios_clases sc ON sc.id_socio = s.id_socios
-LEFT JOIN clases c ON sc.id_clase = c.id_clase
-LEFT JOIN instructor i ON c.id_instructor = i.id_instructor
-ORDER BY a.fecha_inicio, a.hora_inicio;
-"""
-
-@st.cache_data(ttl=600)
+# URI desde FITNESS_DB_URI (ver conexion.py); el engine con pool es compartido
+DB_URI = uri_de("fitness")
+
+# Modo de cálculo por defecto: "pandas" (trae todas las filas) o "SQL"
+# (GROUP BY en la base de datos). Se puede cambiar desde el sidebar.
+MODOS_CALCULO = ["pandas", "SQL"]
+MODO_DEFECTO = os.environ.get("MODO_AGREGACION", "pandas")
+
 def load_data():
-    engine = get_engine()
-    with engine.connect() as conn:
-        df = pd.read_sql(text(MAIN_QUERY), conn)
-    df['fecha_inicio'] = pd.to_datetime(df['fecha_inicio']).dt.date
-    return df
+    """Última carga de asistencias lista y su versión; se refresca en segundo plano (refresco.py)."""
+    return refresco.registrar(
+        f"asistencias:{DB_URI}",
+        lambda version: fitness.cargar(DB_URI, version),
+        version=lambda: fitness.version(DB_URI),
+    ).actual()
+
+
+# Sin ttl: ``version`` (el sondeo de fitness.version) cambia cuando cambian
+# los datos, y con ella la clave del cache
+@st.cache_data(max_entries=4)
+def load_opciones(version):
+    """Rango de fechas y valores de los filtros, sin traer las asistencias."""
+    engine = get_engine(DB_URI)
+    with tiempos.etapa("consulta", "opciones"), engine.connect() as conn:
+        rango = conn.execute(
+            text("SELECT MIN(fecha_inicio), MAX(fecha_inicio) FROM asistencia")
+        ).one()
+        clases = pd.read_sql(text(
+            f"SELECT DISTINCT c.nombre AS clase {FROM_ASISTENCIAS} "
+            "WHERE c.nombre IS NOT NULL"
+        ), conn)
+        instructores = pd.read_sql(text(
+            f"SELECT DISTINCT {EXPR_INSTRUCTOR} AS instructor {FROM_ASISTENCIAS} "
+            f"WHERE {EXPR_INSTRUCTOR} IS NOT NULL"
+        ), conn)
+    min_date = pd.to_datetime(rango[0]).date() if rango[0] is not None else None
+    max_date = pd.to_datetime(rango[1]).date() if rango[1] is not None else None
+    return min_date, max_date, clases['clase'].tolist(), instructores['instructor'].tolist()
+
+
+def where_filtros(start_date, end_date, clases, instructores):
+    """Arma el WHERE parametrizado equivalente a los filtros de pandas."""
+    condiciones = ["a.fecha_inicio >= :inicio", "a.fecha_inicio < :fin"]
+    params = {"inicio": start_date, "fin": end_date + timedelta(days=1)}
+    binds = []
+    if clases:
+        condiciones.append("c.nombre IN :clases")
+        params["clases"] = list(clases)
+        binds.append(bindparam("clases", expanding=True))
+    if instructores:
+        condiciones.append(f"{EXPR_INSTRUCTOR} IN :instructores")
+        params["instructores"] = list(instructores)
+        binds.append(bindparam("instructores", expanding=True))
+    return " WHERE " + " AND ".join(condiciones), params, binds
+
+
+@st.cache_data(max_entries=256)
+def load_agregados(start_date, end_date, clases, instructores, version):
+    """Calcula KPIs y series de los gráficos con GROUP BY en la base de datos.
+
+    Usa el mismo join que MAIN_QUERY, así que los números coinciden con el
+    modo pandas (incluida la multiplicación por clases inscritas).
+    """
+    where, params, binds = where_filtros(start_date, end_date, clases, instructores)
+
+    def consulta(sql):
+        return text(sql).bindparams(*binds)
+
+    engine = get_engine(DB_URI)
+    with tiempos.etapa("consulta", "agregados"), engine.connect() as conn:
+        kpis = conn.execute(consulta(
+            f"SELECT COUNT(*), COUNT(DISTINCT s.id_socios) {FROM_ASISTENCIAS} {where}"
+        ), params).one()
+        bar_df = pd.read_sql(consulta(
+            f"SELECT c.nombre AS clase, COUNT(*) AS asistencias {FROM_ASISTENCIAS} {where} "
+            "AND c.nombre IS NOT NULL GROUP BY c.nombre ORDER BY c.nombre"
+        ), conn, params=params)
+        pie_df = pd.read_sql(consulta(
+            f"SELECT {EXPR_INSTRUCTOR} AS instructor, COUNT(*) AS asistencias "
+            f"{FROM_ASISTENCIAS} {where} AND {EXPR_INSTRUCTOR} IS NOT NULL "
+            f"GROUP BY {EXPR_INSTRUCTOR} ORDER BY instructor"
+        ), conn, params=params)
+        line_df = pd.read_sql(consulta(
+            f"SELECT DATE(a.fecha_inicio) AS fecha_inicio, COUNT(*) AS asistencias "
+            f"{FROM_ASISTENCIAS} {where} GROUP BY DATE(a.fecha_inicio) ORDER BY fecha_inicio"
+        ), conn, params=params)
+    line_df['fecha_inicio'] = pd.to_datetime(line_df['fecha_inicio'])
+    return int(kpis[0]), int(kpis[1]), bar_df, pie_df, line_df
+
+
+def clase_mas_asistida(conteos):
+    """Clase con más asistencias de ``conteos`` (clase -> asistencias), o "N/A".
+
+    En un empate gana la primera en orden alfabético: los dos modos cuentan
+    lo mismo pero no en el mismo orden, y ``idxmax`` se queda con la primera
+    que encuentra.
+    """
+    pares = [(clase, int(n)) for clase, n in conteos.items() if n > 0]
+    if not pares:
+        return "N/A"
+    return min(pares, key=lambda par: (-par[1], str(par[0])))[0]
 
 
 # ----------------------------------------------
@@ -133,21 +203,42 @@ def load_data():
 st.title("📊 Dashboard de Asistencias – Club Fitness")
 
 
+# ----------------------------------------------
+# SIDEBAR - MODO DE CÁLCULO
+# ----------------------------------------------
+modo = st.sidebar.radio(
+    "Modo de cálculo",
+    MODOS_CALCULO,
+    index=MODOS_CALCULO.index(MODO_DEFECTO) if MODO_DEFECTO in MODOS_CALCULO else 0,
+    help="pandas: trae todas las asistencias. SQL: agrega en la base de datos.",
+)
+
+
 # ----------------------------------------------
 # Cargar Datos
 # ----------------------------------------------
-df = load_data()
+if modo == "SQL":
+    VERSION = fitness.version(DB_URI)
+    min_date, max_date, clases_disp, instr_disp = load_opciones(VERSION)
+    if min_date is None:
+        st.error("❌ No se encontraron datos en la base.")
+        st.stop()
+else:
+    df, VERSION = load_data()
 
-if df.empty:
-    st.error("❌ No se encontraron datos en la base.")
-    st.stop()
+    if df.empty:
+        st.error("❌ No se encontraron datos en la base.")
+        st.stop()
+
+    min_date, max_date = df['fecha_inicio'].min().date(), df['fecha_inicio'].max().date()
+    clases_disp = df['clase'].dropna().unique().tolist()
+    instr_disp = df['instructor'].dropna().unique().tolist()
 
 # ----------------------------------------------
 # SIDEBAR - FILTROS
 # ----------------------------------------------
 st.sidebar.header("🔎 Filtros")
 
-min_date, max_date = df['fecha_inicio'].min(), df['fecha_inicio'].max()
 date_range = st.sidebar.date_input("Rango de fechas", (min_date, max_date))
 
 if isinstance(date_range, tuple):
@@ -155,20 +246,88 @@ if isinstance(date_range, tuple):
 else:
     start_date = end_date = date_range
 
-selected_clases = st.sidebar.multiselect("Clase", df['clase'].dropna().unique())
-selected_instr = st.sidebar.multiselect("Instructor", df['instructor'].dropna().unique())
 
-# Aplicación de filtros
-filt = pd.Series(True, index=df.index)
-filt &= df['fecha_inicio'] >= start_date
-filt &= df['fecha_inicio'] <= end_date
 
-if selected_clases:
-    filt &= df['clase'].isin(selected_clases)
-if selected_instr:
-    filt &= df['instructor'].isin(selected_instr)
+def filtro_multiple(etiqueta, opciones, clave):
+    """Multiselect del sidebar cuya selección sobrevive al cambio de modo.
+
+    Cada modo arma sus opciones por separado y, sin ``key``, Streamlit crea
+    otro widget y la selección se pierde. Con ``key`` el valor queda en
+    ``st.session_state``; solo se descartan los valores que ya no están.
+    """
+    opciones = sorted(opciones)
+    if clave in st.session_state:
+        st.session_state[clave] = [v for v in st.session_state[clave] if v in opciones]
+    return st.sidebar.multiselect(etiqueta, opciones, key=clave)
 
-df_filtered = df[filt]
+
+selected_clases = filtro_multiple("Clase", clases_disp, "filtro_clases")
+selected_instr = filtro_multiple("Instructor", instr_disp, "filtro_instructores")
+
+if modo == "SQL":
+    total_asist, socios_distintos, bar_df, pie_df, line_df = load_agregados(
+        start_date, end_date, tuple(selected_clases), tuple(selected_instr), VERSION
+    )
+    clase_top = clase_mas_asistida(bar_df.set_index('clase')['asistencias'])
+else:
+    # Aplicación de filtros
+    with tiempos.etapa("filtros"):
+        filt = pd.Series(True, index=df.index)
+        filt &= df['fecha_inicio'] >= pd.Timestamp(start_date)
+        filt &= df['fecha_inicio'] <= pd.Timestamp(end_date)
+
+        if selected_clases:
+            filt &= df['clase'].isin(selected_clases)
+        if selected_instr:
+            filt &= df['instructor'].isin(selected_instr)
+
+        df_filtered = df[filt]
+
+    # Las agregaciones se comparten entre sesiones (agregados.py) con esta clave
+    FILTROS = (start_date, end_date, selected_clases, selected_instr)
+
+    def kpis():
+        clase_top = clase_mas_asistida(df_filtered['clase'].value_counts())
+        return len(df_filtered), df_filtered['id_socios'].nunique(), clase_top
+
+    total_asist, socios_distintos, clase_top = agregados.memo(
+        "asistencias", VERSION, FILTROS, "kpis", kpis
+    )
+
+
+def conteo_por(columna):
+    """Asistencias por ``columna``: del GROUP BY ya hecho (SQL) o del frame filtrado.
+
+    En modo pandas solo se agrupa cuando el panel que lo usa está abierto, y el
+    resultado queda en el cache compartido de agregados.
+    """
+    if modo == "SQL":
+        return {"clase": bar_df, "instructor": pie_df, "fecha_inicio": line_df}[columna]
+    return agregados.memo(
+        "asistencias", VERSION, FILTROS, f"conteo_{columna}",
+        lambda: df_filtered.groupby(columna, observed=True).size().reset_index(name="asistencias"),
+    )
+
+
+def calor_por(columna):
+    """Asistencias por valor de ``columna``, día de la semana y hora: ``(valores, conteos)``.
+
+    ``conteos`` tiene forma (valores, 7, 24). Sale de un solo ``np.bincount``
+    sobre el código combinado (valor·7 + día)·24 + hora, sin groupby; las
+    filas con valor u hora nulos (código -1) quedan fuera.
+    """
+    def calcular():
+        grupos = df_filtered[columna].astype("category")
+        codigos = grupos.cat.codes.to_numpy()
+        hora = df_filtered["hora"].to_numpy()
+        dia = df_filtered["dia_semana"].to_numpy()
+        validas = (codigos >= 0) & (hora >= 0) & (dia >= 0)
+        celda = (codigos[validas].astype(np.int64) * 7 + dia[validas]) * 24 + hora[validas]
+        n = len(grupos.cat.categories)
+        conteos = np.bincount(celda, minlength=n * 7 * 24).reshape(n, 7, 24)
+        return list(grupos.cat.categories), conteos
+
+    return agregados.memo("asistencias", VERSION, FILTROS, f"calor_{columna}", calcular)
 
 
 # ----------------------------------------------
@@ -177,22 +336,22 @@ df_filtered = df[filt]
 with st.expander("📌 Indicadores / KPIs (clic para abrir)", expanded=True):
     col1, col2, col3 = st.columns(3)
 
-    col1.metric("Total de Asistencias", len(df_filtered))
-    col2.metric("Socios Distintos", df_filtered['id_socios'].nunique())
-
-    clase_top = (
-        df_filtered['clase'].value_counts().idxmax()
-        if df_filtered['clase'].notna().any()
-        else "N/A"
-    )
+    col1.metric("Total de Asistencias", total_asist)
+    col2.metric("Socios Distintos", socios_distintos)
     col3.metric("Clase con Más Asistencias", clase_top)
 
 
 # ----------------------------------------------
 # TABLA DE DATOS
 # ----------------------------------------------
-with st.expander("📄 Tabla de Datos (clic para mostrar/ocultar)", expanded=False):
-    st.dataframe(df_filtered, use_container_width=True)
+@panel("📄 Tabla de Datos (clic para mostrar/ocultar)")
+def tabla_datos():
+    if modo == "SQL":
+        st.info("La tabla de asistencias solo está disponible en modo pandas.")
+    else:
+        tabla_paginada(df_filtered, "asistencias",
+                       firma=(VERSION, start_date, end_date,
+                              tuple(selected_clases), tuple(selected_instr)))
 
 
 # ----------------------------------------------
@@ -201,51 +360,88 @@ with st.expander("📄 Tabla de Datos (clic para mostrar/ocultar)", expanded=Fal
 st.subheader("📈 Visualizaciones")
 
 # ----------- 1. BARRAS -----------
-bar_df = df_filtered.groupby('clase').size().reset_index(name="asistencias")
-
-with st.expander("📊 Asistencias por Clase (Barras)"):
+@panel("📊 Asistencias por Clase (Barras)")
+def barras_clase():
+    bar_df = conteo_por("clase")
     if bar_df.empty:
         st.info("No hay datos suficientes.")
     else:
-        fig = px.bar(
-            bar_df,
-            x="clase",
-            y="asistencias",
-            title="Asistencias por Clase",
-            color="clase",
-            color_discrete_sequence=COLOR_MARINO,
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        with tiempos.etapa("figura"):
+            fig = px.bar(
+                bar_df,
+                x="clase",
+                y="asistencias",
+                title="Asistencias por Clase",
+                color="clase",
+                color_discrete_sequence=COLOR_MARINO,
+            )
+        tiempos.plotly_chart(fig, use_container_width=True)
 
 # ----------- 2. PIE CHART -----------
-pie_df = df_filtered.groupby('instructor').size().reset_index(name="asistencias")
-
-with st.expander("🧩 Asistencias por Instructor (Pie Chart)"):
+@panel("🧩 Asistencias por Instructor (Pie Chart)")
+def pie_instructor():
+    pie_df = conteo_por("instructor")
     if pie_df.empty:
         st.info("No hay datos suficientes.")
     else:
-        fig = px.pie(
-            pie_df,
-            values="asistencias",
-            names="instructor",
-            title="Asistencias por Instructor",
-            color_discrete_sequence=COLOR_MARINO,
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        with tiempos.etapa("figura"):
+            fig = px.pie(
+                pie_df,
+                values="asistencias",
+                names="instructor",
+                title="Asistencias por Instructor",
+                color_discrete_sequence=COLOR_MARINO,
+            )
+        tiempos.plotly_chart(fig, use_container_width=True)
 
 # ----------- 3. LÍNEA -----------
-line_df = df_filtered.groupby("fecha_inicio").size().reset_index(name="asistencias")
-
-with st.expander("📈 Asistencias por Fecha (Línea)"):
+@panel("📈 Asistencias por Fecha (Línea)")
+def linea_fecha():
+    line_df = conteo_por("fecha_inicio")
     if line_df.empty:
         st.info("No hay datos suficientes.")
     else:
-        fig = px.line(
-            line_df,
-            x="fecha_inicio",
-            y="asistencias",
-            markers=True,
-            title="Asistencias por Fecha",
-            color_discrete_sequence=["#185ADB"],
+        with tiempos.etapa("figura"):
+            fig = px.line(
+                serie_reducida(line_df, "fecha_inicio", "asistencias"),
+                x="fecha_inicio",
+                y="asistencias",
+                markers=True,
+                title="Asistencias por Fecha",
+                color_discrete_sequence=["#185ADB"],
+            )
+        tiempos.plotly_chart(fig, use_container_width=True)
+
+
+# ----------- 4. MAPA DE CALOR -----------
+@panel("🗓️ Asistencias por Hora y Día de la Semana (Mapa de calor)")
+def calor_hora_dia():
+    if modo == "SQL":
+        st.info("El mapa de calor solo está disponible en modo pandas.")
+        return
+    col_por, col_valor = st.columns(2)
+    por = col_por.radio("Agrupar por", ["Clase", "Sala"], horizontal=True, key="calor_por")
+    valores, conteos = calor_por({"Clase": "clase", "Sala": "sala"}[por])
+    con_datos = [v for v, total in zip(valores, conteos.sum(axis=(1, 2))) if total]
+    if not con_datos:
+        st.info("No hay datos suficientes.")
+        return
+    valor = col_valor.selectbox(por, ["(Todas)"] + con_datos, key=f"calor_{por}")
+    matriz = conteos.sum(axis=0) if valor == "(Todas)" else conteos[valores.index(valor)]
+
+    with tiempos.etapa("figura"):
+        fig = px.imshow(
+            matriz,
+            x=[f"{h:02d}:00" for h in range(24)],
+            y=DIAS_SEMANA,
+            labels={"x": "Hora", "y": "Día", "color": "Asistencias"},
+            color_continuous_scale=COLOR_MARINO[::-1],
+            aspect="auto",
+            title=f"Asistencias por Hora y Día — {valor}",
         )
-        st.plotly_chart(fig, use_container_width=True)
+    tiempos.plotly_chart(fig, use_container_width=True)
+
+
+# Contadores del cache de agregados (al final: incluye los paneles de esta ejecución)
+st.sidebar.caption(agregados.resumen())
+tiempos.finalizar()
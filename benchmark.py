@@ -0,0 +1,121 @@
+"""Benchmark de lectura: conversión posterior vs lectura tipada.
+
+Compara, sobre las bases que crea ``generar_datos.py``, dos formas de
+cargar las consultas de los dashboards:
+
+- posterior: ``pd.read_sql`` y luego ``to_datetime`` / ``astype`` por cada
+  columna declarada (lo que hacían los loaders antes)
+- tipada: ``conexion.leer_en_bloques`` con el esquema de ``consultas.py``,
+  que decodifica cada valor directo a su arreglo NumPy
+
+Con ``--hotel`` compara en cambio la carga completa del hotel (lectura y
+armado de las cuatro tablas de hechos, ver ``hotel.py``):
+
+- join: la consulta única de 11 tablas, deduplicada en pandas
+- paralela: una consulta por tabla en un pool de hilos y joins por clave
+
+Cada corrida se hace en un proceso nuevo para que el pico de memoria
+(ru_maxrss) sea el de esa lectura y no el de las anteriores.
+
+Uso:
+    python benchmark.py --escala 10k
+    python benchmark.py --escala 1m --casos hotel ventas --repeticiones 1
+    python benchmark.py --escala 1m --hotel
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+from sqlalchemy import text
+
+import consultas
+import hotel
+from conexion import get_engine, leer_en_bloques
+
+CASOS = {
+    'fitness': (consultas.MAIN_QUERY, consultas.COLUMNAS_ASISTENCIA, None),
+    'ventas': (consultas.QUERY_VENTAS, consultas.COLUMNAS_VENTAS, {'ultimo_id': 0}),
+    'hotel': (consultas.SELECT_HOTEL + consultas.FROM_HOTEL, consultas.COLUMNAS_HOTEL, None),
+}
+MODOS = ('posterior', 'tipada')
+
+CARGAS_HOTEL = {
+    'join': hotel.consultar_hotel,
+    'paralela': hotel.consultar_hotel_paralelo,
+}
+
+
+def leer_posterior(engine, query, columnas, params):
+    """read_sql a columnas object y conversión columna por columna."""
+    with engine.connect() as conn:
+        df = pd.read_sql(text(query), conn, params=params)
+    for col, dtype in columnas.items():
+        if str(dtype).startswith('datetime64'):
+            df[col] = pd.to_datetime(df[col])
+        elif dtype == 'float64':
+            df[col] = df[col].astype(float)
+    return df
+
+
+def correr(caso, modo, uri):
+    """Una lectura en el proceso actual: (filas, segundos, MB de pico)."""
+    engine = get_engine(uri)
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    t0 = time.perf_counter()
+    if caso == 'carga_hotel':
+        # Filas: las de la tabla de hechos más grande
+        filas = max(len(df) for df in CARGAS_HOTEL[modo](engine).values())
+    else:
+        query, columnas, params = CASOS[caso]
+        if modo == 'tipada':
+            df = leer_en_bloques(engine, query, columnas, params=params)
+        else:
+            df = leer_posterior(engine, query, columnas, params)
+        filas = len(df)
+    segundos = time.perf_counter() - t0
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base
+    return filas, segundos, pico / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--escala', default='10k', help='Sufijo de las bases en datos/ (10k, 1m, ...)')
+    parser.add_argument('--casos', nargs='+', choices=list(CASOS), default=list(CASOS))
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--hotel', action='store_true',
+                        help='Comparar la carga del hotel: join único vs consultas en paralelo')
+    args = parser.parse_args()
+
+    if args.hotel:
+        corridas = [('carga_hotel', 'hotel', list(CARGAS_HOTEL))]
+    else:
+        corridas = [(caso, caso, MODOS) for caso in args.casos]
+
+    contexto = multiprocessing.get_context('spawn')
+    print(f"{'caso':<12} {'modo':<10} {'filas':>10} {'segundos':>9} {'MB pico':>9}")
+    for caso, base, modos in corridas:
+        uri = f'sqlite:///datos/{base}_{args.escala}.db'
+        for modo in modos:
+            resultados = []
+            for _ in range(args.repeticiones):
+                try:
+                    with ProcessPoolExecutor(1, mp_context=contexto) as pool:
+                        resultados.append(pool.submit(correr, caso, modo, uri).result())
+                except BrokenProcessPool:
+                    # El proceso murió (p. ej. sin memoria): se informa y se sigue
+                    break
+            if not resultados:
+                print(f"{caso:<12} {modo:<10} {'falló (proceso terminado)':>30}")
+                continue
+            filas, segundos, pico = min(resultados, key=lambda r: r[1])
+            print(f"{caso:<12} {modo:<10} {filas:>10,} {segundos:>9.2f} {pico:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
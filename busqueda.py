@@ -0,0 +1,115 @@
+"""Índice de búsqueda para los posts del blog (títulos y etiquetas).
+
+Se construye una vez por versión de los datos, sobre todos los posts, y
+responde búsquedas sin recorrer todas las filas:
+
+- índice exacto de etiquetas: etiqueta en minúsculas -> posiciones
+- índice de trigramas sobre los títulos en minúsculas -> posiciones
+
+Los filtros de autor y fecha llegan como máscara booleana y se aplican a
+las posiciones encontradas (``intersectar``). Las consultas de menos de 3
+caracteres no tienen trigramas: se resuelven con ``str.contains`` sobre
+las filas de la máscara, que para textos tan cortos es más rápido que unir
+las listas de todos los trigramas que los contienen.
+
+Las búsquedas devuelven posiciones de fila (np.ndarray ordenado) para usarse
+con ``df.iloc``.
+"""
+import numpy as np
+import pandas as pd
+
+SEPARADOR_ETIQUETAS = ','
+
+
+def _trigramas(texto):
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def _a_arreglos(indice, dtype):
+    return {clave: np.asarray(pos, dtype=dtype) for clave, pos in indice.items()}
+
+
+def intersectar(posiciones, mascara):
+    """Aplica una máscara booleana (por fila) a un arreglo de posiciones."""
+    if mascara is None:
+        return posiciones
+    return posiciones[np.asarray(mascara)[posiciones]]
+
+
+class IndiceBusqueda:
+    """Índice de trigramas de títulos + índice exacto de etiquetas."""
+
+    def __init__(self, titulos, etiquetas):
+        # Serie de texto de pandas (no object): str.contains vectorizado
+        self.titulos = pd.Series(titulos, dtype='str').fillna('').str.lower().reset_index(drop=True)
+        self.n = len(self.titulos)
+        # Posiciones en int32 mientras alcance: la mitad de memoria
+        self.dtype = np.int32 if self.n < 2**31 else np.int64
+
+        trigramas = {}
+        for pos, titulo in enumerate(self.titulos):
+            for tri in _trigramas(titulo):
+                trigramas.setdefault(tri, []).append(pos)
+        self.trigramas = _a_arreglos(trigramas, self.dtype)
+
+        tags = {}
+        for pos, texto in enumerate(etiquetas):
+            if not isinstance(texto, str):
+                continue
+            for tag in {t.strip().lower() for t in texto.split(SEPARADOR_ETIQUETAS)}:
+                if tag:
+                    tags.setdefault(tag, []).append(pos)
+        self.etiquetas = _a_arreglos(tags, self.dtype)
+
+    def _todas(self, mascara):
+        if mascara is None:
+            return np.arange(self.n, dtype=self.dtype)
+        return np.flatnonzero(mascara).astype(self.dtype, copy=False)
+
+    def buscar_titulo(self, texto, mascara=None):
+        """Posiciones (dentro de ``mascara``) cuyo título contiene ``texto`` (subcadena, sin regex)."""
+        txt = texto.strip().lower()
+        vacio = np.empty(0, dtype=self.dtype)
+        if not txt:
+            return self._todas(mascara)
+
+        if len(txt) < 3:
+            filas = self._todas(mascara)
+            titulos = self.titulos if mascara is None else self.titulos.take(filas)
+            return filas[titulos.str.contains(txt, regex=False).to_numpy(dtype=bool)]
+
+        listas = []
+        for tri in _trigramas(txt):
+            pos = self.trigramas.get(tri)
+            if pos is None:
+                return vacio
+            listas.append(pos)
+        listas.sort(key=len)
+        candidatos = intersectar(listas[0], mascara)
+        for pos in listas[1:]:
+            if candidatos.size == 0:
+                return vacio
+            candidatos = np.intersect1d(candidatos, pos, assume_unique=True)
+
+        if len(txt) == 3:
+            return candidatos
+        # Tener todos los trigramas no garantiza la subcadena: se verifica
+        contiene = self.titulos.take(candidatos).str.contains(txt, regex=False)
+        return candidatos[contiene.to_numpy(dtype=bool)]
+
+    def buscar_etiqueta(self, texto, mascara=None):
+        """Posiciones (dentro de ``mascara``) que tienen exactamente la etiqueta ``texto``."""
+        pos = self.etiquetas.get(texto.strip().lower(), np.empty(0, dtype=self.dtype))
+        return intersectar(pos, mascara)
+
+    def buscar(self, texto, mascara=None):
+        """Posiciones cuyo título contiene ``texto`` o que tienen esa etiqueta."""
+        titulo = self.buscar_titulo(texto, mascara)
+        etiqueta = self.buscar_etiqueta(texto, mascara)
+        if etiqueta.size == 0:
+            return titulo
+        # Unión marcando filas: lineal, sin el sort/hash de np.union1d
+        marcas = np.zeros(self.n, dtype=bool)
+        marcas[titulo] = True
+        marcas[etiqueta] = True
+        return np.flatnonzero(marcas).astype(self.dtype, copy=False)
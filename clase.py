@@ -1,33 +1,113 @@
+import os
+from datetime import timedelta
+
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 import streamlit as st
 
+from busqueda import IndiceBusqueda
+from compactar import compactar
+from conexion import get_engine, group_concat, uri_de
+from consultas import ORIGEN_BLOG, VERSION_BLOG
+from tabla import tabla_paginada
+import tiempos
+import versiones
+
 st.title('Blog UNIVALLE')
 st.set_page_config(page_title='Blog', page_icon='📝', layout='wide')
-
-usuario = 'root'
-contraseña = ''
-host = 'localhost'
-puerto = 3306
-base = 'blog_univalle'
-
-conexion_str = f'mysql+pymysql://{usuario}:{contraseña}@{host}:{puerto}/{base}'
-engine = create_engine(conexion_str)
-
-query="""
-   SELECT 
-    p.id_post,
-    p.titulo,
-    p.fecha_publicacion,
-    u.nombre_usuario AS autor,
-    GROUP_CONCAT(e.texto_etiqueta SEPARATOR ', ') AS etiquetas
-FROM post p
-JOIN usuario u ON u.id_usuario = p.id_usuario
-LEFT JOIN etiqueta e ON e.id_post = p.id_post
-GROUP BY p.id_post, p.titulo, p.fecha_publicacion, u.nombre_usuario
-ORDER BY p.fecha_publicacion DESC;
-"""
-df = pd.read_sql_query(query, engine)
+tiempos.iniciar('blog')
+
+# Cadena de conexión desde BLOG_DB_URI (ver conexion.py)
+conexion_str = uri_de('blog')
+
+# Los caches se indexan por la versión de los datos (ver versiones.py), que
+# se sondea en cada ejecución y cambia con los posts nuevos. El ttl
+# (BLOG_CACHE_TTL, en segundos; 0 = sin vencimiento) cubre los cambios que
+# el sondeo no ve, como un título editado en una base sin UPDATE_TIME.
+VERSION = versiones.actual(get_engine(conexion_str), VERSION_BLOG, ORIGEN_BLOG)
+TTL_CACHE = int(os.environ.get('BLOG_CACHE_TTL', '3600')) or None
+
+COLUMNAS = ['id_post', 'titulo', 'fecha_publicacion', 'autor', 'etiquetas']
+
+
+@st.cache_data(max_entries=4, ttl=TTL_CACHE)
+def load_opciones(version):
+    """Autores y rango de fechas para armar los filtros del sidebar."""
+    with tiempos.etapa('consulta', 'opciones'), get_engine(conexion_str).connect() as conn:
+        autores = pd.read_sql_query(text(
+            "SELECT DISTINCT u.nombre_usuario AS autor "
+            "FROM post p JOIN usuario u ON u.id_usuario = p.id_usuario "
+            "ORDER BY u.nombre_usuario"
+        ), conn)
+        fechas = pd.read_sql_query(text(
+            "SELECT MIN(fecha_publicacion) AS fecha_min, "
+            "MAX(fecha_publicacion) AS fecha_max FROM post"
+        ), conn)
+    return (
+        autores['autor'].tolist(),
+        pd.to_datetime(fechas['fecha_min'].iloc[0]),
+        pd.to_datetime(fechas['fecha_max'].iloc[0]),
+    )
+
+
+@st.cache_data(max_entries=256, ttl=TTL_CACHE)
+def load_posts(autor, fecha_desde, fecha_hasta, version):
+    """Posts con sus etiquetas, filtrados por autor y fecha en el WHERE.
+
+    Cada combinación (autor, fechas) queda en cache, así que volver a una
+    combinación ya vista no consulta la base de datos.
+    """
+    condiciones = ["p.fecha_publicacion >= :desde", "p.fecha_publicacion < :hasta"]
+    params = {'desde': fecha_desde, 'hasta': fecha_hasta + timedelta(days=1)}
+    if autor is not None:
+        condiciones.append("u.nombre_usuario = :autor")
+        params['autor'] = autor
+
+    engine = get_engine(conexion_str)
+    query=f"""
+       SELECT 
+        p.id_post,
+        p.titulo,
+        p.fecha_publicacion,
+        u.nombre_usuario AS autor,
+        {group_concat(engine, 'e.texto_etiqueta')} AS etiquetas
+    FROM post p
+    JOIN usuario u ON u.id_usuario = p.id_usuario
+    LEFT JOIN etiqueta e ON e.id_post = p.id_post
+    WHERE {' AND '.join(condiciones)}
+    GROUP BY p.id_post, p.titulo, p.fecha_publicacion, u.nombre_usuario
+    ORDER BY p.fecha_publicacion DESC;
+    """
+    with tiempos.etapa('consulta', 'posts'), engine.connect() as conn:
+        df = pd.read_sql_query(text(query), conn, params=params)
+    with tiempos.etapa('tipos', 'fecha_publicacion'):
+        df['fecha_publicacion'] = pd.to_datetime(df['fecha_publicacion'])
+    return compactar(df, 'blog')
+
+
+@st.cache_resource(max_entries=2, ttl=TTL_CACHE)
+def get_indice(version):
+    """Todos los posts de una versión y su índice de títulos / etiquetas (uno por versión).
+
+    Los filtros de autor y fecha se aplican después como máscara sobre las
+    posiciones encontradas, así que cambiar de filtro no reconstruye el índice.
+    """
+    _, desde, hasta = load_opciones(version)
+    df = load_posts(None, desde.date(), hasta.date(), version)
+    return df, IndiceBusqueda(df['titulo'], df['etiquetas'])
+
+
+def mascara_filtros(df, autor, fecha_desde, fecha_hasta):
+    """Máscara equivalente al WHERE de ``load_posts`` sobre el frame completo."""
+    fechas = df['fecha_publicacion']
+    mascara = (fechas >= pd.Timestamp(fecha_desde)) & \
+        (fechas < pd.Timestamp(fecha_hasta + timedelta(days=1)))
+    if autor is not None:
+        mascara &= df['autor'] == autor
+    return mascara.to_numpy()
+
+
+autores_db, fecha_min, fecha_max = load_opciones(VERSION)
 ##df.to_csv('avg_len_comentarios_usuarios.csv', index=False)
 ##st.write(df)
 
@@ -37,12 +117,9 @@ st.sidebar.title('Filtros')
 texto_busqueda= st.sidebar.text_input('Buscar en titulo  etiqueta', 
                       value='',help='Buscar por titulo o etiqueta')
 
-autores = ["(Todos)"]+df['autor'].unique().tolist()
+autores = ["(Todos)"]+autores_db
 autor_sel= st.sidebar.selectbox('Autor', autores)
 
-fecha_min = df['fecha_publicacion'].min()
-fecha_max = df['fecha_publicacion'].max()
-
 #st.write(autores)
 rango_fechas=st.sidebar.date_input('Fecha publicacion', 
                       value=(fecha_min.date(), fecha_max.date()),
@@ -55,48 +132,42 @@ modo_vista=st.sidebar.radio("Modo Vista",
                             )
 
 cols_sel= st.sidebar.multiselect("Ver solo estas columnas",
-                        df.columns.tolist(),
-                        default=df.columns.tolist()
+                        COLUMNAS,
+                        default=COLUMNAS
                         )
 
-df_filtrado=df.copy()
+# Filtro por autor y rango de fechas (se resuelven en el WHERE de la consulta)
+if isinstance(rango_fechas, (list, tuple)) and len(rango_fechas) == 2:
+    fecha_desde, fecha_hasta = rango_fechas
+elif isinstance(rango_fechas, (list, tuple)) and rango_fechas:
+    fecha_desde = fecha_hasta = rango_fechas[0]
+else:
+    fecha_desde, fecha_hasta = fecha_min.date(), fecha_max.date()
 
-#filtro por texto
+autor_filtro = None if autor_sel == "(Todos)" else autor_sel
 
-# Filtro por texto
+# Filtro por texto: subcadena en el título o etiqueta exacta, con el índice
+# de todos los posts y los filtros de autor y fecha como máscara
 if texto_busqueda.strip():
-    txt = texto_busqueda.strip().lower()
-    df_filtrado = df_filtrado[
-        df_filtrado["titulo"].str.lower().str.contains(txt, na=False)
-        | df_filtrado["etiquetas"].str.lower().str.contains(txt, na=False)
-    ]
-
-if cols_sel:
-    df_filtrado = df_filtrado[cols_sel]
-
-# Filtro por autor
-
-if autor_sel!="(Todos)":
-    df_filtrado = df_filtrado[df_filtrado["autor"] == autor_sel]
+    df_todos, indice = get_indice(VERSION)
+    with tiempos.etapa('filtros', 'busqueda'):
+        mascara = mascara_filtros(df_todos, autor_filtro, fecha_desde, fecha_hasta)
+        df_filtrado = df_todos.iloc[indice.buscar(texto_busqueda, mascara)]
+else:
+    df_filtrado = load_posts(autor_filtro, fecha_desde, fecha_hasta, VERSION)
 
-
-##st.write(df_filtrado)
-
-
-# filtrar por rango de fechas
-
-if rango_fechas:
-    fecha_desde, fecha_hasta = rango_fechas
-    df_filtrado = df_filtrado[(df_filtrado["fecha_publicacion"].dt.date >= fecha_desde) & (df_filtrado["fecha_publicacion"].dt.date <= fecha_hasta)]
+df_vista = df_filtrado[cols_sel] if cols_sel else df_filtrado
 
 st.subheader('Resultados')
 
 st.subheader(f'Número de registros: {len(df_filtrado)}')
 
 if modo_vista == 'Primeros 5 resultados':
-    st.write(df_filtrado.head(5))
+    st.write(df_vista.head(5))
 if modo_vista == 'Tabla Completa':
-    st.write(df_filtrado)
+    tabla_paginada(df_filtrado, 'posts',
+                   firma=(VERSION, autor_filtro, fecha_desde, fecha_hasta, texto_busqueda.strip()),
+                   columnas=cols_sel)
 
 st.markdown("---")
 st.subheader("Resumen de Datos")
@@ -107,9 +178,6 @@ with col2:
     st.write(f"Autores: {len(df_filtrado['autor'].unique())}")
     st.write(f"Etiquetas: {len(df_filtrado['etiquetas'].unique())}")
 
-# Filtro por fecha
-
 
 st.caption("Creado por UNIVALLE - Departamento de Ciencia de Datos")
-
-
+tiempos.finalizar()
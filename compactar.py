@@ -0,0 +1,117 @@
+"""Representación compacta en memoria para los DataFrames de los dashboards.
+
+Todos los loaders pasan su resultado por ``compactar``:
+
+- texto de baja cardinalidad -> ``category``
+- enteros -> el tipo entero más chico que alcance
+- ids flotantes (``id_*`` con nulos por LEFT JOIN) -> entero nullable
+- columnas de ``date`` de Python -> ``datetime64``
+
+Los montos se dejan en float64: en float32 las sumas de millones de filas
+ya se desvían en los centavos de los KPIs.
+
+El reporte de bytes antes / después por columna queda en ``REPORTES``
+(por nombre de loader) y se escribe en el log.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+import tiempos
+
+logger = logging.getLogger(__name__)
+
+# Máxima proporción de valores distintos para convertir texto a category
+UMBRAL_CATEGORIA = 0.5
+
+REPORTES = {}
+
+
+def _compactar_columna(serie, umbral):
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie
+
+    if pd.api.types.is_integer_dtype(serie.dtype):
+        if isinstance(serie.dtype, pd.api.extensions.ExtensionDtype):
+            return serie
+        return pd.to_numeric(serie, downcast='integer')
+
+    if pd.api.types.is_float_dtype(serie.dtype):
+        if serie.name is not None and str(serie.name).startswith('id_'):
+            valores = serie.dropna()
+            if not valores.empty and (valores == np.floor(valores)).all():
+                entero = pd.to_numeric(valores, downcast='integer').dtype
+                return serie.astype(pd.api.types.pandas_dtype(entero.name.capitalize()))
+        return serie
+
+    if serie.dtype == object or pd.api.types.is_string_dtype(serie.dtype):
+        tipo = pd.api.types.infer_dtype(serie, skipna=True)
+        if tipo in ('date', 'datetime', 'datetime64'):
+            return pd.to_datetime(serie)
+        if tipo == 'string' and serie.nunique(dropna=True) <= max(1, umbral * len(serie)):
+            return serie.astype('category')
+    return serie
+
+
+@tiempos.medido('tipos')
+def compactar(df, nombre=None, umbral=UMBRAL_CATEGORIA):
+    """Devuelve una versión compacta de ``df`` y registra el reporte de bytes."""
+    antes = df.memory_usage(deep=True, index=False)
+    compacto = pd.DataFrame(
+        {col: _compactar_columna(df[col], umbral) for col in df.columns},
+        index=df.index,
+    )
+    despues = compacto.memory_usage(deep=True, index=False)
+
+    reporte = pd.DataFrame({
+        'tipo_antes': df.dtypes.astype(str),
+        'tipo_despues': compacto.dtypes.astype(str),
+        'bytes_antes': antes,
+        'bytes_despues': despues,
+    })
+    reporte.index.name = 'columna'
+    if nombre is not None:
+        REPORTES[nombre] = reporte
+        logger.info(
+            "compactar(%s): %s -> %s bytes",
+            nombre, int(antes.sum()), int(despues.sum()),
+        )
+    return compacto
+
+
+def concatenar(base, nuevas):
+    """Concatena un frame compacto con filas nuevas sin perder los category.
+
+    ``pd.concat`` convierte a object las columnas category cuyas categorías
+    difieren; aquí se unifican antes para que solo cambien los códigos.
+    """
+    nuevas = nuevas.copy()
+    for col in base.columns:
+        if not isinstance(base[col].dtype, pd.CategoricalDtype) or col not in nuevas:
+            continue
+        extra = pd.Index(nuevas[col].dropna().unique()).difference(base[col].cat.categories)
+        if len(extra):
+            base = base.assign(**{col: base[col].cat.add_categories(extra)})
+        nuevas[col] = pd.Categorical(nuevas[col], categories=base[col].cat.categories)
+    return pd.concat([base, nuevas], ignore_index=True)
+
+
+def mes_anio(fechas):
+    """Mes 'AAAA-MM' de cada fecha como category, sin formatear fila por fila.
+
+    Equivale a ``fechas.dt.to_period('M').astype(str)`` pero solo formatea
+    los meses distintos; las categorías quedan en orden cronológico.
+    """
+    meses = fechas.to_numpy(dtype='datetime64[ns]').astype('datetime64[M]')
+    unicos, codigos = np.unique(meses, return_inverse=True)
+    codigos = codigos.ravel()
+    if len(unicos) and np.isnat(unicos[-1]):
+        # np.unique deja NaT al final: esas filas quedan como nulo
+        codigos = np.where(codigos == len(unicos) - 1, -1, codigos)
+        unicos = unicos[:-1]
+    etiquetas = np.datetime_as_string(unicos, unit='M')
+    return pd.Series(
+        pd.Categorical.from_codes(codigos, categories=pd.Index(etiquetas, dtype='str')),
+        index=fechas.index, name='mes_anio',
+    )
@@ -0,0 +1,231 @@
+"""Acceso a datos compartido por los cuatro dashboards.
+
+- Un único engine con pool por URI y por proceso (``get_engine``), con
+  pre-ping y reciclado de conexiones.
+- La URI de cada dashboard sale de variables de entorno (``uri_de``); sin
+  variable se usa la base local que crea ``generar_datos.py``.
+- Métricas de checkout del pool por engine (``metricas``).
+- Lectura en bloques con cursor del lado del servidor, decodificando cada
+  columna a su dtype declarado sin DataFrames intermedios (``leer_en_bloques``).
+- Varias lecturas a la vez en un pool de hilos, cada una con su conexión
+  del pool (``leer_en_paralelo``).
+- Compatibilidad mínima con SQLite para usarlo como reemplazo local de MySQL
+  (función CONCAT y GROUP_CONCAT con separador).
+
+Variables de entorno:
+    FITNESS_DB_URI, VENTAS_DB_URI, HOTEL_DB_URI, BLOG_DB_URI
+    DB_POOL_SIZE (5), DB_MAX_OVERFLOW (10), DB_POOL_RECYCLE (280 s), DB_POOL_TIMEOUT (30 s)
+    DB_HILOS_LECTURA (4): lecturas simultáneas de ``leer_en_paralelo``
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, event, text
+
+import tiempos
+
+URI_LOCAL = 'sqlite:///datos/{nombre}_10k.db'
+# No debe superar DB_POOL_SIZE + DB_MAX_OVERFLOW: cada hilo usa una conexión
+HILOS_LECTURA = int(os.environ.get('DB_HILOS_LECTURA', '4'))
+
+_engines = {}
+_metricas = {}
+_lock = threading.Lock()
+
+
+def uri_de(nombre):
+    """URI del dashboard ``nombre`` (fitness, ventas, hotel, blog)."""
+    return os.environ.get(f'{nombre.upper()}_DB_URI', URI_LOCAL.format(nombre=nombre))
+
+
+def _concat_mysql(*valores):
+    # CONCAT de MySQL: NULL si cualquier argumento es NULL
+    if any(v is None for v in valores):
+        return None
+    return ''.join(str(v) for v in valores)
+
+
+def _registrar_metricas(engine, m):
+    @event.listens_for(engine, 'connect')
+    def _connect(dbapi_conn, registro):
+        if engine.dialect.name == 'sqlite':
+            dbapi_conn.create_function('CONCAT', -1, _concat_mysql)
+        with _lock:
+            m['conexiones_creadas'] += 1
+
+    @event.listens_for(engine, 'checkout')
+    def _checkout(dbapi_conn, registro, proxy):
+        registro.info['checkout_t0'] = time.perf_counter()
+        with _lock:
+            m['checkouts'] += 1
+            m['en_uso'] += 1
+            m['max_en_uso'] = max(m['max_en_uso'], m['en_uso'])
+
+    @event.listens_for(engine, 'checkin')
+    def _checkin(dbapi_conn, registro):
+        t0 = registro.info.pop('checkout_t0', None)
+        with _lock:
+            m['checkins'] += 1
+            m['en_uso'] -= 1
+            if t0 is not None:
+                m['segundos_en_uso'] += time.perf_counter() - t0
+
+    @event.listens_for(engine, 'invalidate')
+    def _invalidate(dbapi_conn, registro, excepcion):
+        with _lock:
+            m['invalidadas'] += 1
+
+
+def get_engine(uri):
+    """Engine con pool compartido por todo el proceso para ``uri``."""
+    engine = _engines.get(uri)
+    if engine is not None:
+        return engine
+
+    with _lock:
+        engine = _engines.get(uri)
+        if engine is not None:
+            return engine
+
+        opciones = {'pool_pre_ping': True}
+        if not uri.startswith('sqlite'):
+            opciones.update(
+                pool_size=int(os.environ.get('DB_POOL_SIZE', '5')),
+                max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', '10')),
+                pool_recycle=int(os.environ.get('DB_POOL_RECYCLE', '280')),
+                pool_timeout=int(os.environ.get('DB_POOL_TIMEOUT', '30')),
+            )
+        engine = create_engine(uri, **opciones)
+
+        m = {
+            'conexiones_creadas': 0,
+            'checkouts': 0,
+            'checkins': 0,
+            'en_uso': 0,
+            'max_en_uso': 0,
+            'invalidadas': 0,
+            'segundos_en_uso': 0.0,
+        }
+        _registrar_metricas(engine, m)
+        _engines[uri] = engine
+        _metricas[uri] = m
+        return engine
+
+
+def metricas(uri=None):
+    """Copia de las métricas de checkout (de un engine o de todos)."""
+    with _lock:
+        if uri is not None:
+            return dict(_metricas.get(uri, {}))
+        return {u: dict(m) for u, m in _metricas.items()}
+
+
+def group_concat(engine, expresion, separador=', '):
+    """GROUP_CONCAT con separador en la sintaxis del dialecto del engine."""
+    if engine.dialect.name == 'sqlite':
+        return f"GROUP_CONCAT({expresion}, '{separador}')"
+    return f"GROUP_CONCAT({expresion} SEPARATOR '{separador}')"
+
+
+def leer_en_bloques(engine, query, columnas, params=None, total=None, tam_bloque=50_000):
+    """Lee ``query`` en bloques y decodifica cada columna a su dtype declarado.
+
+    - El cursor es del lado del servidor (``stream_results``): ni el driver
+      ni Python retienen el resultado completo.
+    - ``columnas`` (nombre -> dtype, ver ``consultas.py``) define el
+      almacenamiento final. Los valores de cada bloque (Decimal, date,
+      datetime o texto ISO en SQLite) se copian directo al arreglo tipado:
+      no hay DataFrame intermedio ni columnas object que convertir después.
+    - Con ``total`` (el número exacto de filas, p. ej. un COUNT(*) de la
+      misma consulta) se reserva de una sola vez y el pico de memoria queda
+      cerca del tamaño del DataFrame final más un bloque de filas.
+    - Sin ``total`` cada bloque queda en su propio arreglo tipado y se
+      concatenan una sola vez al final (pico: dos veces el resultado). Las
+      filas que pasen de ``total`` siguen el mismo camino.
+
+    Las columnas nunca guardan capacidad sin usar: si llegan menos filas
+    que ``total`` se copian recortadas.
+
+    El tiempo se reparte entre las etapas ``consulta`` (esperar y transferir
+    cada bloque) y ``tipos`` (copiarlo a los arreglos), ver ``tiempos.py``.
+    """
+    capacidad = total or 0
+    buffers = {col: np.empty(capacidad, dtype=dtype) for col, dtype in columnas.items()}
+    # Bloques que no entran en los buffers reservados: se concatenan al final
+    extra = {col: [] for col in columnas}
+    fila = 0
+    t_consulta = t_tipos = 0.0
+
+    t0 = time.perf_counter()
+    with engine.connect() as conn:
+        conn = conn.execution_options(stream_results=True, max_row_buffer=tam_bloque)
+        resultado = conn.execute(text(query), params or {})
+        claves = list(resultado.keys())
+        faltantes = [col for col in buffers if col not in claves]
+        if faltantes:
+            raise KeyError(f"La consulta no devuelve las columnas declaradas: {faltantes}")
+        posiciones = [(claves.index(col), col) for col in buffers]
+
+        for filas in resultado.partitions(tam_bloque):
+            t1 = time.perf_counter()
+            t_consulta += t1 - t0
+            n = len(filas)
+            valores = list(zip(*filas))
+            cabe = fila + n <= capacidad
+            if not cabe:
+                # Desde aquí todo va a ``extra``: los buffers quedan en ``fila``
+                capacidad = min(capacidad, fila)
+            for pos, col in posiciones:
+                if cabe:
+                    destino = buffers[col][fila:fila + n]
+                else:
+                    destino = np.empty(n, dtype=buffers[col].dtype)
+                    extra[col].append(destino)
+                try:
+                    destino[:] = valores[pos]
+                except (TypeError, ValueError) as e:
+                    raise TypeError(
+                        f"No se pudo decodificar '{col}' como {buffers[col].dtype}: {e}"
+                    ) from e
+            fila += n
+            t0 = time.perf_counter()
+            t_tipos += t0 - t1
+        t_consulta += time.perf_counter() - t0
+
+    tiempos.registrar('consulta', t_consulta, 'leer_en_bloques')
+    tiempos.registrar('tipos', t_tipos, 'leer_en_bloques')
+    datos = {}
+    for col, buf in buffers.items():
+        if extra[col]:
+            partes = ([buf[:capacidad]] if capacidad else []) + extra[col]
+            datos[col] = partes[0] if len(partes) == 1 else np.concatenate(partes)
+        elif fila < len(buf):
+            datos[col] = buf[:fila].copy()
+        else:
+            datos[col] = buf
+    return pd.DataFrame(datos, copy=False)
+
+
+def leer_en_paralelo(engine, consultas, hilos=None):
+    """Ejecuta varias ``leer_en_bloques`` a la vez y devuelve nombre -> DataFrame.
+
+    ``consultas`` es nombre -> (query, columnas) o (query, columnas, params).
+    Cada lectura corre en un hilo con su propia conexión del pool; el driver
+    suelta el GIL mientras espera a la base, así que las consultas se
+    solapan. Si una falla, la excepción se propaga al terminar las demás.
+    """
+    hilos = min(hilos or HILOS_LECTURA, len(consultas)) or 1
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(hilos, thread_name_prefix='lectura') as pool:
+        futuros = {
+            nombre: pool.submit(leer_en_bloques, engine, *consulta)
+            for nombre, consulta in consultas.items()
+        }
+        resultado = {nombre: futuro.result() for nombre, futuro in futuros.items()}
+    # Los hilos no tienen sesión de Streamlit: se registra el tiempo total
+    tiempos.registrar('consulta', time.perf_counter() - t0, 'leer_en_paralelo')
+    return resultado
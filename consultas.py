@@ -0,0 +1,525 @@
+"""Consultas de los dashboards y el tipo declarado de cada columna.
+
+Cada esquema (columna -> dtype) lo usa ``conexion.leer_en_bloques`` para
+decodificar las filas directamente en arreglos NumPy tipados, sin pasar por
+columnas object ni por una cadena de ``to_datetime`` / ``astype`` posterior.
+
+Reglas de los esquemas:
+
+- ``int64`` solo para columnas que nunca vienen NULL (PK y JOIN interno)
+- ids de LEFT JOIN, montos y enteros que pueden ser NULL -> ``float64`` (NaN)
+- fechas y horas con fecha -> ``datetime64[ns]`` (NULL -> NaT)
+- texto y ``TIME`` -> ``object``
+
+Las consultas ``VERSION_*`` son sondeos baratos (MAX de la PK de los
+hechos, COUNT de los catálogos) cuyo resultado cambia cuando cambian los
+datos; ``versiones.py`` los ejecuta en cada ejecución de los dashboards y
+los caches y snapshots se indexan por su resultado. ``ORIGEN_*`` son las
+tablas de origen de cada dashboard (en MySQL se sondea además su
+``UPDATE_TIME``).
+"""
+
+# ============================================================
+# FITNESS (app.py)
+# ============================================================
+FROM_ASISTENCIAS = """
+FROM asistencia a
+JOIN socios s ON a.id_socio = s.id_socios
+LEFT JOIN socios_clases sc ON sc.id_socio = s.id_socios
+LEFT JOIN clases c ON sc.id_clase = c.id_clase
+LEFT JOIN instructor i ON c.id_instructor = i.id_instructor
+"""
+
+EXPR_INSTRUCTOR = "CONCAT(i.nombre, ' ', IFNULL(i.apellido_paterno,''))"
+
+MAIN_QUERY = f"""
+SELECT 
+    a.id_asistencia,
+    a.fecha_inicio,
+    a.hora_inicio,
+    a.intensidad_percibida,
+    s.id_socios,
+    CONCAT(s.nombre, ' ', IFNULL(s.apellido_paterno,'')) AS socio,
+    c.id_clase,
+    c.nombre AS clase,
+    c.zona AS sala,
+    i.id_instructor,
+    {EXPR_INSTRUCTOR} AS instructor
+{FROM_ASISTENCIAS}
+ORDER BY a.fecha_inicio, a.hora_inicio;
+"""
+
+COLUMNAS_ASISTENCIA = {
+    "id_asistencia": "int64",
+    "fecha_inicio": "datetime64[ns]",
+    "hora_inicio": object,
+    "intensidad_percibida": "float64",
+    "id_socios": "int64",
+    "socio": object,
+    "id_clase": "float64",
+    "clase": object,
+    "sala": object,
+    "id_instructor": "float64",
+    "instructor": object,
+}
+
+VERSION_ASISTENCIAS = """
+SELECT
+    (SELECT MAX(id_asistencia) FROM asistencia),
+    (SELECT COUNT(*) FROM socios),
+    (SELECT COUNT(*) FROM socios_clases),
+    (SELECT COUNT(*) FROM clases),
+    (SELECT COUNT(*) FROM instructor)
+"""
+ORIGEN_ASISTENCIAS = ('asistencia', 'socios', 'socios_clases', 'clases', 'instructor')
+
+# ============================================================
+# VENTAS (graficos.py)
+# ============================================================
+# Tipo de pago de una compra según la tabla de pago en la que aparece
+EXPR_TIPO_PAGO = """CASE 
+            WHEN tpq.id_pago_qr IS NOT NULL THEN 'QR'
+            WHEN tpt.id_pago_tarjeta IS NOT NULL THEN 'TARJETA'
+            WHEN tpe.id_pago_efectivo IS NOT NULL THEN 'EFECTIVO'
+            WHEN tptf.id_tipo_pago_transferencia IS NOT NULL THEN 'TRANSFERENCIA'
+            ELSE 'SIN_REGISTRO'
+        END"""
+
+JOIN_PAGOS = """
+    LEFT JOIN tipo_pago_qr tpq
+        ON tpq.id_compra = c.id_compra
+    LEFT JOIN tipo_pago_tarjeta tpt
+        ON tpt.id_compra = c.id_compra
+    LEFT JOIN tipo_pago_efectivo tpe
+        ON tpe.id_compra = c.id_compra
+    LEFT JOIN tipo_pago_transferencia tptf
+        ON tptf.id_compra = c.id_compra
+"""
+
+QUERY_VENTAS = f"""
+    SELECT 
+        c.id_compra,
+        c.fecha_compra,
+        c.monto,
+        c.descuento,
+        (c.monto - c.descuento) AS monto_neto,
+
+        -- Producto
+        p.id_producto,
+        p.codigo_producto,
+        p.descripcion,
+        p.color,
+
+        -- Fábrica
+        f.pais AS pais_fabrica,
+        f.nombre AS nombre_fabrica,
+
+        -- Sucursal (a través de sucursal_producto)
+        s.id_sucursal,
+        s.numero_sucursal,
+        s.ciudad AS ciudad_sucursal,
+
+        -- Cliente
+        cl.id_cliente,
+        CONCAT(cl.nombre_cliente, ' ', cl.apellido_paterno, ' ', cl.apellido_materno) AS nombre_cliente,
+        cl.codigo_cliente,
+        cl.ci,
+
+        -- Ciudad del cliente
+        dc.ciudad AS ciudad_cliente,
+
+        -- Tipo de pago (derivado de las tablas de pago)
+        {EXPR_TIPO_PAGO} AS tipo_pago
+
+    FROM compra c
+    LEFT JOIN producto p 
+        ON p.id_producto = c.id_producto
+    LEFT JOIN fabrica f
+        ON f.id_fabrica = p.id_fabrica
+    LEFT JOIN sucursal_producto sp
+        ON sp.id_producto = p.id_producto
+    LEFT JOIN sucursal s
+        ON s.id_sucursal = sp.id_sucursal
+    LEFT JOIN cliente cl 
+        ON cl.id_cliente = c.id_cliente
+    LEFT JOIN direccion_clientes dc 
+        ON dc.id_cliente = cl.id_cliente
+    {JOIN_PAGOS}
+    WHERE c.id_compra > :ultimo_id
+"""
+
+COLUMNAS_VENTAS = {
+    "id_compra": "int64",
+    "fecha_compra": "datetime64[ns]",
+    "monto": "float64",
+    "descuento": "float64",
+    "monto_neto": "float64",
+    "id_producto": "float64",
+    "codigo_producto": object,
+    "descripcion": object,
+    "color": object,
+    "pais_fabrica": object,
+    "nombre_fabrica": object,
+    "id_sucursal": "float64",
+    "numero_sucursal": "float64",
+    "ciudad_sucursal": object,
+    "id_cliente": "float64",
+    "nombre_cliente": object,
+    "codigo_cliente": object,
+    "ci": object,
+    "ciudad_cliente": object,
+    "tipo_pago": object,
+}
+
+VERSION_VENTAS = """
+SELECT
+    (SELECT MAX(id_compra) FROM compra),
+    (SELECT COUNT(*) FROM producto),
+    (SELECT COUNT(*) FROM fabrica),
+    (SELECT COUNT(*) FROM sucursal_producto),
+    (SELECT COUNT(*) FROM sucursal),
+    (SELECT COUNT(*) FROM cliente),
+    (SELECT COUNT(*) FROM direccion_clientes),
+    (SELECT MAX(id_pago_qr) FROM tipo_pago_qr),
+    (SELECT MAX(id_pago_tarjeta) FROM tipo_pago_tarjeta),
+    (SELECT MAX(id_pago_efectivo) FROM tipo_pago_efectivo),
+    (SELECT MAX(id_tipo_pago_transferencia) FROM tipo_pago_transferencia)
+"""
+ORIGEN_VENTAS = (
+    'compra', 'producto', 'fabrica', 'sucursal_producto', 'sucursal', 'cliente',
+    'direccion_clientes', 'tipo_pago_qr', 'tipo_pago_tarjeta', 'tipo_pago_efectivo',
+    'tipo_pago_transferencia',
+)
+
+# Carga incremental (ventas.py). compra y las tablas de pago son solo de
+# inserción: las compras nuevas se piden por id_compra y los pagos que
+# llegan después de su compra por las marcas de PAGOS_VENTAS. Solo un
+# cambio en las dimensiones (catálogos y clientes) obliga a recargar todo.
+DIMENSIONES_VENTAS = """
+SELECT
+    (SELECT COUNT(*) FROM producto),
+    (SELECT COUNT(*) FROM fabrica),
+    (SELECT COUNT(*) FROM sucursal_producto),
+    (SELECT COUNT(*) FROM sucursal),
+    (SELECT COUNT(*) FROM cliente),
+    (SELECT COUNT(*) FROM direccion_clientes)
+"""
+ORIGEN_DIMENSIONES_VENTAS = (
+    'producto', 'fabrica', 'sucursal_producto', 'sucursal', 'cliente', 'direccion_clientes',
+)
+
+# Marca de agua de cada tabla de pago (mismo orden que los parámetros de
+# QUERY_PAGOS_TARDIOS)
+PAGOS_VENTAS = """
+SELECT
+    (SELECT COALESCE(MAX(id_pago_qr), 0) FROM tipo_pago_qr),
+    (SELECT COALESCE(MAX(id_pago_tarjeta), 0) FROM tipo_pago_tarjeta),
+    (SELECT COALESCE(MAX(id_pago_efectivo), 0) FROM tipo_pago_efectivo),
+    (SELECT COALESCE(MAX(id_tipo_pago_transferencia), 0) FROM tipo_pago_transferencia)
+"""
+MARCAS_PAGO = ('qr', 'tarjeta', 'efectivo', 'transferencia')
+
+# Tipo de pago de las compras ya cargadas que recibieron un pago nuevo
+QUERY_PAGOS_TARDIOS = f"""
+    SELECT c.id_compra, {EXPR_TIPO_PAGO} AS tipo_pago
+    FROM compra c
+    {JOIN_PAGOS}
+    WHERE c.id_compra <= :ultimo_id AND c.id_compra IN (
+        SELECT id_compra FROM tipo_pago_qr WHERE id_pago_qr > :qr
+        UNION SELECT id_compra FROM tipo_pago_tarjeta WHERE id_pago_tarjeta > :tarjeta
+        UNION SELECT id_compra FROM tipo_pago_efectivo WHERE id_pago_efectivo > :efectivo
+        UNION SELECT id_compra FROM tipo_pago_transferencia
+            WHERE id_tipo_pago_transferencia > :transferencia
+    )
+"""
+
+COLUMNAS_PAGOS_TARDIOS = {
+    "id_compra": "int64",
+    "tipo_pago": object,
+}
+
+# ============================================================
+# HOTEL (proyecto.py)
+# ============================================================
+SELECT_HOTEL = """
+        SELECT 
+            r.id_reserva,
+            r.fecha_reserva,
+            r.fecha_vencimiento,
+            r.monto_total,
+            r.estado_reserva,
+            r.localizacion_reserva,
+            
+            c.id_cliente,
+            CONCAT(c.nombre, ' ', c.apellido_paterno, ' ', c.apellido_materno) AS nombre_cliente,
+            c.ci,
+            
+            h.id_habitacion,
+            h.numero_habitacion,
+            h.piso,
+            h.precio AS tarifa_noche,
+            
+            th.id_tipo_habitacion,
+            th.tipo_cama,
+            th.numero_camas,
+            th.descripcion AS descripcion_tipo_habitacion,
+            th.capacidad,
+            
+            dr.id_detalle_reserva,
+            dr.cantidad_personas,
+            dr.check_in,
+            dr.check_out,
+            
+            drs.id_detalle_servicio,
+            se.id_servicios_especiales,
+            se.nombre AS nombre_servicio_especial,
+            se.precio AS precio_servicio_catalogo,
+            drs.precio_unitario AS precio_servicio_reserva,
+            drs.subtotal AS subtotal_servicio,
+            drs.hora,
+            
+            p.id_pago,
+            p.monto AS monto_pago,
+            p.estado_pago AS estado_pago_sistema,
+            p.fecha_pago,
+            
+            ep.nombre_estado_pago,
+            
+            dp.id_detalle_pago,
+            dp.monto AS monto_detalle_pago,
+            dp.fecha AS fecha_detalle_pago,
+            
+            mp.id_metodo_pago,
+            mp.nombre AS metodo_pago_nombre
+"""
+
+FROM_HOTEL = """
+        FROM reserva r
+        JOIN cliente c 
+            ON c.id_cliente = r.id_cliente
+        JOIN detalle_reserva dr 
+            ON dr.id_reserva = r.id_reserva
+        JOIN habitacion h 
+            ON h.id_habitacion = dr.id_habitacion
+        JOIN tipo_habitacion th 
+            ON th.id_tipo_habitacion = h.id_tipo_habitacion
+        LEFT JOIN detalle_reserva_servicios_especiales drs
+            ON drs.id_detalle_reserva = dr.id_detalle_reserva
+        LEFT JOIN servicios_especiales se
+            ON se.id_servicios_especiales = drs.id_servicios_especiales
+        LEFT JOIN pago p
+            ON p.id_reserva = r.id_reserva
+        LEFT JOIN detalle_pago dp
+            ON dp.id_detalle_pago = p.id_detalle_pago
+        LEFT JOIN metodo_pago mp
+            ON mp.id_metodo_pago = dp.id_metodo_pago
+        LEFT JOIN estado_pago ep
+            ON ep.id_estado_pago = p.id_estado_pago
+"""
+
+# Los ids de tablas con LEFT JOIN y los números que pueden venir NULL van
+# como float (NaN).
+COLUMNAS_HOTEL = {
+    "id_reserva": "int64",
+    "fecha_reserva": "datetime64[ns]",
+    "fecha_vencimiento": "datetime64[ns]",
+    "monto_total": "float64",
+    "estado_reserva": object,
+    "localizacion_reserva": object,
+    "id_cliente": "int64",
+    "nombre_cliente": object,
+    "ci": object,
+    "id_habitacion": "int64",
+    "numero_habitacion": "float64",
+    "piso": "float64",
+    "tarifa_noche": "float64",
+    "id_tipo_habitacion": "int64",
+    "tipo_cama": object,
+    "numero_camas": "float64",
+    "descripcion_tipo_habitacion": object,
+    "capacidad": "float64",
+    "id_detalle_reserva": "int64",
+    "cantidad_personas": "float64",
+    "check_in": "datetime64[ns]",
+    "check_out": "datetime64[ns]",
+    "id_detalle_servicio": "float64",
+    "id_servicios_especiales": "float64",
+    "nombre_servicio_especial": object,
+    "precio_servicio_catalogo": "float64",
+    "precio_servicio_reserva": "float64",
+    "subtotal_servicio": "float64",
+    "hora": "datetime64[ns]",
+    "id_pago": "float64",
+    "monto_pago": "float64",
+    "estado_pago_sistema": object,
+    "fecha_pago": "datetime64[ns]",
+    "nombre_estado_pago": object,
+    "id_detalle_pago": "float64",
+    "monto_detalle_pago": "float64",
+    "fecha_detalle_pago": "datetime64[ns]",
+    "id_metodo_pago": "float64",
+    "metodo_pago_nombre": object,
+}
+
+VERSION_HOTEL = """
+SELECT
+    (SELECT MAX(id_reserva) FROM reserva),
+    (SELECT MAX(id_detalle_reserva) FROM detalle_reserva),
+    (SELECT MAX(id_detalle_servicio) FROM detalle_reserva_servicios_especiales),
+    (SELECT MAX(id_pago) FROM pago),
+    (SELECT MAX(id_detalle_pago) FROM detalle_pago),
+    (SELECT COUNT(*) FROM cliente),
+    (SELECT COUNT(*) FROM habitacion),
+    (SELECT COUNT(*) FROM tipo_habitacion),
+    (SELECT COUNT(*) FROM servicios_especiales),
+    (SELECT COUNT(*) FROM metodo_pago),
+    (SELECT COUNT(*) FROM estado_pago)
+"""
+ORIGEN_HOTEL = (
+    'reserva', 'cliente', 'detalle_reserva', 'habitacion', 'tipo_habitacion',
+    'detalle_reserva_servicios_especiales', 'servicios_especiales', 'pago',
+    'detalle_pago', 'metodo_pago', 'estado_pago',
+)
+
+# Carga por tablas (hotel.consultar_hotel_paralelo): cada tabla se lee sola,
+# en paralelo, y los joins se hacen en pandas por clave entera. Las claves
+# de los JOIN internos del join único se leen sin NULL (la fila no entraría
+# al join); las de los LEFT JOIN pueden venir NULL y van como float.
+TABLAS_HOTEL = {
+    "reservas": ("""
+        SELECT r.id_reserva, r.id_cliente, r.fecha_reserva, r.fecha_vencimiento,
+               r.monto_total, r.estado_reserva, r.localizacion_reserva
+        FROM reserva r
+        WHERE r.id_cliente IS NOT NULL
+    """, {
+        "id_reserva": "int64",
+        "id_cliente": "int64",
+        "fecha_reserva": "datetime64[ns]",
+        "fecha_vencimiento": "datetime64[ns]",
+        "monto_total": "float64",
+        "estado_reserva": object,
+        "localizacion_reserva": object,
+    }),
+    "clientes": ("""
+        SELECT c.id_cliente,
+               CONCAT(c.nombre, ' ', c.apellido_paterno, ' ', c.apellido_materno) AS nombre_cliente,
+               c.ci
+        FROM cliente c
+    """, {
+        "id_cliente": "int64",
+        "nombre_cliente": object,
+        "ci": object,
+    }),
+    "detalles": ("""
+        SELECT dr.id_detalle_reserva, dr.id_reserva, dr.id_habitacion,
+               dr.cantidad_personas, dr.check_in, dr.check_out
+        FROM detalle_reserva dr
+        WHERE dr.id_reserva IS NOT NULL AND dr.id_habitacion IS NOT NULL
+    """, {
+        "id_detalle_reserva": "int64",
+        "id_reserva": "int64",
+        "id_habitacion": "int64",
+        "cantidad_personas": "float64",
+        "check_in": "datetime64[ns]",
+        "check_out": "datetime64[ns]",
+    }),
+    "habitaciones": ("""
+        SELECT h.id_habitacion, h.numero_habitacion, h.piso, h.precio AS tarifa_noche,
+               h.id_tipo_habitacion
+        FROM habitacion h
+        WHERE h.id_tipo_habitacion IS NOT NULL
+    """, {
+        "id_habitacion": "int64",
+        "numero_habitacion": "float64",
+        "piso": "float64",
+        "tarifa_noche": "float64",
+        "id_tipo_habitacion": "int64",
+    }),
+    "tipos_habitacion": ("""
+        SELECT th.id_tipo_habitacion, th.tipo_cama, th.numero_camas,
+               th.descripcion AS descripcion_tipo_habitacion, th.capacidad
+        FROM tipo_habitacion th
+    """, {
+        "id_tipo_habitacion": "int64",
+        "tipo_cama": object,
+        "numero_camas": "float64",
+        "descripcion_tipo_habitacion": object,
+        "capacidad": "float64",
+    }),
+    "servicios": ("""
+        SELECT drs.id_detalle_servicio, drs.id_detalle_reserva, drs.id_servicios_especiales,
+               drs.precio_unitario AS precio_servicio_reserva,
+               drs.subtotal AS subtotal_servicio, drs.hora
+        FROM detalle_reserva_servicios_especiales drs
+        WHERE drs.id_detalle_reserva IS NOT NULL
+    """, {
+        # float como en el join: tras el LEFT JOIN con los detalles puede faltar
+        "id_detalle_servicio": "float64",
+        "id_detalle_reserva": "int64",
+        "id_servicios_especiales": "float64",
+        "precio_servicio_reserva": "float64",
+        "subtotal_servicio": "float64",
+        "hora": "datetime64[ns]",
+    }),
+    "catalogo_servicios": ("""
+        SELECT se.id_servicios_especiales, se.nombre AS nombre_servicio_especial,
+               se.precio AS precio_servicio_catalogo
+        FROM servicios_especiales se
+    """, {
+        "id_servicios_especiales": "int64",
+        "nombre_servicio_especial": object,
+        "precio_servicio_catalogo": "float64",
+    }),
+    "pagos": ("""
+        SELECT p.id_pago, p.id_reserva, p.monto AS monto_pago,
+               p.estado_pago AS estado_pago_sistema, p.fecha_pago,
+               p.id_detalle_pago, p.id_estado_pago
+        FROM pago p
+        WHERE p.id_reserva IS NOT NULL
+    """, {
+        "id_pago": "int64",
+        "id_reserva": "int64",
+        "monto_pago": "float64",
+        "estado_pago_sistema": object,
+        "fecha_pago": "datetime64[ns]",
+        "id_detalle_pago": "float64",
+        "id_estado_pago": "float64",
+    }),
+    "detalles_pago": ("""
+        SELECT dp.id_detalle_pago, dp.monto AS monto_detalle_pago,
+               dp.fecha AS fecha_detalle_pago, dp.id_metodo_pago
+        FROM detalle_pago dp
+    """, {
+        "id_detalle_pago": "int64",
+        "monto_detalle_pago": "float64",
+        "fecha_detalle_pago": "datetime64[ns]",
+        "id_metodo_pago": "float64",
+    }),
+    "metodos_pago": ("""
+        SELECT mp.id_metodo_pago, mp.nombre AS metodo_pago_nombre
+        FROM metodo_pago mp
+    """, {
+        "id_metodo_pago": "int64",
+        "metodo_pago_nombre": object,
+    }),
+    "estados_pago": ("""
+        SELECT ep.id_estado_pago, ep.nombre_estado_pago
+        FROM estado_pago ep
+    """, {
+        "id_estado_pago": "int64",
+        "nombre_estado_pago": object,
+    }),
+}
+
+# ============================================================
+# BLOG (clase.py)
+# ============================================================
+VERSION_BLOG = """
+SELECT
+    (SELECT MAX(id_post) FROM post),
+    (SELECT COUNT(*) FROM post),
+    (SELECT MAX(id_etiqueta) FROM etiqueta),
+    (SELECT COUNT(*) FROM etiqueta),
+    (SELECT COUNT(*) FROM usuario)
+"""
+ORIGEN_BLOG = ('post', 'etiqueta', 'usuario')
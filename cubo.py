@@ -0,0 +1,73 @@
+"""Cubo de agregados diarios para los gráficos de ventas.
+
+Se construye una vez por versión de los datos: una fila por combinación
+(día, dimensiones) con cuatro medidas aditivas de la columna medida:
+
+- ``n``: cantidad de filas
+- ``<medida>_n``: filas con la medida no nula (para media y desviación)
+- ``<medida>``: suma
+- ``<medida>_cuadrados``: suma de cuadrados (para media y desviación)
+
+Como en pandas, los nulos de la medida cuentan como filas pero no entran
+en la suma, la media ni la desviación.
+
+Como las medidas son aditivas, cualquier agregación más gruesa (por mes,
+por producto, total) sale de sumar filas del cubo ya filtrado, y el costo
+depende de la cantidad de combinaciones distintas y no de la cantidad de
+compras. El cubo guarda la fecha normalizada al día, así que se filtra
+con el mismo ``MotorFiltros`` que el detalle.
+"""
+import numpy as np
+import pandas as pd
+
+import tiempos
+
+
+@tiempos.medido('agregacion')
+def construir_cubo(df, columna_fecha, dimensiones, medida):
+    """Agrega ``df`` por día y ``dimensiones`` (los nulos forman su propio grupo)."""
+    valores = df[medida].to_numpy(dtype=np.float64, na_value=np.nan)
+    validos = ~np.isnan(valores)
+    valores = np.where(validos, valores, 0.0)
+    base = pd.DataFrame({
+        columna_fecha: df[columna_fecha].dt.normalize(),
+        **{dim: df[dim] for dim in dimensiones},
+        'n': np.ones(len(df), dtype=np.int64),
+        f'{medida}_n': validos.astype(np.int64),
+        medida: valores,
+        f'{medida}_cuadrados': valores * valores,
+    })
+    return (
+        base.groupby([columna_fecha] + list(dimensiones), observed=True, dropna=False, sort=False)
+            .sum()
+            .reset_index()
+    )
+
+
+def resumir(cubo, medida, por=None):
+    """Conteo, suma, media y desviación estándar muestral de ``medida``.
+
+    Sin ``por`` devuelve un dict con el total del cubo; con ``por`` (columna o
+    lista) un DataFrame con una fila por grupo.
+    """
+    columnas = ['n', f'{medida}_n', medida, f'{medida}_cuadrados']
+    if por is None:
+        sumas = cubo[columnas].sum()
+        return _estadisticas(sumas['n'], sumas[f'{medida}_n'], sumas[medida],
+                             sumas[f'{medida}_cuadrados'])
+
+    grupos = cubo.groupby(por, observed=True, as_index=False)[columnas].sum()
+    stats = _estadisticas(grupos['n'], grupos[f'{medida}_n'], grupos[medida],
+                          grupos[f'{medida}_cuadrados'])
+    return grupos.assign(media=stats['media'], desviacion=stats['desviacion'])
+
+
+def _estadisticas(n, validos, suma, cuadrados):
+    cuenta = np.asarray(validos, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = np.asarray(suma, dtype=np.float64) / cuenta
+        # Var muestral = (Σx² − (Σx)²/n) / (n − 1); el max(0) absorbe el redondeo
+        var = np.maximum(np.asarray(cuadrados, dtype=np.float64) - media * suma, 0) / (cuenta - 1)
+    if np.ndim(n) == 0:
+        return {'n': int(n), 'suma': float(suma), 'media': float(media), 'desviacion': float(np.sqrt(var))}
+    return {'n': n, 'suma': suma, 'media': media, 'desviacion': np.sqrt(var)}
@@ -0,0 +1,82 @@
+"""Exportación de DataFrames por bloques (CSV comprimido y Parquet).
+
+``df.to_csv()`` arma todo el archivo como un único string en memoria. Aquí
+el frame se escribe de a ``FILAS_BLOQUE`` filas a un archivo temporal en
+disco, así que el pico de memoria es un bloque más el buffer del
+compresor, sin importar cuántas filas tenga la exportación.
+
+Se usa desde ``st.download_button`` con un callable, que Streamlit solo
+ejecuta cuando se hace clic en el botón.
+
+Límite: ``st.download_button`` no transmite desde un archivo; convierte lo
+que recibe a bytes y los guarda en su almacenamiento de medios en memoria.
+Así que el archivo comprimido completo sí pasa a memoria en cada descarga
+(el CSV sin comprimir no). Por eso las exportaciones se limitan a
+``MAX_FILAS`` filas; con más, el dashboard pide filtrar antes de descargar.
+
+Variables de entorno:
+    EXPORTAR_MAX_FILAS (2000000)
+"""
+import gzip
+import io
+import os
+import tempfile
+
+FILAS_BLOQUE = 100_000
+MAX_FILAS = int(os.environ.get('EXPORTAR_MAX_FILAS', '2000000'))
+# Nivel 9 (el de gzip por defecto) triplica el tiempo y ahorra poco en CSV
+COMPRESION_GZIP = 5
+
+# Formato visible -> (extensión, tipo MIME)
+FORMATOS = {
+    'CSV (gzip)': ('csv.gz', 'application/gzip'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+}
+
+
+def _bloques(df, filas_bloque):
+    for inicio in range(0, max(len(df), 1), filas_bloque):
+        yield inicio, df.iloc[inicio:inicio + filas_bloque]
+
+
+def escribir_csv_gz(df, destino, filas_bloque=FILAS_BLOQUE):
+    """CSV UTF-8 comprimido con gzip, escrito bloque por bloque en ``destino``."""
+    with gzip.GzipFile(fileobj=destino, mode='wb', compresslevel=COMPRESION_GZIP) as comprimido, \
+            io.TextIOWrapper(comprimido, encoding='utf-8', newline='') as texto:
+        for inicio, bloque in _bloques(df, filas_bloque):
+            bloque.to_csv(texto, index=False, header=inicio == 0)
+
+
+def escribir_parquet(df, destino, filas_bloque=FILAS_BLOQUE):
+    """Parquet con un row group por bloque, escrito en ``destino``."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    esquema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    with pq.ParquetWriter(destino, esquema) as escritor:
+        for _, bloque in _bloques(df, filas_bloque):
+            escritor.write_table(pa.Table.from_pandas(bloque, schema=esquema, preserve_index=False))
+
+
+def exportable(df):
+    """True si ``df`` no supera ``MAX_FILAS`` filas."""
+    return len(df) <= MAX_FILAS
+
+
+def exportar(df, formato):
+    """Bytes del archivo con ``df`` en el ``formato`` pedido.
+
+    Se escribe por bloques a un temporal en disco, que se cierra (y borra)
+    al terminar; el resultado comprimido completo se devuelve en memoria
+    (ver el límite en el docstring del módulo). Con más de ``MAX_FILAS``
+    filas lanza ``ValueError``.
+    """
+    if not exportable(df):
+        raise ValueError(f"La exportación tiene {len(df):,} filas; el máximo es {MAX_FILAS:,}")
+    with tempfile.TemporaryFile() as destino:
+        if formato == 'Parquet':
+            escribir_parquet(df, destino)
+        else:
+            escribir_csv_gz(df, destino)
+        destino.seek(0)
+        return destino.read()
@@ -0,0 +1,130 @@
+"""Motor de filtros indexado para los dashboards.
+
+El motor no copia el DataFrame: guarda una referencia y el orden por
+fecha como arreglo de posiciones (nada si ya viene ordenado). Para cada
+columna categórica se guarda la lista ordenada de posiciones (en ese
+orden) de cada valor. Un filtro se resuelve con:
+
+- dos ``searchsorted`` sobre los días (el rango de fechas es un tramo contiguo)
+- una intersección de listas de posiciones por cada columna seleccionada
+- un único ``take`` al final, traduciendo las posiciones al frame original
+
+Las uniones de valores seleccionados se guardan en un cache LRU, así que
+volver a una selección ya vista no cuesta nada.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+VACIO = np.empty(0, dtype=np.int64)
+
+
+def dias_ordinales(serie):
+    """Fechas como número entero de días (datetime64[D] -> int64)."""
+    return serie.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+
+
+def dia_ordinal(fecha):
+    """Un ``date``/``datetime`` como número entero de días."""
+    return int(np.datetime64(pd.Timestamp(fecha).date(), 'D').astype(np.int64))
+
+
+def rango_ordenado(dias, fi, ff):
+    """Tramo [lo, hi) de un arreglo de días ordenado que cae entre fi y ff (inclusive)."""
+    lo = int(np.searchsorted(dias, dia_ordinal(fi), side='left'))
+    hi = int(np.searchsorted(dias, dia_ordinal(ff), side='right'))
+    return lo, hi
+
+
+def _indice_posiciones(serie):
+    """valor -> posiciones ordenadas; los nulos quedan bajo la clave None."""
+    cat = pd.Categorical(serie)
+    codigos = cat.codes.astype(np.int64)
+    orden = np.argsort(codigos, kind='stable')
+    limites = np.searchsorted(codigos[orden], np.arange(-1, len(cat.categories) + 1))
+    claves = [None] + list(cat.categories)
+    return {
+        clave: orden[limites[i]:limites[i + 1]]
+        for i, clave in enumerate(claves)
+        if limites[i + 1] > limites[i]
+    }
+
+
+class MotorFiltros:
+    """Filtra por rango de fechas y valores de columnas categóricas."""
+
+    def __init__(self, df, columna_fecha, columnas, max_cache=256):
+        # Se ordena por el ordinal (no por la fecha) para que los NaT queden
+        # donde searchsorted espera encontrarlos. Sin np.diff: restarle NaT
+        # (el mínimo de int64) desborda y un NaT al final parecía ordenado.
+        dias = dias_ordinales(df[columna_fecha])
+        if (dias[1:] < dias[:-1]).any():
+            self.orden = np.argsort(dias, kind='stable')
+            self.dias = dias[self.orden]
+        else:
+            self.orden = None
+            self.dias = dias
+        self.df = df
+        self.columna_fecha = columna_fecha
+        self.indices = {col: _indice_posiciones(self._ordenada(col)) for col in columnas}
+
+        self.max_cache = max_cache
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _ordenada(self, columna):
+        serie = self.df[columna]
+        return serie if self.orden is None else serie.take(self.orden)
+
+    def _filas(self, pos):
+        # Posiciones en el orden por fecha -> filas del frame original
+        return self.df.take(pos if self.orden is None else self.orden[pos])
+
+    def posiciones(self, columna, valores):
+        """Posiciones ordenadas de las filas cuyo valor está en ``valores``."""
+        clave = (columna, frozenset(None if pd.isna(v) else v for v in valores))
+        with self._lock:
+            if clave in self._cache:
+                self._cache.move_to_end(clave)
+                return self._cache[clave]
+
+        indice = self.indices[columna]
+        listas = [indice[v] for v in clave[1] if v in indice]
+        if not listas:
+            pos = VACIO
+        elif len(listas) == 1:
+            pos = listas[0]
+        else:
+            pos = np.sort(np.concatenate(listas))
+
+        with self._lock:
+            self._cache[clave] = pos
+            if len(self._cache) > self.max_cache:
+                self._cache.popitem(last=False)
+        return pos
+
+    def filtrar(self, fi, ff, selecciones):
+        """Filas entre fi y ff con los valores seleccionados por columna.
+
+        ``selecciones`` es un dict columna -> lista de valores; una lista
+        vacía significa "sin filtro" en esa columna.
+        """
+        lo, hi = rango_ordenado(self.dias, fi, ff)
+
+        pos = None
+        for columna, valores in selecciones.items():
+            if not valores:
+                continue
+            sel = self.posiciones(columna, valores)
+            pos = sel if pos is None else np.intersect1d(pos, sel, assume_unique=True)
+
+        if pos is None:
+            # Sin filtros categóricos: el rango de fechas es un tramo contiguo
+            if self.orden is None:
+                return self.df.iloc[lo:hi]
+            return self._filas(np.arange(lo, hi))
+
+        pos = pos[np.searchsorted(pos, lo):np.searchsorted(pos, hi)]
+        return self._filas(pos)
@@ -0,0 +1,61 @@
+"""Carga de las asistencias del club (app.py).
+
+Fuera del script para que la usen tanto el dashboard (a través de
+``refresco.py``) como ``precalentar.py``.
+"""
+import numpy as np
+import pandas as pd
+
+from compactar import compactar
+from conexion import get_engine, leer_en_bloques
+from consultas import COLUMNAS_ASISTENCIA, MAIN_QUERY, ORIGEN_ASISTENCIAS, VERSION_ASISTENCIAS
+import snapshots
+import versiones
+
+
+def a_timedelta(horas):
+    """Columna TIME (texto 'HH:MM:SS', ``time`` o ``timedelta`` según el driver) como timedelta64.
+
+    Las horas de inicio se repiten mucho (horarios de clase): se convierte
+    una vez cada valor distinto y se expande con sus códigos.
+    """
+    codigos, unicos = pd.factorize(horas)
+    valores = pd.to_timedelta(pd.Index(unicos).astype(str), errors='coerce').to_numpy()
+    resultado = np.empty(len(codigos), dtype='timedelta64[ns]')
+    resultado[:] = np.timedelta64('NaT')
+    resultado[codigos >= 0] = valores[codigos[codigos >= 0]]
+    return pd.Series(resultado, index=horas.index)
+
+
+def codigo_entero(serie, dtype='int8'):
+    """Serie numérica con nulos como enteros chicos (-1 = nulo)."""
+    return serie.fillna(-1).astype(dtype)
+
+
+def consultar_asistencias(engine):
+    # Las columnas llegan ya tipadas (consultas.py): se trunca la fecha al día
+    df = leer_en_bloques(engine, MAIN_QUERY, COLUMNAS_ASISTENCIA)
+    df['fecha_inicio'] = df['fecha_inicio'].dt.normalize()
+    # Fecha y hora en un solo datetime64; la hora y el día de la semana
+    # quedan además como códigos int8 para los conteos con np.bincount
+    df['inicio'] = df['fecha_inicio'] + a_timedelta(df.pop('hora_inicio'))
+    df['hora'] = codigo_entero(df['inicio'].dt.hour)
+    df['dia_semana'] = codigo_entero(df['fecha_inicio'].dt.dayofweek)
+    return compactar(df, "asistencias")
+
+
+def version(db_uri):
+    """Versión actual de las asistencias (sondeo de ``VERSION_ASISTENCIAS``)."""
+    return versiones.actual(get_engine(db_uri), VERSION_ASISTENCIAS, ORIGEN_ASISTENCIAS)
+
+
+def cargar(db_uri, version_datos=None):
+    """Asistencias desde el snapshot en disco de esta versión de los datos, o de la base."""
+    engine = get_engine(db_uri)
+    if version_datos is None:
+        version_datos = version(db_uri)
+    return snapshots.cargar(
+        "asistencias",
+        snapshots.clave(db_uri, MAIN_QUERY, version=version_datos),
+        lambda: consultar_asistencias(engine),
+    )
@@ -0,0 +1,674 @@
+"""Generador de datos de prueba para los cuatro dashboards.
+
+Crea los esquemas de blog (clase.py), fitness (app.py), ventas (graficos.py)
+y hotel (proyecto.py) en una base local (SQLite por defecto, o MySQL con
+--uri) y los llena con datos sintéticos con sesgo realista:
+
+- productos "calientes" y clientes que repiten compras (distribución Zipf)
+- socios inscritos en varias clases, con horas pico de asistencia
+- reservas con varias habitaciones, servicios especiales y pagos
+
+Faker solo se usa para armar catálogos de nombres; las tablas de hechos se
+generan por bloques con NumPy y se insertan con executemany.
+
+Uso:
+    python generar_datos.py --esquema todos --escala 10k
+    python generar_datos.py --esquema ventas --escala 1m --uri "mysql+pymysql://root@localhost/VENTAS"
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from faker import Faker
+from sqlalchemy import (
+    Column, Date, DateTime, Float, Integer, MetaData, String, Table, Time,
+    create_engine, event,
+)
+
+ESCALAS = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+ESQUEMAS = ('blog', 'fitness', 'ventas', 'hotel')
+
+TAM_BLOQUE = 200_000
+FECHA_INICIO = np.datetime64('2022-01-01')
+DIAS_HISTORIA = 3 * 365
+
+
+# ============================================================
+# ESQUEMAS
+# ============================================================
+def esquema_blog():
+    md = MetaData()
+    Table('usuario', md,
+          Column('id_usuario', Integer, primary_key=True),
+          Column('nombre_usuario', String(60)))
+    Table('post', md,
+          Column('id_post', Integer, primary_key=True),
+          Column('id_usuario', Integer, index=True),
+          Column('titulo', String(200)),
+          Column('fecha_publicacion', DateTime, index=True))
+    Table('etiqueta', md,
+          Column('id_etiqueta', Integer, primary_key=True),
+          Column('id_post', Integer, index=True),
+          Column('texto_etiqueta', String(60)))
+    return md
+
+
+def esquema_fitness():
+    md = MetaData()
+    Table('socios', md,
+          Column('id_socios', Integer, primary_key=True),
+          Column('nombre', String(60)),
+          Column('apellido_paterno', String(60)))
+    Table('instructor', md,
+          Column('id_instructor', Integer, primary_key=True),
+          Column('nombre', String(60)),
+          Column('apellido_paterno', String(60)))
+    Table('clases', md,
+          Column('id_clase', Integer, primary_key=True),
+          Column('nombre', String(60)),
+          Column('zona', String(40)),
+          Column('id_instructor', Integer))
+    Table('socios_clases', md,
+          Column('id_socio', Integer, primary_key=True),
+          Column('id_clase', Integer, primary_key=True))
+    Table('asistencia', md,
+          Column('id_asistencia', Integer, primary_key=True),
+          Column('id_socio', Integer, index=True),
+          Column('fecha_inicio', Date, index=True),
+          Column('hora_inicio', Time),
+          Column('intensidad_percibida', Integer))
+    return md
+
+
+def esquema_ventas():
+    md = MetaData()
+    Table('fabrica', md,
+          Column('id_fabrica', Integer, primary_key=True),
+          Column('pais', String(60)),
+          Column('nombre', String(100)))
+    Table('producto', md,
+          Column('id_producto', Integer, primary_key=True),
+          Column('codigo_producto', String(20)),
+          Column('descripcion', String(100)),
+          Column('color', String(30)),
+          Column('id_fabrica', Integer))
+    Table('sucursal', md,
+          Column('id_sucursal', Integer, primary_key=True),
+          Column('numero_sucursal', Integer),
+          Column('ciudad', String(60)))
+    Table('sucursal_producto', md,
+          Column('id_sucursal', Integer, primary_key=True),
+          Column('id_producto', Integer, primary_key=True, index=True))
+    Table('cliente', md,
+          Column('id_cliente', Integer, primary_key=True),
+          Column('nombre_cliente', String(60)),
+          Column('apellido_paterno', String(60)),
+          Column('apellido_materno', String(60)),
+          Column('codigo_cliente', String(20)),
+          Column('ci', String(20)))
+    Table('direccion_clientes', md,
+          Column('id_direccion', Integer, primary_key=True),
+          Column('id_cliente', Integer, index=True),
+          Column('ciudad', String(60)))
+    Table('compra', md,
+          Column('id_compra', Integer, primary_key=True),
+          Column('fecha_compra', DateTime, index=True),
+          Column('monto', Float),
+          Column('descuento', Float),
+          Column('id_producto', Integer),
+          Column('id_cliente', Integer))
+    for tabla, pk in (('tipo_pago_qr', 'id_pago_qr'),
+                      ('tipo_pago_tarjeta', 'id_pago_tarjeta'),
+                      ('tipo_pago_efectivo', 'id_pago_efectivo'),
+                      ('tipo_pago_transferencia', 'id_tipo_pago_transferencia')):
+        Table(tabla, md,
+              Column(pk, Integer, primary_key=True),
+              Column('id_compra', Integer, index=True))
+    return md
+
+
+def esquema_hotel():
+    md = MetaData()
+    Table('cliente', md,
+          Column('id_cliente', Integer, primary_key=True),
+          Column('nombre', String(60)),
+          Column('apellido_paterno', String(60)),
+          Column('apellido_materno', String(60)),
+          Column('ci', String(20)))
+    Table('reserva', md,
+          Column('id_reserva', Integer, primary_key=True),
+          Column('id_cliente', Integer, index=True),
+          Column('fecha_reserva', Date, index=True),
+          Column('fecha_vencimiento', Date),
+          Column('monto_total', Float),
+          Column('estado_reserva', String(30)),
+          Column('localizacion_reserva', String(60)))
+    Table('tipo_habitacion', md,
+          Column('id_tipo_habitacion', Integer, primary_key=True),
+          Column('tipo_cama', String(30)),
+          Column('numero_camas', Integer),
+          Column('descripcion', String(60)),
+          Column('capacidad', Integer))
+    Table('habitacion', md,
+          Column('id_habitacion', Integer, primary_key=True),
+          Column('numero_habitacion', Integer),
+          Column('piso', Integer),
+          Column('precio', Float),
+          Column('id_tipo_habitacion', Integer))
+    Table('detalle_reserva', md,
+          Column('id_detalle_reserva', Integer, primary_key=True),
+          Column('id_reserva', Integer, index=True),
+          Column('id_habitacion', Integer),
+          Column('cantidad_personas', Integer),
+          Column('check_in', Date),
+          Column('check_out', Date))
+    Table('servicios_especiales', md,
+          Column('id_servicios_especiales', Integer, primary_key=True),
+          Column('nombre', String(60)),
+          Column('precio', Float))
+    Table('detalle_reserva_servicios_especiales', md,
+          Column('id_detalle_servicio', Integer, primary_key=True),
+          Column('id_detalle_reserva', Integer, index=True),
+          Column('id_servicios_especiales', Integer),
+          Column('precio_unitario', Float),
+          Column('subtotal', Float),
+          Column('hora', DateTime))
+    Table('estado_pago', md,
+          Column('id_estado_pago', Integer, primary_key=True),
+          Column('nombre_estado_pago', String(30)))
+    Table('metodo_pago', md,
+          Column('id_metodo_pago', Integer, primary_key=True),
+          Column('nombre', String(30)))
+    Table('detalle_pago', md,
+          Column('id_detalle_pago', Integer, primary_key=True),
+          Column('monto', Float),
+          Column('fecha', Date),
+          Column('id_metodo_pago', Integer))
+    Table('pago', md,
+          Column('id_pago', Integer, primary_key=True),
+          Column('id_reserva', Integer, index=True),
+          Column('monto', Float),
+          Column('estado_pago', String(30)),
+          Column('fecha_pago', Date),
+          Column('id_detalle_pago', Integer),
+          Column('id_estado_pago', Integer))
+    return md
+
+
+# ============================================================
+# UTILIDADES
+# ============================================================
+def pesos_zipf(n, s, rng):
+    """Pesos de popularidad Zipf (rango^-s) repartidos al azar entre n ids."""
+    pesos = 1.0 / np.arange(1, n + 1) ** s
+    rng.shuffle(pesos)
+    return pesos / pesos.sum()
+
+
+def elegir(rng, n, tam, pesos=None):
+    """Ids 1..n elegidos según pesos."""
+    return rng.choice(n, size=tam, p=pesos) + 1
+
+
+def fechas_aleatorias(rng, tam, con_hora=False):
+    """Fechas en los últimos tres años, con más movimiento en los recientes."""
+    dias = (np.sqrt(rng.random(tam)) * DIAS_HISTORIA).astype(np.int64)
+    fechas = FECHA_INICIO + dias.astype('timedelta64[D]')
+    if not con_hora:
+        return fechas
+    segundos = rng.integers(8 * 3600, 22 * 3600, size=tam).astype('timedelta64[s]')
+    return fechas.astype('datetime64[s]') + segundos
+
+
+def como_texto(valores):
+    """datetime64 -> texto ISO que aceptan tanto SQLite como MySQL."""
+    if valores.dtype == 'datetime64[s]':
+        return np.char.replace(np.datetime_as_string(valores, unit='s'), 'T', ' ')
+    return np.datetime_as_string(valores, unit='D')
+
+
+def conteos(rng, tam, probabilidades):
+    """Cantidad de hijos por fila (0, 1, 2, ...) según probabilidades."""
+    return rng.choice(len(probabilidades), size=tam, p=probabilidades)
+
+
+def pool_nombres(fake, tam):
+    return np.array([fake.first_name() for _ in range(tam)], dtype=object)
+
+
+def pool_apellidos(fake, tam):
+    return np.array([fake.last_name() for _ in range(tam)], dtype=object)
+
+
+class Cargador:
+    """Inserta bloques de columnas con executemany sobre la conexión cruda."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        estilo = engine.dialect.paramstyle
+        self.marca = '?' if estilo == 'qmark' else '%s'
+        self.filas = 0
+
+    def insertar(self, tabla, columnas):
+        nombres = list(columnas)
+        valores = [np.asarray(columnas[c]).tolist() for c in nombres]
+        if not valores or not valores[0]:
+            return
+        sql = (
+            f"INSERT INTO {tabla} ({', '.join(nombres)}) "
+            f"VALUES ({', '.join([self.marca] * len(nombres))})"
+        )
+        crudo = self.engine.raw_connection()
+        try:
+            cursor = crudo.cursor()
+            cursor.executemany(sql, list(zip(*valores)))
+            crudo.commit()
+        finally:
+            crudo.close()
+        self.filas += len(valores[0])
+
+
+def bloques(total):
+    """(inicio, tamaño) de cada bloque de hechos."""
+    for inicio in range(0, total, TAM_BLOQUE):
+        yield inicio, min(TAM_BLOQUE, total - inicio)
+
+
+# ============================================================
+# GENERADORES POR ESQUEMA
+# ============================================================
+def generar_blog(carga, n, rng, fake):
+    n_usuarios = max(20, n // 50)
+    usuarios = [f"{fake.user_name()}{i}" for i in range(1, n_usuarios + 1)]
+    carga.insertar('usuario', {
+        'id_usuario': np.arange(1, n_usuarios + 1),
+        'nombre_usuario': usuarios,
+    })
+
+    titulos = np.array([fake.sentence(nb_words=6).rstrip('.') for _ in range(5000)], dtype=object)
+    vocabulario = np.array(sorted({fake.word().lower() for _ in range(1500)}), dtype=object)
+    p_autor = pesos_zipf(n_usuarios, 1.1, rng)
+    p_tag = pesos_zipf(len(vocabulario), 1.0, rng)
+
+    id_etiqueta = 1
+    for inicio, tam in bloques(n):
+        ids = np.arange(inicio + 1, inicio + tam + 1)
+        carga.insertar('post', {
+            'id_post': ids,
+            'id_usuario': elegir(rng, n_usuarios, tam, p_autor),
+            'titulo': titulos[rng.integers(0, len(titulos), tam)],
+            'fecha_publicacion': como_texto(fechas_aleatorias(rng, tam, con_hora=True)),
+        })
+        k = conteos(rng, tam, [0.15, 0.3, 0.3, 0.15, 0.1])
+        etiquetas = pd.DataFrame({
+            'id_post': np.repeat(ids, k),
+            'texto_etiqueta': vocabulario[rng.choice(len(vocabulario), size=k.sum(), p=p_tag)],
+        }).drop_duplicates()
+        carga.insertar('etiqueta', {
+            'id_etiqueta': np.arange(id_etiqueta, id_etiqueta + len(etiquetas)),
+            'id_post': etiquetas['id_post'].to_numpy(),
+            'texto_etiqueta': etiquetas['texto_etiqueta'].to_numpy(),
+        })
+        id_etiqueta += len(etiquetas)
+
+
+CLASES_FITNESS = ['Spinning', 'Yoga', 'Crossfit', 'Pilates', 'Zumba', 'Funcional',
+                  'Boxeo', 'Natación', 'Body Pump', 'Stretching']
+NIVELES = ['Básico', 'Intermedio', 'Avanzado']
+SALAS = ['Sala 1', 'Sala 2', 'Sala 3', 'Sala Ciclismo', 'Piscina', 'Exterior']
+
+
+def generar_fitness(carga, n, rng, fake):
+    n_instructores = max(5, min(60, n // 20_000))
+    carga.insertar('instructor', {
+        'id_instructor': np.arange(1, n_instructores + 1),
+        'nombre': pool_nombres(fake, n_instructores),
+        'apellido_paterno': pool_apellidos(fake, n_instructores),
+    })
+
+    nombres_clase = [f"{c} {nv}" for c in CLASES_FITNESS for nv in NIVELES]
+    n_clases = len(nombres_clase)
+    carga.insertar('clases', {
+        'id_clase': np.arange(1, n_clases + 1),
+        'nombre': nombres_clase,
+        'zona': np.array(SALAS, dtype=object)[rng.integers(0, len(SALAS), n_clases)],
+        'id_instructor': rng.integers(1, n_instructores + 1, n_clases),
+    })
+
+    n_socios = max(50, n // 100)
+    nombres, apellidos = pool_nombres(fake, 2000), pool_apellidos(fake, 2000)
+    carga.insertar('socios', {
+        'id_socios': np.arange(1, n_socios + 1),
+        'nombre': nombres[rng.integers(0, len(nombres), n_socios)],
+        'apellido_paterno': apellidos[rng.integers(0, len(apellidos), n_socios)],
+    })
+
+    # Cada socio se inscribe en 0-4 clases, con clases más populares que otras
+    k = conteos(rng, n_socios, [0.1, 0.35, 0.3, 0.15, 0.1])
+    inscripciones = pd.DataFrame({
+        'id_socio': np.repeat(np.arange(1, n_socios + 1), k),
+        'id_clase': elegir(rng, n_clases, k.sum(), pesos_zipf(n_clases, 0.8, rng)),
+    }).drop_duplicates()
+    carga.insertar('socios_clases', {c: inscripciones[c].to_numpy() for c in inscripciones})
+
+    p_socio = pesos_zipf(n_socios, 0.9, rng)
+    for inicio, tam in bloques(n):
+        # Horas pico: mañana temprano, mediodía y tarde-noche
+        pico = rng.choice([7.0, 12.5, 19.0], size=tam, p=[0.35, 0.15, 0.5])
+        hora = np.clip(rng.normal(pico, 1.2), 6, 22)
+        segundos = (np.round(hora * 2) / 2 * 3600).astype(np.int64)
+        carga.insertar('asistencia', {
+            'id_asistencia': np.arange(inicio + 1, inicio + tam + 1),
+            'id_socio': elegir(rng, n_socios, tam, p_socio),
+            'fecha_inicio': como_texto(fechas_aleatorias(rng, tam)),
+            'hora_inicio': pd.to_datetime(segundos, unit='s').strftime('%H:%M:%S').to_numpy(),
+            'intensidad_percibida': np.clip(rng.normal(6, 2, tam).round(), 1, 10).astype(int),
+        })
+
+
+PRODUCTOS = ['Polera', 'Pantalón', 'Chamarra', 'Zapatilla', 'Gorra', 'Mochila',
+             'Vestido', 'Camisa', 'Buzo', 'Short', 'Bufanda', 'Medias']
+COLORES = ['Negro', 'Blanco', 'Rojo', 'Azul', 'Verde', 'Gris', 'Amarillo', 'Café']
+CIUDADES = ['La Paz', 'El Alto', 'Cochabamba', 'Santa Cruz', 'Oruro', 'Potosí',
+            'Sucre', 'Tarija', 'Trinidad', 'Cobija']
+
+
+def generar_ventas(carga, n, rng, fake):
+    n_fabricas = 20
+    carga.insertar('fabrica', {
+        'id_fabrica': np.arange(1, n_fabricas + 1),
+        'pais': [fake.country() for _ in range(n_fabricas)],
+        'nombre': [fake.company() for _ in range(n_fabricas)],
+    })
+
+    n_productos = max(50, min(5000, n // 200))
+    adjetivos = [fake.word().capitalize() for _ in range(200)]
+    carga.insertar('producto', {
+        'id_producto': np.arange(1, n_productos + 1),
+        'codigo_producto': [f"P{i:06d}" for i in range(1, n_productos + 1)],
+        'descripcion': [f"{PRODUCTOS[i % len(PRODUCTOS)]} {adjetivos[i % len(adjetivos)]} {i}"
+                        for i in range(n_productos)],
+        'color': np.array(COLORES, dtype=object)[rng.integers(0, len(COLORES), n_productos)],
+        'id_fabrica': rng.integers(1, n_fabricas + 1, n_productos),
+    })
+
+    n_sucursales = 25
+    carga.insertar('sucursal', {
+        'id_sucursal': np.arange(1, n_sucursales + 1),
+        'numero_sucursal': np.arange(100, 100 + n_sucursales),
+        'ciudad': np.array(CIUDADES, dtype=object)[rng.integers(0, len(CIUDADES), n_sucursales)],
+    })
+    # Cada producto se vende en 1-3 sucursales (el join con sucursal_producto multiplica)
+    k = conteos(rng, n_productos, [0, 0.6, 0.3, 0.1])
+    sp = pd.DataFrame({
+        'id_sucursal': rng.integers(1, n_sucursales + 1, k.sum()),
+        'id_producto': np.repeat(np.arange(1, n_productos + 1), k),
+    }).drop_duplicates()
+    carga.insertar('sucursal_producto', {c: sp[c].to_numpy() for c in sp})
+
+    n_clientes = max(100, n // 10)
+    nombres, apellidos = pool_nombres(fake, 2000), pool_apellidos(fake, 2000)
+    carga.insertar('cliente', {
+        'id_cliente': np.arange(1, n_clientes + 1),
+        'nombre_cliente': nombres[rng.integers(0, len(nombres), n_clientes)],
+        'apellido_paterno': apellidos[rng.integers(0, len(apellidos), n_clientes)],
+        'apellido_materno': apellidos[rng.integers(0, len(apellidos), n_clientes)],
+        'codigo_cliente': [f"C{i:07d}" for i in range(1, n_clientes + 1)],
+        'ci': rng.integers(1_000_000, 9_999_999, n_clientes).astype(str),
+    })
+    k = conteos(rng, n_clientes, [0, 0.9, 0.1])
+    p_ciudad = pesos_zipf(len(CIUDADES), 1.0, rng)
+    carga.insertar('direccion_clientes', {
+        'id_direccion': np.arange(1, k.sum() + 1),
+        'id_cliente': np.repeat(np.arange(1, n_clientes + 1), k),
+        'ciudad': np.array(CIUDADES, dtype=object)[rng.choice(len(CIUDADES), k.sum(), p=p_ciudad)],
+    })
+
+    precio_base = np.round(rng.lognormal(4, 0.6, n_productos), 2)
+    p_producto = pesos_zipf(n_productos, 1.2, rng)
+    p_cliente = pesos_zipf(n_clientes, 1.05, rng)
+    tablas_pago = ['tipo_pago_qr', 'tipo_pago_tarjeta', 'tipo_pago_efectivo', 'tipo_pago_transferencia']
+    pks_pago = ['id_pago_qr', 'id_pago_tarjeta', 'id_pago_efectivo', 'id_tipo_pago_transferencia']
+    siguiente_pago = [1, 1, 1, 1]
+
+    for inicio, tam in bloques(n):
+        ids = np.arange(inicio + 1, inicio + tam + 1)
+        producto = elegir(rng, n_productos, tam, p_producto)
+        monto = np.round(precio_base[producto - 1] * rng.lognormal(0, 0.25, tam), 2)
+        con_descuento = rng.random(tam) < 0.3
+        descuento = np.where(con_descuento, np.round(monto * rng.uniform(0.05, 0.2, tam), 2), 0.0)
+        carga.insertar('compra', {
+            'id_compra': ids,
+            'fecha_compra': como_texto(fechas_aleatorias(rng, tam, con_hora=True)),
+            'monto': monto,
+            'descuento': descuento,
+            'id_producto': producto,
+            'id_cliente': elegir(rng, n_clientes, tam, p_cliente),
+        })
+        # Un medio de pago por compra; ~3% queda sin registro
+        medio = rng.choice(5, size=tam, p=[0.3, 0.3, 0.27, 0.1, 0.03])
+        for m, (tabla, pk) in enumerate(zip(tablas_pago, pks_pago)):
+            compras = ids[medio == m]
+            carga.insertar(tabla, {
+                pk: np.arange(siguiente_pago[m], siguiente_pago[m] + len(compras)),
+                'id_compra': compras,
+            })
+            siguiente_pago[m] += len(compras)
+
+
+TIPOS_HABITACION = [
+    ('Simple', 1, 'Simple estándar', 1), ('Matrimonial', 1, 'Matrimonial', 2),
+    ('Twin', 2, 'Doble twin', 2), ('Queen', 2, 'Familiar', 4),
+    ('King', 1, 'Suite', 2), ('Queen', 3, 'Suite familiar', 6),
+]
+SERVICIOS = [('Desayuno buffet', 60), ('Spa', 250), ('Lavandería', 40), ('Traslado aeropuerto', 120),
+             ('Cena romántica', 300), ('Tour ciudad', 180), ('Parqueo', 30), ('Late check-out', 90)]
+HOTELES = ['Hotel Centro La Paz', 'Hotel Cochabamba', 'Hotel Santa Cruz', 'Hotel Sucre', 'Hotel Uyuni']
+ESTADOS_RESERVA = ['CONFIRMADA', 'PENDIENTE', 'CANCELADA', 'FINALIZADA']
+ESTADOS_PAGO = ['Pagado', 'Pendiente', 'Rechazado']
+METODOS_PAGO = ['Efectivo', 'Tarjeta', 'QR', 'Transferencia']
+
+
+def generar_hotel(carga, n, rng, fake):
+    carga.insertar('tipo_habitacion', {
+        'id_tipo_habitacion': np.arange(1, len(TIPOS_HABITACION) + 1),
+        'tipo_cama': [t[0] for t in TIPOS_HABITACION],
+        'numero_camas': [t[1] for t in TIPOS_HABITACION],
+        'descripcion': [t[2] for t in TIPOS_HABITACION],
+        'capacidad': [t[3] for t in TIPOS_HABITACION],
+    })
+    n_habitaciones = 300
+    tipo_hab = rng.choice(len(TIPOS_HABITACION), n_habitaciones, p=[0.25, 0.25, 0.2, 0.15, 0.1, 0.05])
+    tarifa = np.round(np.array([200, 300, 320, 450, 700, 900])[tipo_hab] * rng.uniform(0.9, 1.2, n_habitaciones), 2)
+    capacidad = np.array([t[3] for t in TIPOS_HABITACION])[tipo_hab]
+    carga.insertar('habitacion', {
+        'id_habitacion': np.arange(1, n_habitaciones + 1),
+        'numero_habitacion': np.arange(101, 101 + n_habitaciones),
+        'piso': np.arange(n_habitaciones) // 20 + 1,
+        'precio': tarifa,
+        'id_tipo_habitacion': tipo_hab + 1,
+    })
+    carga.insertar('servicios_especiales', {
+        'id_servicios_especiales': np.arange(1, len(SERVICIOS) + 1),
+        'nombre': [s[0] for s in SERVICIOS],
+        'precio': [float(s[1]) for s in SERVICIOS],
+    })
+    carga.insertar('estado_pago', {
+        'id_estado_pago': np.arange(1, len(ESTADOS_PAGO) + 1),
+        'nombre_estado_pago': ESTADOS_PAGO,
+    })
+    carga.insertar('metodo_pago', {
+        'id_metodo_pago': np.arange(1, len(METODOS_PAGO) + 1),
+        'nombre': METODOS_PAGO,
+    })
+
+    n_clientes = max(100, n // 5)
+    nombres, apellidos = pool_nombres(fake, 2000), pool_apellidos(fake, 2000)
+    carga.insertar('cliente', {
+        'id_cliente': np.arange(1, n_clientes + 1),
+        'nombre': nombres[rng.integers(0, len(nombres), n_clientes)],
+        'apellido_paterno': apellidos[rng.integers(0, len(apellidos), n_clientes)],
+        'apellido_materno': apellidos[rng.integers(0, len(apellidos), n_clientes)],
+        'ci': rng.integers(1_000_000, 9_999_999, n_clientes).astype(str),
+    })
+
+    p_cliente = pesos_zipf(n_clientes, 1.0, rng)
+    p_hotel = pesos_zipf(len(HOTELES), 0.8, rng)
+    p_servicio = pesos_zipf(len(SERVICIOS), 1.0, rng)
+    precio_servicio = np.array([s[1] for s in SERVICIOS], dtype=float)
+    id_detalle, id_servicio, id_pago = 1, 1, 1
+
+    for inicio, tam in bloques(n):
+        ids = np.arange(inicio + 1, inicio + tam + 1)
+        fecha = fechas_aleatorias(rng, tam)
+        noches = rng.geometric(0.4, tam).clip(1, 14)
+
+        # Habitaciones por reserva (1-3), todas con las mismas fechas
+        k_det = conteos(rng, tam, [0, 0.7, 0.22, 0.08])
+        det_res = np.repeat(np.arange(tam), k_det)
+        n_det = len(det_res)
+        hab = rng.integers(0, n_habitaciones, n_det)
+        check_in = fecha[det_res] + rng.integers(0, 60, n_det).astype('timedelta64[D]')
+        check_out = check_in + noches[det_res].astype('timedelta64[D]')
+        ids_det = np.arange(id_detalle, id_detalle + n_det)
+        id_detalle += n_det
+
+        # Servicios especiales por habitación (0-3)
+        k_srv = conteos(rng, n_det, [0.5, 0.3, 0.15, 0.05])
+        srv_det = np.repeat(np.arange(n_det), k_srv)
+        n_srv = len(srv_det)
+        servicio = rng.choice(len(SERVICIOS), n_srv, p=p_servicio)
+        precio_u = np.round(precio_servicio[servicio] * rng.uniform(0.9, 1.1, n_srv), 2)
+        cantidad = rng.integers(1, 4, n_srv)
+        subtotal = np.round(precio_u * cantidad, 2)
+        hora = check_in[srv_det].astype('datetime64[s]') + rng.integers(7 * 3600, 23 * 3600, n_srv).astype('timedelta64[s]')
+
+        monto_total = np.round(
+            np.bincount(det_res, weights=tarifa[hab] * noches[det_res], minlength=tam)
+            + np.bincount(det_res[srv_det], weights=subtotal, minlength=tam),
+            2,
+        )
+        carga.insertar('reserva', {
+            'id_reserva': ids,
+            'id_cliente': elegir(rng, n_clientes, tam, p_cliente),
+            'fecha_reserva': como_texto(fecha),
+            'fecha_vencimiento': como_texto(fecha + np.timedelta64(7, 'D')),
+            'monto_total': monto_total,
+            'estado_reserva': np.array(ESTADOS_RESERVA, dtype=object)[
+                rng.choice(len(ESTADOS_RESERVA), tam, p=[0.5, 0.15, 0.1, 0.25])],
+            'localizacion_reserva': np.array(HOTELES, dtype=object)[rng.choice(len(HOTELES), tam, p=p_hotel)],
+        })
+        carga.insertar('detalle_reserva', {
+            'id_detalle_reserva': ids_det,
+            'id_reserva': ids[det_res],
+            'id_habitacion': hab + 1,
+            'cantidad_personas': rng.integers(1, capacidad[hab] + 1),
+            'check_in': como_texto(check_in),
+            'check_out': como_texto(check_out),
+        })
+        carga.insertar('detalle_reserva_servicios_especiales', {
+            'id_detalle_servicio': np.arange(id_servicio, id_servicio + n_srv),
+            'id_detalle_reserva': ids_det[srv_det],
+            'id_servicios_especiales': servicio + 1,
+            'precio_unitario': precio_u,
+            'subtotal': subtotal,
+            'hora': como_texto(hora),
+        })
+        id_servicio += n_srv
+
+        # Pagos por reserva (0-3) en cuotas iguales; cada pago tiene su detalle_pago
+        k_pag = conteos(rng, tam, [0.1, 0.6, 0.25, 0.05])
+        pag_res = np.repeat(np.arange(tam), k_pag)
+        n_pag = len(pag_res)
+        ids_pag = np.arange(id_pago, id_pago + n_pag)
+        id_pago += n_pag
+        monto_pago = np.round(monto_total[pag_res] / np.maximum(k_pag[pag_res], 1), 2)
+        fecha_pago = fecha[pag_res] + rng.integers(0, 30, n_pag).astype('timedelta64[D]')
+        estado = rng.choice(len(ESTADOS_PAGO), n_pag, p=[0.8, 0.15, 0.05])
+        carga.insertar('detalle_pago', {
+            'id_detalle_pago': ids_pag,
+            'monto': monto_pago,
+            'fecha': como_texto(fecha_pago),
+            'id_metodo_pago': rng.integers(1, len(METODOS_PAGO) + 1, n_pag),
+        })
+        carga.insertar('pago', {
+            'id_pago': ids_pag,
+            'id_reserva': ids[pag_res],
+            'monto': monto_pago,
+            'estado_pago': np.array(ESTADOS_PAGO, dtype=object)[estado],
+            'fecha_pago': como_texto(fecha_pago),
+            'id_detalle_pago': ids_pag,
+            'id_estado_pago': estado + 1,
+        })
+
+
+GENERADORES = {
+    'blog': (esquema_blog, generar_blog),
+    'fitness': (esquema_fitness, generar_fitness),
+    'ventas': (esquema_ventas, generar_ventas),
+    'hotel': (esquema_hotel, generar_hotel),
+}
+
+
+# ============================================================
+# PROGRAMA PRINCIPAL
+# ============================================================
+def preparar_engine(uri):
+    engine = create_engine(uri)
+    if engine.dialect.name == 'sqlite':
+        # Carga masiva: sin journal ni fsync (la base es desechable)
+        @event.listens_for(engine, 'connect')
+        def _pragmas(conexion, _):
+            cursor = conexion.cursor()
+            cursor.execute('PRAGMA journal_mode=OFF')
+            cursor.execute('PRAGMA synchronous=OFF')
+            cursor.close()
+    return engine
+
+
+def generar(esquema, filas, uri, semilla=42):
+    """Recrea el esquema en ``uri`` y lo llena con ``filas`` filas de hechos."""
+    crear_esquema, llenar = GENERADORES[esquema]
+    engine = preparar_engine(uri)
+    md = crear_esquema()
+    md.drop_all(engine)
+    md.create_all(engine)
+
+    rng = np.random.default_rng(semilla)
+    Faker.seed(semilla)
+    fake = Faker('es_ES')
+
+    carga = Cargador(engine)
+    t0 = time.perf_counter()
+    llenar(carga, filas, rng, fake)
+    engine.dispose()
+    return carga.filas, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--esquema', choices=ESQUEMAS + ('todos',), default='todos')
+    parser.add_argument('--escala', choices=list(ESCALAS), default='10k',
+                        help='Filas de la tabla de hechos (post, asistencia, compra, reserva)')
+    parser.add_argument('--filas', type=int, help='Cantidad exacta de filas de hechos (ignora --escala)')
+    parser.add_argument('--uri', help='URI SQLAlchemy destino; admite {esquema}. '
+                                      'Por defecto sqlite:///datos/{esquema}_{escala}.db')
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    filas = args.filas or ESCALAS[args.escala]
+    esquemas = ESQUEMAS if args.esquema == 'todos' else (args.esquema,)
+    if args.uri is None:
+        os.makedirs('datos', exist_ok=True)
+
+    for esquema in esquemas:
+        uri = (args.uri or 'sqlite:///datos/{esquema}_{escala}.db').format(
+            esquema=esquema, escala=args.escala if args.filas is None else filas)
+        total, segundos = generar(esquema, filas, uri, args.semilla)
+        print(f"{esquema}: {total:,} filas en {segundos:,.1f} s -> {uri}")
+
+
+if __name__ == '__main__':
+    main()
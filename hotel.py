@@ -0,0 +1,201 @@
+"""Carga del hotel (proyecto.py): del esquema normalizado a cuatro tablas de hechos.
+
+Dos caminos que producen las mismas tablas (reservas, detalles, servicios,
+pagos), cada una a su grano natural y ordenada por fecha de reserva:
+
+- ``consultar_hotel``: un único join de 11 tablas leído en bloques; cada
+  reserva se repite por detalle × servicio × pago y después se deduplica.
+- ``consultar_hotel_paralelo``: cada tabla por separado en un pool de
+  hilos (``conexion.leer_en_paralelo``); las dimensiones chicas (tipos de
+  habitación, catálogo de servicios, métodos y estados de pago) se unen en
+  pandas por clave entera (``uniones.py``) y solo las relaciones uno a
+  muchos usan ``merge``. Por el cable viaja cada fila una sola vez.
+
+``python benchmark.py --hotel`` compara el tiempo de carga de ambos.
+"""
+from compactar import compactar, mes_anio
+from conexion import get_engine, leer_en_bloques, leer_en_paralelo
+from consultas import (
+    COLUMNAS_HOTEL, FROM_HOTEL, ORIGEN_HOTEL, SELECT_HOTEL, TABLAS_HOTEL, VERSION_HOTEL,
+)
+from filtros import dias_ordinales
+import snapshots
+import tiempos
+from uniones import unir_por_clave
+import versiones
+
+# Textos por defecto de las columnas que vienen NULL por los LEFT JOIN
+RELLENO_HOTEL = {
+    "localizacion_reserva": "Sin localización",
+    "descripcion_tipo_habitacion": "Sin descripción",
+    "nombre_servicio_especial": "Sin servicio",
+    "metodo_pago_nombre": "Sin método",
+    "nombre_estado_pago": "Sin estado",
+}
+
+
+@tiempos.medido("tipos")
+def derivar_hotel(df_local):
+    """Textos por defecto y columnas derivadas del join ya tipado."""
+    df_local = df_local.fillna(RELLENO_HOTEL)
+    df_local["mes_anio"] = mes_anio(df_local["fecha_reserva"])
+    df_local["noches"] = (df_local["check_out"] - df_local["check_in"]).dt.days
+    return df_local
+
+
+def consultar_hotel(engine_local):
+    """Carga el join del hotel en bloques (cursor del servidor) y arma los hechos."""
+    # Sin ``total``: el join repite cada reserva por detalle × servicio × pago
+    # y contarlo costaría una segunda ejecución del join. Los bloques se
+    # concatenan una sola vez al final (ver leer_en_bloques).
+    df_local = leer_en_bloques(engine_local, SELECT_HOTEL + FROM_HOTEL, COLUMNAS_HOTEL)
+
+    return construir_hechos(compactar(derivar_hotel(df_local), "hotel"))
+
+
+# Columnas de cada tabla de hechos. Las tablas hijas repiten las columnas de la
+# reserva para poder filtrarse por fecha / localización sin hacer merges.
+COLS_RESERVA = [
+    "id_reserva", "fecha_reserva", "fecha_vencimiento", "monto_total",
+    "estado_reserva", "localizacion_reserva", "mes_anio",
+    "id_cliente", "nombre_cliente", "ci",
+]
+COLS_DETALLE = [
+    "id_detalle_reserva", "id_habitacion", "numero_habitacion", "piso",
+    "tarifa_noche", "id_tipo_habitacion", "tipo_cama", "numero_camas",
+    "descripcion_tipo_habitacion", "capacidad", "cantidad_personas",
+    "check_in", "check_out", "noches",
+]
+COLS_SERVICIO = [
+    "id_detalle_reserva", "id_detalle_servicio", "id_servicios_especiales",
+    "nombre_servicio_especial", "precio_servicio_catalogo", "precio_servicio_reserva",
+    "subtotal_servicio", "hora",
+]
+COLS_PAGO = [
+    "id_pago", "monto_pago", "estado_pago_sistema", "fecha_pago", "nombre_estado_pago",
+    "id_detalle_pago", "monto_detalle_pago", "fecha_detalle_pago",
+    "id_metodo_pago", "metodo_pago_nombre",
+]
+
+
+@tiempos.medido("tipos")
+def construir_hechos(df_join):
+    """Separa el join (reserva × detalle × servicio × pago) en tablas a su grano natural."""
+    # Reserva: una fila por id_reserva. Las noches son las del primer detalle,
+    # igual que el drop_duplicates("id_reserva") que usaban las páginas.
+    reservas = (
+        df_join.drop_duplicates("id_reserva")[COLS_RESERVA + ["noches"]]
+               .reset_index(drop=True)
+    )
+    detalles = (
+        df_join.drop_duplicates("id_detalle_reserva")[COLS_RESERVA + COLS_DETALLE]
+               .reset_index(drop=True)
+    )
+    # Línea de servicio: una fila por id_detalle_servicio de cada detalle (o
+    # una fila "Sin servicio" si el detalle no tiene ninguno), sin la
+    # multiplicación por pagos. Dos líneas iguales (mismo servicio y hora)
+    # son dos cobros distintos.
+    servicios = (
+        df_join.drop_duplicates(["id_detalle_reserva", "id_detalle_servicio"])
+               [COLS_RESERVA + COLS_SERVICIO]
+               .reset_index(drop=True)
+    )
+    # Pago: una fila por pago de cada reserva (o una fila "Sin método" si no tiene pagos).
+    pagos = (
+        df_join.drop_duplicates(["id_reserva", "id_pago"])[COLS_RESERVA + COLS_PAGO]
+               .reset_index(drop=True)
+    )
+    return {
+        "reservas": ordenar_por_fecha(reservas),
+        "detalles": ordenar_por_fecha(detalles),
+        "servicios": ordenar_por_fecha(servicios),
+        "pagos": ordenar_por_fecha(pagos),
+    }
+
+
+def ordenar_por_fecha(df):
+    """Ordena por fecha_reserva y agrega su ordinal de día (dia_reserva)."""
+    df = df.assign(dia_reserva=dias_ordinales(df["fecha_reserva"]))
+    return df.sort_values("dia_reserva", kind="stable").reset_index(drop=True)
+
+
+@tiempos.medido("tipos")
+def hechos_por_tabla(tablas):
+    """Las cuatro tablas de hechos a partir de las tablas leídas por separado.
+
+    Reproduce el join de ``FROM_HOTEL``: una reserva entra si tiene cliente y
+    al menos un detalle con habitación y tipo; servicios y pagos son LEFT JOIN.
+    """
+    reservas = unir_por_clave(tablas["reservas"], tablas["clientes"], "id_cliente", interna=True)
+    habitaciones = unir_por_clave(tablas["habitaciones"], tablas["tipos_habitacion"],
+                                  "id_tipo_habitacion", interna=True)
+
+    # Orden del join: reserva y, dentro de ella, detalle
+    detalles = tablas["detalles"].sort_values(["id_reserva", "id_detalle_reserva"], kind="stable")
+    detalles = unir_por_clave(detalles, habitaciones, "id_habitacion", interna=True)
+    detalles = unir_por_clave(detalles, reservas, "id_reserva", interna=True)
+    detalles = derivar_hotel(detalles)
+
+    # Las noches de la reserva son las de su primer detalle (como en construir_hechos)
+    base = detalles.drop_duplicates("id_reserva")
+    columnas_reserva = base[COLS_RESERVA]
+
+    servicios = unir_por_clave(tablas["servicios"], tablas["catalogo_servicios"],
+                               "id_servicios_especiales")
+    servicios = (
+        detalles[COLS_RESERVA + ["id_detalle_reserva"]]
+        .merge(servicios, on="id_detalle_reserva", how="left", sort=False)
+        .fillna({"nombre_servicio_especial": RELLENO_HOTEL["nombre_servicio_especial"]})
+        .drop_duplicates(["id_detalle_reserva", "id_detalle_servicio"])
+    )
+
+    pagos = unir_por_clave(tablas["pagos"], tablas["detalles_pago"], "id_detalle_pago")
+    pagos = unir_por_clave(pagos, tablas["metodos_pago"], "id_metodo_pago")
+    pagos = unir_por_clave(pagos, tablas["estados_pago"], "id_estado_pago")
+    pagos = (
+        columnas_reserva
+        .merge(pagos.drop(columns="id_estado_pago"), on="id_reserva", how="left", sort=False)
+        .fillna({k: RELLENO_HOTEL[k] for k in ("metodo_pago_nombre", "nombre_estado_pago")})
+        .drop_duplicates(["id_reserva", "id_pago"])
+    )
+
+    return {
+        "reservas": base[COLS_RESERVA + ["noches"]],
+        "detalles": detalles[COLS_RESERVA + COLS_DETALLE],
+        "servicios": servicios[COLS_RESERVA + COLS_SERVICIO],
+        "pagos": pagos[COLS_RESERVA + COLS_PAGO],
+    }
+
+
+def consultar_hotel_paralelo(engine_local):
+    """Carga cada tabla del hotel en paralelo y arma los hechos con joins en pandas."""
+    tablas = leer_en_paralelo(engine_local, TABLAS_HOTEL)
+    return {
+        nombre: ordenar_por_fecha(compactar(hechos, f"hotel_{nombre}").reset_index(drop=True))
+        for nombre, hechos in hechos_por_tabla(tablas).items()
+    }
+
+
+def version(db_uri):
+    """Versión actual de los datos del hotel (sondeo de ``VERSION_HOTEL``)."""
+    return versiones.actual(get_engine(db_uri), VERSION_HOTEL, ORIGEN_HOTEL)
+
+
+def cargar(db_uri, version_datos=None, modo="paralela"):
+    """Hechos del hotel desde el snapshot en disco de esta versión, o de la base.
+
+    ``modo`` elige la carga desde la base: "paralela" o "join".
+    """
+    engine_local = get_engine(db_uri)
+    if version_datos is None:
+        version_datos = version(db_uri)
+    if modo == "join":
+        consulta, consultar = SELECT_HOTEL + FROM_HOTEL, consultar_hotel
+    else:
+        consulta = "".join(sql for sql, _ in TABLAS_HOTEL.values())
+        consultar = consultar_hotel_paralelo
+    return snapshots.cargar(
+        "hotel",
+        snapshots.clave(db_uri, consulta, version=version_datos),
+        lambda: consultar(engine_local),
+    )
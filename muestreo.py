@@ -0,0 +1,134 @@
+"""Gráficos de Plotly calculados del lado del servidor.
+
+Con millones de filas, ``px.histogram``, ``px.box`` y ``px.scatter`` mandan
+todas las filas al navegador en el JSON de la figura. Aquí se calcula el
+resumen en el servidor y solo viaja lo que se dibuja:
+
+- histogramas: conteos por bin (``np.histogram``)
+- cajas: cuartiles y bigotes por grupo (``go.Box`` con estadísticos precalculados)
+- series de tiempo: Largest-Triangle-Three-Buckets hasta ``PUNTOS_MAX`` puntos
+- dispersión: con más de ``PUNTOS_MAX`` puntos pasa a un mapa de densidad (bins 2D)
+
+Variables de entorno:
+    GRAFICOS_PUNTOS_MAX (2000): presupuesto de puntos por serie / dispersión
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+PUNTOS_MAX = int(os.environ.get('GRAFICOS_PUNTOS_MAX', '2000'))
+BINS_DENSIDAD = 60
+
+
+def _centros(bordes):
+    return (bordes[:-1] + bordes[1:]) / 2
+
+
+def histograma(df, x, nbins=20, title=None):
+    """Histograma de ``x`` con los conteos por bin calculados en el servidor."""
+    valores = df[x].to_numpy(dtype=np.float64, na_value=np.nan)
+    conteos, bordes = np.histogram(valores[~np.isnan(valores)], bins=nbins)
+    tabla = pd.DataFrame({x: _centros(bordes), 'frecuencia': conteos})
+    fig = px.bar(tabla, x=x, y='frecuencia', title=title)
+    fig.update_traces(width=bordes[1] - bordes[0])
+    fig.update_layout(bargap=0)
+    return fig
+
+
+def cajas(df, x, y, title=None):
+    """Diagrama de cajas de ``y`` por ``x`` a partir de cuartiles por grupo.
+
+    Los bigotes son el valor más extremo dentro de 1.5 × IQR, como en
+    ``px.box``; los valores atípicos no se dibujan.
+    """
+    datos = df[[x, y]].dropna(subset=[y])
+    grupos = datos.groupby(x, observed=True)[y]
+    q1 = grupos.transform('quantile', 0.25)
+    q3 = grupos.transform('quantile', 0.75)
+    iqr = q3 - q1
+    dentro = datos[datos[y].between(q1 - 1.5 * iqr, q3 + 1.5 * iqr)]
+
+    stats = pd.concat({
+        'q1': grupos.quantile(0.25),
+        'median': grupos.median(),
+        'q3': grupos.quantile(0.75),
+        'mean': grupos.mean(),
+        'lowerfence': dentro.groupby(x, observed=True)[y].min(),
+        'upperfence': dentro.groupby(x, observed=True)[y].max(),
+    }, axis=1)
+
+    fig = go.Figure(go.Box(
+        x=stats.index.astype(str),
+        q1=stats['q1'], median=stats['median'], q3=stats['q3'], mean=stats['mean'],
+        lowerfence=stats['lowerfence'], upperfence=stats['upperfence'],
+        name=y, boxpoints=False,
+    ))
+    fig.update_layout(title=title)
+    return fig
+
+
+def lttb(x, y, n_puntos):
+    """Índices de los ``n_puntos`` que conserva Largest-Triangle-Three-Buckets.
+
+    ``x`` debe estar ordenado. Siempre se conservan el primer y el último
+    punto; de cada bucket intermedio se queda el que forma el triángulo de
+    mayor área con el punto elegido antes y el promedio del bucket siguiente.
+    """
+    largo = len(x)
+    if n_puntos >= largo or n_puntos < 3:
+        return np.arange(largo)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    bordes = np.linspace(1, largo - 1, n_puntos - 1).astype(np.int64)
+    indices = np.empty(n_puntos, dtype=np.int64)
+    indices[0], indices[-1] = 0, largo - 1
+
+    a = 0
+    for i in range(n_puntos - 2):
+        ini, fin = bordes[i], bordes[i + 1]
+        if i + 2 < len(bordes):
+            sig_ini, sig_fin = bordes[i + 1], bordes[i + 2]
+        else:
+            sig_ini, sig_fin = largo - 1, largo
+        cx = x[sig_ini:sig_fin].mean()
+        cy = y[sig_ini:sig_fin].mean()
+
+        areas = np.abs((x[a] - cx) * (y[ini:fin] - y[a]) - (x[a] - x[ini:fin]) * (cy - y[a]))
+        a = ini + int(np.argmax(areas))
+        indices[i + 1] = a
+    return indices
+
+
+def serie_reducida(df, x, y, puntos_max=None):
+    """``df`` (ordenado por ``x``) reducido con LTTB si supera el presupuesto de puntos."""
+    puntos_max = puntos_max or PUNTOS_MAX
+    if len(df) <= puntos_max:
+        return df
+    ejes_x = df[x]
+    if pd.api.types.is_datetime64_any_dtype(ejes_x):
+        ejes_x = ejes_x.astype('int64')
+    return df.iloc[lttb(ejes_x.to_numpy(), df[y].to_numpy(dtype=np.float64), puntos_max)]
+
+
+def dispersion(df, x, y, puntos_max=None, title=None, **kwargs):
+    """``px.scatter`` si hay pocos puntos; si no, mapa de densidad con bins 2D.
+
+    En el modo densidad solo viajan los conteos de la grilla, así que los
+    argumentos por punto (``color``, ``hover_data``...) se ignoran.
+    """
+    puntos_max = puntos_max or PUNTOS_MAX
+    if len(df) <= puntos_max:
+        return px.scatter(df, x=x, y=y, title=title, **kwargs)
+
+    datos = df[[x, y]].astype(np.float64).dropna()
+    conteos, bordes_x, bordes_y = np.histogram2d(datos[x], datos[y], bins=BINS_DENSIDAD)
+    fig = go.Figure(go.Heatmap(
+        x=_centros(bordes_x), y=_centros(bordes_y), z=np.where(conteos.T > 0, conteos.T, np.nan),
+        colorscale='YlOrBr', colorbar=dict(title='Filas'),
+    ))
+    fig.update_layout(title=f"{title} (densidad de {len(datos):,} puntos)" if title else None)
+    return fig
@@ -0,0 +1,54 @@
+"""Paneles perezosos y aislados para los dashboards.
+
+Un panel es una función que arma datos + gráfico. Se declara con un
+decorador que la dibuja en el lugar donde está escrita:
+
+    @panel("📊 Ventas por ciudad")
+    def ventas_ciudad():
+        ...
+
+- Solo se ejecuta si el expander está abierto (o la pestaña seleccionada):
+  el contenedor usa ``on_change="rerun"`` y se consulta su ``.open``.
+- Corre dentro de un ``st.fragment``: si cambia un widget del propio panel
+  (página de una tabla, formato de descarga...) solo se vuelve a ejecutar
+  ese panel, no todo el script.
+
+Los widgets del sidebar quedan fuera de los paneles, así que cambiar un
+filtro sigue recalculando todo lo visible.
+"""
+import streamlit as st
+
+import tiempos
+
+
+@st.fragment
+def _fragmento(construir):
+    # El id del fragment depende de la posición en la página, así que un
+    # único envoltorio sirve para todos los paneles.
+    with tiempos.fragmento(construir.__name__):
+        construir()
+
+
+def panel(titulo, expanded=False, key=None):
+    """Decorador: ejecuta la función en un expander solo mientras está abierto."""
+    def decorador(construir):
+        with st.expander(titulo, expanded=expanded, key=key, on_change="rerun") as contenedor:
+            if contenedor.open:
+                _fragmento(construir)
+        return construir
+    return decorador
+
+
+def pestanas(titulos, key):
+    """``st.tabs`` con seguimiento de la pestaña seleccionada (ver ``en_pestana``)."""
+    return st.tabs(titulos, key=key, on_change="rerun")
+
+
+def en_pestana(pestana):
+    """Decorador: ejecuta la función dentro de ``pestana`` solo si está seleccionada."""
+    def decorador(construir):
+        with pestana:
+            if pestana.open:
+                _fragmento(construir)
+        return construir
+    return decorador
@@ -0,0 +1,43 @@
+"""Precalentamiento de los snapshots antes de arrancar los dashboards.
+
+Streamlit no tiene un gancho de arranque del servidor: el hilo de
+``refresco.py`` de cada dashboard empieza con la primera ejecución del
+script, y esa primera sesión espera la carga. Corriendo este script
+antes de ``streamlit run`` (o en el deploy) esa carga encuentra el
+snapshot en disco de la versión actual y no consulta la base.
+
+Uso:
+    python precalentar.py
+    python precalentar.py --dashboards ventas hotel
+"""
+import argparse
+import os
+import time
+
+import fitness
+import hotel
+import ventas
+from conexion import uri_de
+
+CARGAS = {
+    'fitness': lambda uri: fitness.cargar(uri),
+    'ventas': lambda uri: ventas.cargar(uri),
+    'hotel': lambda uri: hotel.cargar(uri, modo=os.environ.get('HOTEL_CARGA', 'paralela')),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dashboards', nargs='+', choices=list(CARGAS), default=list(CARGAS))
+    args = parser.parse_args()
+
+    for nombre in args.dashboards:
+        t0 = time.perf_counter()
+        datos = CARGAS[nombre](uri_de(nombre))
+        # El hotel son varias tablas de hechos
+        filas = sum(map(len, datos.values())) if isinstance(datos, dict) else len(datos)
+        print(f"{nombre:<8} {filas:>10,} filas  {time.perf_counter() - t0:6.2f} s")
+
+
+if __name__ == '__main__':
+    main()
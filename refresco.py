@@ -0,0 +1,155 @@
+"""Cargas en segundo plano con stale-while-revalidate.
+
+Con ``st.cache_data(ttl=600)`` el primer visitante después de un reinicio,
+y el primero después de que vence cada TTL, esperaba la recarga completa.
+Aquí cada carga pesada es un ``Refresco``: un hilo del proceso la ejecuta
+al registrarse y la repite cada ``REFRESCO_SEGUNDOS``, y las sesiones
+siempre reciben el último valor listo:
+
+- mientras se recarga, se sigue sirviendo el valor anterior
+- con ``version`` (una consulta de sondeo barata, ver versiones.py), si la
+  versión no cambió no se recarga nada; además cada ``actual()`` sondea y,
+  si cambió, adelanta la recarga sin esperarla: una ráfaga de inserciones
+  se ve en la siguiente ejecución después de la recarga, no al vencer el
+  intervalo
+- si una recarga falla se conserva el valor anterior y se reintenta en
+  ``REFRESCO_REINTENTO`` segundos
+- solo la primera carga del proceso se espera; ``precalentar.py`` deja los
+  snapshots en disco listos antes de arrancar el servidor, así que esa
+  espera es la lectura de un snapshot y no la consulta
+
+Los spans de tiempos de cada carga (``consulta``, ``tipos``...) no tienen
+sesión: se juntan con ``tiempos.capturar`` y quedan en ``ultima_carga``;
+``actual()`` mide la espera de la sesión (etapa ``carga``) y anota esa
+última carga para el panel de rendimiento.
+
+El valor es compartido por todas las sesiones (sin copia): no se modifica.
+Durante una recarga conviven el valor anterior y el nuevo en memoria.
+
+Variables de entorno:
+    REFRESCO_SEGUNDOS (480): intervalo entre recargas
+    REFRESCO_REINTENTO (30): espera tras una recarga fallida
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+import tiempos
+
+logger = logging.getLogger(__name__)
+
+INTERVALO = int(os.environ.get('REFRESCO_SEGUNDOS', '480'))
+REINTENTO = int(os.environ.get('REFRESCO_REINTENTO', '30'))
+
+_refrescos = {}
+_lock = threading.Lock()
+
+
+class Refresco:
+    """Valor recargado por un hilo propio; ``actual()`` devuelve el último listo."""
+
+    def __init__(self, nombre, cargar, version=None, intervalo=INTERVALO):
+        self.nombre = nombre
+        self.intervalo = intervalo
+        self._cargar = cargar
+        self._sondear = version
+        # (valor, versión) en una sola referencia: se reemplazan juntos
+        self._actual = (None, None)
+        self._listo = threading.Event()
+        self._despertar = threading.Event()
+        self.ultima_carga = None
+        self.recargas = 0
+        self.error = None
+        self._hilo = threading.Thread(target=self._bucle, name=f'refresco-{nombre}', daemon=True)
+        self._hilo.start()
+
+    def _bucle(self):
+        while True:
+            # Se limpia antes de recargar: un pedir() que llega durante la
+            # recarga deja el evento puesto y la siguiente espera no bloquea
+            self._despertar.clear()
+            ok = self.refrescar()
+            self._despertar.wait(self.intervalo if ok else REINTENTO)
+
+    def refrescar(self):
+        """Recarga si cambió la versión (o si no hay sondeo). Devuelve False si falló."""
+        try:
+            version = self._sondear() if self._sondear else None
+            valor_actual, version_actual = self._actual
+            if valor_actual is not None and version is not None and version == version_actual:
+                return True
+            t0 = time.perf_counter()
+            with tiempos.capturar() as spans:
+                valor = self._cargar(version) if self._sondear else self._cargar()
+            segundos = time.perf_counter() - t0
+            # Un único reemplazo de referencia: las sesiones ven el valor
+            # anterior o el nuevo, nunca uno a medio cargar
+            self._actual = (valor, version)
+            self.recargas += 1
+            self.ultima_carga = {
+                'fin': datetime.now().isoformat(timespec='seconds'),
+                'segundos': segundos,
+                'recargas': self.recargas,
+                'spans': spans,
+            }
+            self.error = None
+            logger.info("refresco(%s): recargado en %.2f s", self.nombre, segundos)
+            return True
+        except Exception as e:
+            self.error = e
+            logger.exception("refresco(%s): falló la recarga", self.nombre)
+            return False
+        finally:
+            self._listo.set()
+
+    def pedir(self):
+        """Adelanta la próxima recarga (sin esperarla)."""
+        self._despertar.set()
+
+    def revisar(self):
+        """Sondea la versión y, si cambió, adelanta la recarga (sin esperarla)."""
+        if self._sondear is None:
+            return
+        try:
+            version = self._sondear()
+        except Exception as e:
+            logger.warning("refresco(%s): falló el sondeo de versión: %s", self.nombre, e)
+            return
+        if version != self._actual[1]:
+            self.pedir()
+
+    def actual(self, espera=None):
+        """``(valor, versión)`` del último valor listo. Solo espera si el proceso
+        todavía no cargó ninguno.
+
+        Si la primera carga falló se relanza su excepción (y se pide otra).
+        """
+        with tiempos.etapa('carga', self.nombre):
+            listo = self._listo.wait(espera)
+        if not listo:
+            raise TimeoutError(f"La primera carga de '{self.nombre}' no terminó")
+        tiempos.anotar_carga(self.nombre, self.ultima_carga)
+        actual = self._actual
+        if actual[0] is None and self.error is not None:
+            self.pedir()
+            raise self.error
+        self.revisar()
+        return actual
+
+
+def registrar(nombre, cargar, version=None, intervalo=INTERVALO):
+    """El ``Refresco`` del proceso para ``nombre``; lo crea (y arranca su hilo) la primera vez.
+
+    ``cargar`` recibe la versión si se pasa ``version``. Los scripts de
+    Streamlit se vuelven a ejecutar en cada interacción: solo cuenta el
+    ``cargar`` de la primera llamada, así que no debe depender de la sesión.
+    """
+    refresco = _refrescos.get(nombre)
+    if refresco is not None:
+        return refresco
+    with _lock:
+        if nombre not in _refrescos:
+            _refrescos[nombre] = Refresco(nombre, cargar, version, intervalo)
+        return _refrescos[nombre]
@@ -0,0 +1,212 @@
+"""Snapshots en disco de los DataFrames que cargan los dashboards.
+
+``st.cache_data`` vive en la memoria de cada proceso: cada réplica y cada
+reinicio vuelven a pagar la consulta completa. Aquí el resultado de un
+loader se guarda como archivo Arrow IPC (sin compresión) en un directorio
+local, con una clave que combina el hash de la consulta y la versión de los
+datos. Otro proceso con la misma clave abre el archivo con ``memory_map``
+en lugar de consultar la base, y las páginas quedan compartidas entre
+réplicas por el page cache del sistema operativo.
+
+- Un snapshot es un manifiesto JSON + un archivo ``.arrow`` por frame (un
+  loader puede devolver un DataFrame o un dict de DataFrames).
+- Todo se escribe en un temporal y se publica con ``os.replace``; el
+  manifiesto va último, así que un lector nunca ve un snapshot a medias.
+- Al publicar una versión nueva se borran las anteriores del mismo loader.
+- Una sola creación por clave a la vez en todo el host (``vuelo.py``).
+
+Variables de entorno:
+    SNAPSHOT_DIR (datos/snapshots), SNAPSHOTS=0 para desactivarlos
+
+Sin pyarrow instalado los snapshots quedan desactivados y los loaders
+consultan la base como siempre.
+"""
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+import tiempos
+import vuelo
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - pyarrow es opcional
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+DIR_SNAPSHOTS = os.environ.get('SNAPSHOT_DIR', os.path.join('datos', 'snapshots'))
+ACTIVOS = pa is not None and os.environ.get('SNAPSHOTS', '1') != '0'
+
+# Se incrementa cuando cambia lo que hacen los loaders con el resultado
+# (tipos, columnas derivadas): invalida los snapshots ya escritos.
+FORMATO = 2
+
+# Clave de un snapshot que guarda un solo DataFrame (no un dict)
+_UNICO = ''
+
+
+def _hash(*partes):
+    texto = json.dumps(partes, sort_keys=True, default=str)
+    return hashlib.sha256(texto.encode()).hexdigest()[:16]
+
+
+def _hash_consulta(uri, query, params):
+    return _hash(FORMATO, uri, query, params)
+
+
+def clave(uri, query, params=None, version=None):
+    """Clave de snapshot: hash de base + consulta + parámetros, y hash de la versión."""
+    return f"{_hash_consulta(uri, query, params)}-{_hash(version)}"
+
+
+def _ruta(nombre, clave_snapshot, parte=None):
+    base = os.path.join(DIR_SNAPSHOTS, f"{nombre}-{clave_snapshot}")
+    if parte is None:
+        return base + '.json'
+    return f"{base}.{parte or 'df'}.arrow"
+
+
+def _publicar(ruta, escribir):
+    # Se escribe junto al destino para que os.replace sea atómico
+    fd, tmp = tempfile.mkstemp(dir=DIR_SNAPSHOTS, suffix='.tmp')
+    os.close(fd)
+    try:
+        escribir(tmp)
+        os.chmod(tmp, 0o644)  # mkstemp crea 0600; otras réplicas deben poder leerlo
+        os.replace(tmp, ruta)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _escribir_arrow(df, ruta):
+    tabla = pa.Table.from_pandas(df)
+    with pa.OSFile(ruta, 'wb') as sink, pa.ipc.new_file(sink, tabla.schema) as escritor:
+        if tabla.num_rows:
+            escritor.write_table(tabla)
+        else:
+            # Una tabla vacía no escribe lotes ni, con ellos, los diccionarios:
+            # un lote vacío conserva las categorías de las columnas category
+            escritor.write_batch(pa.RecordBatch.from_pandas(df))
+
+
+def _leer_arrow(ruta):
+    with pa.memory_map(ruta, 'r') as fuente:
+        tabla = pa.ipc.open_file(fuente).read_all()
+    # split_blocks evita consolidar columnas: las numéricas sin nulos
+    # quedan apuntando al archivo mapeado en lugar de copiarse
+    return tabla.to_pandas(split_blocks=True)
+
+
+@tiempos.medido('snapshot')
+def leer(nombre, clave_snapshot):
+    """DataFrame (o dict de DataFrames) del snapshot, o None si no existe."""
+    if not ACTIVOS:
+        return None
+    try:
+        with open(_ruta(nombre, clave_snapshot)) as f:
+            partes = json.load(f)['partes']
+        frames = {parte: _leer_arrow(_ruta(nombre, clave_snapshot, parte)) for parte in partes}
+    except (OSError, ValueError, KeyError, pa.ArrowException):
+        # No existe, o otro proceso lo reemplazó mientras se abría
+        return None
+    return frames[_UNICO] if list(frames) == [_UNICO] else frames
+
+
+def guardar(nombre, clave_snapshot, datos):
+    """Publica ``datos`` (DataFrame o dict de DataFrames) como snapshot."""
+    if not ACTIVOS:
+        return
+    os.makedirs(DIR_SNAPSHOTS, exist_ok=True)
+    frames = datos if isinstance(datos, dict) else {_UNICO: datos}
+    try:
+        for parte, df in frames.items():
+            _publicar(_ruta(nombre, clave_snapshot, parte),
+                      lambda tmp, df=df: _escribir_arrow(df, tmp))
+        manifiesto = json.dumps({'partes': list(frames)})
+        _publicar(_ruta(nombre, clave_snapshot), lambda tmp: _escribir_texto(tmp, manifiesto))
+    except (OSError, pa.ArrowException) as e:
+        # El snapshot es una optimización: si falla se sigue sin él
+        logger.warning("No se pudo guardar el snapshot %s: %s", nombre, e)
+        return
+    _limpiar(nombre, clave_snapshot)
+
+
+def _escribir_texto(ruta, contenido):
+    with open(ruta, 'w') as f:
+        f.write(contenido)
+
+
+def _limpiar(nombre, vigente):
+    """Borra los snapshots anteriores de ``nombre`` (los lectores abiertos no se ven afectados)."""
+    for ruta in glob.glob(os.path.join(DIR_SNAPSHOTS, f"{nombre}-*")):
+        if not os.path.basename(ruta).startswith(f"{nombre}-{vigente}."):
+            try:
+                os.unlink(ruta)
+            except OSError:
+                pass
+
+
+def ultimo(nombre, uri, query, params=None):
+    """Snapshot más reciente de esta consulta, sea cual sea su versión.
+
+    Devuelve ``(clave, datos)`` o ``(None, None)``. Sirve a las cargas
+    incrementales, que completan el snapshot con las filas nuevas.
+    """
+    if not ACTIVOS:
+        return None, None
+    patron = os.path.join(DIR_SNAPSHOTS, f"{nombre}-{_hash_consulta(uri, query, params)}-*.json")
+    manifiestos = sorted(glob.glob(patron), key=_mtime, reverse=True)
+    for ruta in manifiestos:
+        clave_snapshot = os.path.basename(ruta)[len(nombre) + 1:-len('.json')]
+        datos = leer(nombre, clave_snapshot)
+        if datos is not None:
+            return clave_snapshot, datos
+    return None, None
+
+
+def _mtime(ruta):
+    try:
+        return os.path.getmtime(ruta)
+    except OSError:
+        return 0.0
+
+
+def _ruta_bloqueo(nombre, clave_snapshot):
+    # Un bloqueo por consulta (sin la versión) en un subdirectorio, fuera
+    # del alcance de _limpiar: borrar un archivo bloqueado rompe el flock
+    consulta = clave_snapshot.split('-')[0]
+    return os.path.join(DIR_SNAPSHOTS, 'bloqueos', f"{nombre}-{consulta}.lock")
+
+
+def cargar(nombre, clave_snapshot, crear):
+    """Lee el snapshot ``clave_snapshot`` o lo crea con ``crear()`` y lo publica.
+
+    Una sola creación por clave a la vez en el proceso y, con snapshots
+    activos, en el host (ver vuelo.py): los demás esperan y leen el
+    snapshot que publicó el primero.
+    """
+    datos = leer(nombre, clave_snapshot)
+    if datos is not None:
+        logger.info("snapshot %s-%s: leído de disco", nombre, clave_snapshot)
+        return datos
+    return vuelo.compartido(('snapshot', nombre, clave_snapshot),
+                            lambda: _crear(nombre, clave_snapshot, crear))
+
+
+def _crear(nombre, clave_snapshot, crear):
+    if not ACTIVOS:
+        return crear()
+    with vuelo.bloqueo_archivo(_ruta_bloqueo(nombre, clave_snapshot)):
+        # Otro proceso pudo publicarlo mientras se esperaba el bloqueo
+        datos = leer(nombre, clave_snapshot)
+        if datos is not None:
+            logger.info("snapshot %s-%s: publicado por otro proceso", nombre, clave_snapshot)
+            return datos
+        datos = crear()
+        guardar(nombre, clave_snapshot, datos)
+        return datos
@@ -0,0 +1,82 @@
+"""Tabla paginada para los dashboards.
+
+``st.dataframe(df)`` serializa el frame completo aunque esté dentro de un
+expander cerrado. ``tabla_paginada`` solo manda la página actual:
+
+- el orden se resuelve en el servidor con un ``argsort`` que se guarda en
+  un cache LRU por (tabla, estado de filtros, columna, sentido), así que
+  cambiar de página no vuelve a ordenar
+- la página es un ``iloc`` sobre esas posiciones
+- se muestra el total de filas, y el tamaño enviado no depende de él
+"""
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import streamlit as st
+
+import tiempos
+
+FILAS_POR_PAGINA = [25, 50, 100, 200]
+SIN_ORDEN = "(sin orden)"
+MAX_ORDENES = 64
+
+_ordenes = OrderedDict()
+_lock = threading.Lock()
+
+
+def orden(df, columna, ascendente, firma):
+    """Posiciones de ``df`` ordenado por ``columna`` (nulos al final), cacheadas por ``firma``."""
+    clave = (firma, len(df), columna, ascendente)
+    with _lock:
+        if clave in _ordenes:
+            _ordenes.move_to_end(clave)
+            return _ordenes[clave]
+
+    serie = df[columna].reset_index(drop=True)
+    pos = serie.sort_values(ascending=ascendente, na_position='last', kind='stable').index.to_numpy()
+
+    with _lock:
+        _ordenes[clave] = pos
+        if len(_ordenes) > MAX_ORDENES:
+            _ordenes.popitem(last=False)
+    return pos
+
+
+def _acotar(key, minimo, maximo):
+    # number_input falla si el valor guardado queda fuera del nuevo rango
+    if key in st.session_state:
+        st.session_state[key] = min(max(st.session_state[key], minimo), maximo)
+
+
+def tabla_paginada(df, clave, firma=(), columnas=None):
+    """Tabla con orden, tamaño de página y número de página, enviando solo una página.
+
+    ``clave`` distingue las tablas de una misma página (prefijo de los
+    widgets); ``firma`` es el estado de filtros que produjo ``df`` (hashable),
+    y ``columnas`` las columnas a mostrar (todas por defecto).
+    """
+    columnas = list(columnas) if columnas else list(df.columns)
+    total = len(df)
+
+    c_orden, c_sentido, c_tam, c_pag = st.columns([3, 2, 2, 2])
+    por = c_orden.selectbox("Ordenar por", [SIN_ORDEN] + columnas, key=f"{clave}_orden")
+    sentido = c_sentido.radio("Sentido", ["Asc", "Desc"], horizontal=True,
+                              key=f"{clave}_sentido", disabled=por == SIN_ORDEN)
+    tam = c_tam.selectbox("Filas por página", FILAS_POR_PAGINA, index=1, key=f"{clave}_tam")
+    paginas = max(1, math.ceil(total / tam))
+    _acotar(f"{clave}_pagina", 1, paginas)
+    pagina = c_pag.number_input("Página", min_value=1, max_value=paginas, step=1,
+                                key=f"{clave}_pagina")
+
+    inicio = (int(pagina) - 1) * tam
+    fin = min(inicio + tam, total)
+    if por == SIN_ORDEN:
+        pos = np.arange(inicio, fin)
+    else:
+        pos = orden(df, por, sentido == "Asc", (clave, firma))[inicio:fin]
+
+    with tiempos.etapa('envio', clave):
+        st.dataframe(df.iloc[pos][columnas], use_container_width=True)
+    st.caption(f"Filas {inicio + 1 if total else 0:,}–{fin:,} de {total:,} · página {int(pagina)} de {paginas}")
@@ -0,0 +1,77 @@
+"""CacheAgregados: LRU por bytes e invalidación por versión."""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from agregados import CacheAgregados, tamano
+
+
+def arreglo(kb):
+    return np.zeros(kb * 1024, dtype=np.uint8)
+
+
+def test_expulsa_por_bytes_en_orden_lru():
+    cache = CacheAgregados(max_bytes=tamano(arreglo(10)) * 3)
+    for nombre in 'abc':
+        cache.obtener('ventas', 1, {}, nombre, lambda: arreglo(10))
+    cache.obtener('ventas', 1, {}, 'a', lambda: arreglo(10))  # 'a' pasa a ser la más reciente
+    cache.obtener('ventas', 1, {}, 'd', lambda: arreglo(10))
+
+    e = cache.estadisticas()
+    assert e['expulsiones'] == 1 and e['entradas'] == 3
+    assert e['bytes'] <= cache.max_bytes
+    calculos = []
+    cache.obtener('ventas', 1, {}, 'b', lambda: calculos.append('b') or arreglo(10))
+    cache.obtener('ventas', 1, {}, 'a', lambda: calculos.append('a') or arreglo(10))
+    assert calculos == ['b']
+
+
+def test_una_entrada_grande_expulsa_varias_chicas():
+    cache = CacheAgregados(max_bytes=tamano(arreglo(10)) * 4)
+    for nombre in 'abcd':
+        cache.obtener('ventas', 1, {}, nombre, lambda: arreglo(10))
+    cache.obtener('ventas', 1, {}, 'grande', lambda: arreglo(25))
+    e = cache.estadisticas()
+    assert e['expulsiones'] == 3 and e['entradas'] == 2
+    assert e['bytes'] <= cache.max_bytes
+
+
+def test_no_guarda_lo_que_no_entra():
+    cache = CacheAgregados(max_bytes=1024)
+    valor = cache.obtener('ventas', 1, {}, 'x', lambda: arreglo(10))
+    assert len(valor) == 10 * 1024
+    assert cache.estadisticas()['entradas'] == 0
+
+
+def test_version_nueva_descarta_las_anteriores():
+    cache = CacheAgregados()
+    cache.obtener('ventas', 1, {'producto': ['b', 'a']}, 'x', lambda: 1)
+    assert cache.obtener('ventas', 1, {'producto': ['a', 'b']}, 'x', lambda: 2) == 1
+    assert cache.obtener('ventas', 2, {'producto': ['a', 'b']}, 'x', lambda: 3) == 3
+    assert cache.estadisticas()['entradas'] == 1
+
+
+def test_resultados_vacios_y_none_se_cachean():
+    cache = CacheAgregados(max_bytes=2**20)
+    calculos = []
+    for _ in range(2):
+        cache.obtener('ventas', 1, {}, 'vacio', lambda: calculos.append(1) or pd.DataFrame())
+        cache.obtener('ventas', 1, {}, 'nada', lambda: calculos.append(1))
+    assert len(calculos) == 2
+    assert cache.estadisticas()['aciertos'] == 2
+
+
+def test_filtros_equivalentes_comparten_entrada():
+    cache = CacheAgregados()
+    cache.obtener('ventas', 1, {'desde': date(2024, 1, 1), 'ciudades': {'Lima', 'Cali'}}, 'x', lambda: 1)
+    filtros = {'ciudades': ['Cali', 'Lima'], 'desde': date(2024, 1, 1)}
+    assert cache.obtener('ventas', 1, filtros, 'x', lambda: 2) == 1
+    assert cache.obtener('ventas', 1, {**filtros, 'ciudades': []}, 'x', lambda: 3) == 3
+
+
+def test_tamano():
+    df = pd.DataFrame({'a': np.zeros(1000)})
+    assert tamano(df) >= 8000
+    assert tamano(df.iloc[:0]) < tamano(df)
+    assert tamano({'a': arreglo(1), 'b': [arreglo(1)]}) > 2 * 1024
@@ -0,0 +1,95 @@
+"""IndiceBusqueda contra la búsqueda directa con pandas."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from busqueda import IndiceBusqueda
+
+POSTS = pd.DataFrame({
+    'titulo': [
+        'Análisis de datos con Python',
+        'La red neuronal más simple',
+        None,
+        'Datos abiertos en la ciudad',
+        'Estadística de la a a la z',
+        'PYTHON para principiantes',
+    ],
+    'etiquetas': ['python, datos', 'ml', 'Python', None, '', 'sql,  Python '],
+    'autor': ['ana', 'luis', 'ana', 'luis', 'ana', 'luis'],
+})
+
+
+def esperado(df, texto, mascara=None):
+    """Título que contiene el texto o etiqueta exacta, con pandas fila por fila."""
+    txt = texto.strip().lower()
+    titulo = df['titulo'].fillna('').str.lower().str.contains(txt, regex=False)
+    etiqueta = df['etiquetas'].map(
+        lambda e: isinstance(e, str) and txt in {t.strip().lower() for t in e.split(',')})
+    filas = (titulo | etiqueta).to_numpy()
+    if mascara is not None:
+        filas = filas & mascara
+    return np.flatnonzero(filas)
+
+
+@pytest.fixture(scope='module')
+def indice():
+    return IndiceBusqueda(POSTS['titulo'], POSTS['etiquetas'])
+
+
+@pytest.mark.parametrize('texto', [
+    'a',            # una letra: sin trigramas
+    'de',           # dos letras
+    'DAT',          # un trigrama, en mayúsculas
+    'datos',        # varios trigramas
+    'a la',         # con espacios
+    'python',       # en títulos y en etiquetas
+    'ml',           # solo etiqueta, corta
+    'sql',          # etiqueta con espacios alrededor
+    'anál',         # con tilde
+    'zzz',          # trigrama inexistente
+    'os con p',     # cruza palabras
+])
+def test_buscar_igual_a_pandas(indice, texto):
+    np.testing.assert_array_equal(indice.buscar(texto), esperado(POSTS, texto))
+
+
+@pytest.mark.parametrize('texto', ['a', 'datos', 'python', 'ml'])
+def test_buscar_con_mascara(indice, texto):
+    mascara = (POSTS['autor'] == 'ana').to_numpy()
+    np.testing.assert_array_equal(indice.buscar(texto, mascara), esperado(POSTS, texto, mascara))
+
+
+def test_trigramas_presentes_sin_la_subcadena():
+    indice = IndiceBusqueda(pd.Series(['abcxbcd']), pd.Series([None]))
+    # 'abc' y 'bcd' están, 'abcd' no
+    assert indice.buscar('abcd').size == 0
+
+
+def test_texto_vacio_devuelve_las_filas_de_la_mascara(indice):
+    np.testing.assert_array_equal(indice.buscar('  '), np.arange(len(POSTS)))
+    mascara = np.array([True, False, False, True, False, False])
+    np.testing.assert_array_equal(indice.buscar('', mascara), [0, 3])
+
+
+@pytest.mark.parametrize('texto', ['a', 'datos', 'python'])
+def test_mascara_vacia(indice, texto):
+    assert indice.buscar(texto, np.zeros(len(POSTS), dtype=bool)).size == 0
+
+
+def test_etiqueta_exacta_no_subcadena(indice):
+    np.testing.assert_array_equal(indice.buscar_etiqueta(' PYTHON'), [0, 2, 5])
+    assert indice.buscar_etiqueta('pyth').size == 0
+    assert indice.buscar_etiqueta('').size == 0
+
+
+@pytest.mark.parametrize('titulos, etiquetas', [
+    ([], []),
+    ([None], [None]),
+    (['ab'], ['']),
+])
+def test_indices_chicos(titulos, etiquetas):
+    df = pd.DataFrame({'titulo': pd.Series(titulos, dtype=object),
+                       'etiquetas': pd.Series(etiquetas, dtype=object)})
+    indice = IndiceBusqueda(df['titulo'], df['etiquetas'])
+    for texto in ('a', 'ab', 'abc'):
+        np.testing.assert_array_equal(indice.buscar(texto), esperado(df, texto))
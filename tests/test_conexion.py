@@ -0,0 +1,43 @@
+"""leer_en_bloques: mismas filas con o sin ``total`` y sin capacidad sobrante."""
+import pytest
+from sqlalchemy import create_engine, text
+
+from conexion import leer_en_bloques
+
+COLUMNAS = {'id': 'int64', 'nombre': object, 'monto': 'float64'}
+FILAS = [(1, 'a', 1.5), (2, 'b', None), (3, None, 3.0), (4, 'd', 4.25), (5, 'e', 5.0)]
+
+
+@pytest.fixture(scope='module')
+def engine():
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER, nombre TEXT, monto REAL)"))
+        conn.execute(text("INSERT INTO t VALUES (:id, :nombre, :monto)"),
+                     [dict(zip(COLUMNAS, fila)) for fila in FILAS])
+    return engine
+
+
+@pytest.mark.parametrize('total', [None, 2, 5, 100])
+@pytest.mark.parametrize('tam_bloque', [1, 2, 50])
+def test_mismas_filas_con_cualquier_total(engine, total, tam_bloque):
+    df = leer_en_bloques(engine, "SELECT * FROM t ORDER BY id", COLUMNAS,
+                         total=total, tam_bloque=tam_bloque)
+    assert df['id'].tolist() == [1, 2, 3, 4, 5]
+    assert df['nombre'].fillna('-').tolist() == ['a', 'b', '-', 'd', 'e']
+    assert df['monto'].isna().tolist() == [False, True, False, False, False]
+    # Ninguna columna es una vista de un buffer más grande que el resultado
+    for col in COLUMNAS:
+        arreglo = df[col].to_numpy()
+        assert arreglo.base is None or len(arreglo.base) == len(df)
+
+
+def test_sin_filas(engine):
+    df = leer_en_bloques(engine, "SELECT * FROM t WHERE id > 100", COLUMNAS)
+    assert df.empty and list(df.columns) == list(COLUMNAS)
+    assert df['id'].dtype == 'int64'
+
+
+def test_columna_faltante(engine):
+    with pytest.raises(KeyError):
+        leer_en_bloques(engine, "SELECT id FROM t", COLUMNAS)
@@ -0,0 +1,94 @@
+"""resumir sobre el cubo contra groupby del detalle."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from cubo import construir_cubo, resumir
+
+COMPRAS = pd.DataFrame({
+    'fecha': pd.to_datetime([
+        '2024-01-05 09:00', '2024-01-05 18:30', '2024-01-20 12:00', '2024-02-01 08:00',
+        '2024-02-01 21:00', '2024-02-14 10:00', '2024-03-03 11:00', '2024-03-03 11:00',
+    ]),
+    'producto': pd.Categorical(['a', 'a', 'b', 'a', 'c', 'b', 'a', 'c']),
+    'sucursal': ['norte', 'norte', 'sur', None, 'sur', 'norte', None, 'sur'],
+    'monto': [10.0, 30.0, 25.5, 40.0, 5.25, 100.0, 12.0, 8.0],
+})
+DIMENSIONES = ['producto', 'sucursal']
+
+
+@pytest.fixture(scope='module')
+def cubo():
+    return construir_cubo(COMPRAS, 'fecha', DIMENSIONES, 'monto')
+
+
+def test_una_fila_por_dia_y_dimensiones(cubo):
+    esperado = COMPRAS.assign(dia=COMPRAS['fecha'].dt.normalize()).groupby(
+        ['dia'] + DIMENSIONES, observed=True, dropna=False).ngroups
+    assert len(cubo) == esperado
+    # Los nulos forman su propio grupo: no se pierden filas
+    assert cubo['n'].sum() == len(COMPRAS)
+
+
+def test_resumen_total(cubo):
+    total = resumir(cubo, 'monto')
+    assert total['n'] == len(COMPRAS)
+    assert total['suma'] == pytest.approx(COMPRAS['monto'].sum())
+    assert total['media'] == pytest.approx(COMPRAS['monto'].mean())
+    assert total['desviacion'] == pytest.approx(COMPRAS['monto'].std())
+
+
+@pytest.mark.parametrize('por', ['producto', 'sucursal', ['producto', 'sucursal']])
+def test_resumen_por_grupo(cubo, por):
+    obtenido = resumir(cubo, 'monto', por).set_index(por).sort_index()
+    esperado = (COMPRAS.groupby(por, observed=True)['monto']
+                .agg(['count', 'sum', 'mean', 'std']).sort_index())
+    np.testing.assert_array_equal(obtenido['n'], esperado['count'])
+    np.testing.assert_allclose(obtenido['monto'], esperado['sum'])
+    np.testing.assert_allclose(obtenido['media'], esperado['mean'])
+    # Grupos de una sola fila: desviación NaN, como en pandas
+    np.testing.assert_allclose(obtenido['desviacion'], esperado['std'])
+
+
+def test_resumen_por_mes_del_cubo_filtrado(cubo):
+    filtrado = cubo[cubo['producto'] == 'a']
+    obtenido = resumir(filtrado.assign(mes=filtrado['fecha'].dt.month), 'monto', 'mes')
+    detalle = COMPRAS[COMPRAS['producto'] == 'a']
+    esperado = detalle.groupby(detalle['fecha'].dt.month)['monto'].agg(['sum', 'std'])
+    np.testing.assert_allclose(obtenido['monto'], esperado['sum'])
+    np.testing.assert_allclose(obtenido['desviacion'], esperado['std'])
+
+
+def test_una_fila():
+    una = construir_cubo(COMPRAS.iloc[[2]], 'fecha', DIMENSIONES, 'monto')
+    total = resumir(una, 'monto')
+    assert (total['n'], total['suma'], total['media']) == (1, 25.5, 25.5)
+    assert np.isnan(total['desviacion'])
+
+
+def test_cubo_vacio():
+    vacio = construir_cubo(COMPRAS.iloc[:0], 'fecha', DIMENSIONES, 'monto')
+    assert vacio.empty
+    total = resumir(vacio, 'monto')
+    assert total['n'] == 0 and total['suma'] == 0.0
+    assert np.isnan(total['media']) and np.isnan(total['desviacion'])
+    assert resumir(vacio, 'monto', 'producto').empty
+
+
+def test_resumir_con_filtro_sin_filas(cubo):
+    assert resumir(cubo[cubo['producto'] == 'z'], 'monto')['n'] == 0
+
+
+def test_medida_con_nulos():
+    con_nulos = COMPRAS.assign(monto=[10.0, np.nan, 25.5, 40.0, np.nan, 100.0, 12.0, 8.0])
+    cubo = construir_cubo(con_nulos, 'fecha', DIMENSIONES, 'monto')
+    total = resumir(cubo, 'monto')
+    assert total['n'] == len(con_nulos)
+    assert total['suma'] == pytest.approx(con_nulos['monto'].sum())
+    assert total['media'] == pytest.approx(con_nulos['monto'].mean())
+    assert total['desviacion'] == pytest.approx(con_nulos['monto'].std())
+    por_producto = resumir(cubo, 'monto', 'producto').set_index('producto').sort_index()
+    esperado = con_nulos.groupby('producto', observed=True)['monto'].agg(['size', 'mean', 'std'])
+    np.testing.assert_array_equal(por_producto['n'], esperado['size'])
+    np.testing.assert_allclose(por_producto['media'], esperado['mean'])
+    np.testing.assert_allclose(por_producto['desviacion'], esperado['std'])
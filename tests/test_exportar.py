@@ -0,0 +1,42 @@
+"""exportar: ida y vuelta por CSV gzip y Parquet, tabla vacía y límite de filas."""
+import gzip
+import io
+
+import pandas as pd
+import pytest
+
+import exportar
+
+DF = pd.DataFrame({
+    'producto': ['Chamarra', 'Yoga', 'Ñandú', 'Chamarra', 'Gorra'],
+    'cantidad': [3, 1, 7, 2, 5],
+    'total': [84.07, 12.5, 0.0, 168.14, 33.3],
+})
+
+
+def _leer(datos, formato):
+    if formato == 'Parquet':
+        return pd.read_parquet(io.BytesIO(datos))
+    return pd.read_csv(io.BytesIO(gzip.decompress(datos)))
+
+
+@pytest.mark.parametrize('formato', list(exportar.FORMATOS))
+@pytest.mark.parametrize('df', [DF, DF.iloc[:0]], ids=['datos', 'vacio'])
+def test_ida_y_vuelta(df, formato):
+    leido = _leer(exportar.exportar(df, formato), formato)
+    assert list(leido.columns) == list(df.columns)
+    pd.testing.assert_frame_equal(leido, df.reset_index(drop=True), check_dtype=False)
+
+
+def test_csv_por_bloques_un_solo_encabezado():
+    destino = io.BytesIO()
+    exportar.escribir_csv_gz(DF, destino, filas_bloque=2)
+    pd.testing.assert_frame_equal(pd.read_csv(io.BytesIO(gzip.decompress(destino.getvalue()))), DF)
+
+
+def test_limite_de_filas(monkeypatch):
+    monkeypatch.setattr(exportar, 'MAX_FILAS', len(DF) - 1)
+    assert not exportar.exportable(DF)
+    assert exportar.exportable(DF.iloc[1:])
+    with pytest.raises(ValueError):
+        exportar.exportar(DF, 'Parquet')
@@ -0,0 +1,73 @@
+"""MotorFiltros.filtrar contra máscaras booleanas de pandas."""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from filtros import MotorFiltros
+
+VENTAS = pd.DataFrame({
+    'fecha': pd.to_datetime([
+        '2024-03-02 10:00', '2024-01-15 08:30', None, '2024-03-02 23:59',
+        '2024-02-10 12:00', '2024-01-01 00:00', '2024-03-31 18:00', '2024-02-10 07:15',
+    ]),
+    'producto': pd.Categorical(['a', 'b', 'a', None, 'c', 'a', 'b', None]),
+    'ciudad': ['Cali', 'Lima', 'Cali', 'Quito', None, 'Lima', 'Cali', 'Quito'],
+    'monto': [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0],
+}, index=[17, 3, 8, 1, 12, 5, 30, 2])
+
+
+def con_mascaras(df, fi, ff, selecciones):
+    dias = df['fecha'].dt.normalize()
+    mascara = (dias >= pd.Timestamp(fi)) & (dias <= pd.Timestamp(ff))
+    for columna, valores in selecciones.items():
+        if valores:
+            mascara &= df[columna].isin(valores)
+    return df[mascara]
+
+
+def assert_mismas_filas(obtenido, esperado):
+    # El motor devuelve las filas por fecha; la máscara, en el orden del frame
+    pd.testing.assert_frame_equal(obtenido.sort_index(), esperado.sort_index())
+
+
+CASOS = [
+    (date(2024, 1, 1), date(2024, 12, 31), {}),
+    (date(2024, 3, 2), date(2024, 3, 2), {}),                       # un día, bordes del día
+    (date(2024, 2, 1), date(2024, 3, 31), {'producto': ['a', 'b']}),
+    (date(2024, 1, 1), date(2024, 12, 31), {'producto': ['a'], 'ciudad': ['Cali', 'Lima']}),
+    (date(2024, 1, 1), date(2024, 12, 31), {'producto': [None]}),    # nulos
+    (date(2024, 1, 1), date(2024, 12, 31), {'ciudad': [None, 'Quito']}),
+    (date(2024, 1, 1), date(2024, 12, 31), {'producto': [], 'ciudad': []}),  # selección vacía
+    (date(2024, 1, 1), date(2024, 12, 31), {'producto': ['x']}),     # valor inexistente
+    (date(2024, 4, 1), date(2024, 3, 1), {}),                        # rango invertido
+    (date(2023, 1, 1), date(2023, 12, 31), {'ciudad': ['Cali']}),    # fuera de rango
+]
+
+
+@pytest.mark.parametrize('ordenado', [False, True])
+@pytest.mark.parametrize('fi, ff, selecciones', CASOS)
+def test_filtrar_igual_a_mascaras(ordenado, fi, ff, selecciones):
+    df = VENTAS.sort_values('fecha') if ordenado else VENTAS
+    motor = MotorFiltros(df, 'fecha', ['producto', 'ciudad'])
+    assert_mismas_filas(motor.filtrar(fi, ff, selecciones), con_mascaras(df, fi, ff, selecciones))
+
+
+def test_frame_vacio():
+    vacio = VENTAS.iloc[:0]
+    motor = MotorFiltros(vacio, 'fecha', ['producto', 'ciudad'])
+    assert motor.filtrar(date(2024, 1, 1), date(2024, 12, 31), {'producto': ['a']}).empty
+    pd.testing.assert_frame_equal(motor.filtrar(date(2024, 1, 1), date(2024, 12, 31), {}), vacio)
+
+
+@pytest.mark.parametrize('selecciones', [{}, {'producto': ['b']}, {'producto': ['a']}])
+def test_una_fila(selecciones):
+    una = VENTAS.iloc[[1]]
+    motor = MotorFiltros(una, 'fecha', ['producto'])
+    fi, ff = date(2024, 1, 15), date(2024, 1, 15)
+    assert_mismas_filas(motor.filtrar(fi, ff, selecciones), con_mascaras(una, fi, ff, selecciones))
+
+
+def test_no_copia_el_frame():
+    assert MotorFiltros(VENTAS, 'fecha', ['producto']).df is VENTAS
@@ -0,0 +1,50 @@
+"""Carga del hotel sobre una base SQLite chica generada con generar_datos.py."""
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+from conexion import get_engine
+from generar_datos import generar
+import hotel
+
+
+@pytest.fixture(scope='module')
+def engine(tmp_path_factory):
+    uri = f"sqlite:///{tmp_path_factory.mktemp('hotel') / 'hotel.db'}"
+    generar('hotel', 300, uri, semilla=1)
+    engine = get_engine(uri)
+    # Una segunda línea idéntica (mismo detalle, servicio y hora) de un servicio ya cargado
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO detalle_reserva_servicios_especiales "
+            "(id_detalle_reserva, id_servicios_especiales, precio_unitario, subtotal, hora) "
+            "SELECT id_detalle_reserva, id_servicios_especiales, precio_unitario, subtotal, hora "
+            "FROM detalle_reserva_servicios_especiales WHERE id_detalle_servicio = 1"
+        ))
+    return engine
+
+
+def lineas_en_la_base(engine):
+    with engine.connect() as conn:
+        return pd.read_sql_query(text(
+            "SELECT COUNT(*) AS n, SUM(subtotal) AS subtotal "
+            "FROM detalle_reserva_servicios_especiales"
+        ), conn).iloc[0]
+
+
+@pytest.mark.parametrize('consultar', [hotel.consultar_hotel, hotel.consultar_hotel_paralelo])
+def test_lineas_de_servicio_repetidas_no_se_pierden(engine, consultar):
+    servicios = consultar(engine)['servicios']
+    con_servicio = servicios.dropna(subset=['id_detalle_servicio'])
+    esperado = lineas_en_la_base(engine)
+    assert len(con_servicio) == esperado['n']
+    assert con_servicio['subtotal_servicio'].sum() == pytest.approx(esperado['subtotal'])
+    assert (servicios['id_detalle_servicio'] == 1).sum() == 1
+
+
+def test_join_y_paralela_dan_las_mismas_tablas(engine):
+    join = hotel.consultar_hotel(engine)
+    paralela = hotel.consultar_hotel_paralelo(engine)
+    assert list(join) == list(paralela) == ["reservas", "detalles", "servicios", "pagos"]
+    for nombre in join:
+        pd.testing.assert_frame_equal(join[nombre], paralela[nombre], obj=nombre)
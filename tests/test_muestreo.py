@@ -0,0 +1,44 @@
+"""lttb y serie_reducida: extremos, presupuesto de puntos y entradas chicas."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from muestreo import lttb, serie_reducida
+
+X = np.arange(20, dtype=np.float64)
+Y = np.array([0, 1, 0, 2, 0, 9, 0, 1, 0, 1, -7, 1, 0, 1, 0, 3, 0, 1, 0, 5], dtype=np.float64)
+
+
+@pytest.mark.parametrize('n_puntos', [3, 4, 7, 10, 19])
+def test_conserva_extremos_y_presupuesto(n_puntos):
+    indices = lttb(X, Y, n_puntos)
+    assert len(indices) == n_puntos
+    assert indices[0] == 0 and indices[-1] == len(X) - 1
+    # Índices válidos, ordenados y sin repetir
+    assert (np.diff(indices) > 0).all()
+
+
+def test_conserva_los_picos():
+    indices = lttb(X, Y, 6)
+    assert {5, 10} <= set(indices)
+
+
+@pytest.mark.parametrize('largo, n_puntos', [(0, 5), (1, 5), (2, 5), (5, 5), (20, 2), (20, 0)])
+def test_sin_reducir_devuelve_todos(largo, n_puntos):
+    # Presupuesto suficiente, o menor a 3 (no alcanza para los extremos y un bucket)
+    np.testing.assert_array_equal(lttb(X[:largo], Y[:largo], n_puntos), np.arange(largo))
+
+
+def test_serie_constante():
+    indices = lttb(X, np.ones(len(X)), 5)
+    assert len(indices) == 5 and indices[0] == 0 and indices[-1] == len(X) - 1
+
+
+def test_serie_reducida_con_fechas():
+    df = pd.DataFrame({'dia': pd.date_range('2024-01-01', periods=len(Y)), 'ventas': Y})
+    reducida = serie_reducida(df, 'dia', 'ventas', puntos_max=6)
+    assert len(reducida) == 6
+    assert reducida['dia'].iloc[0] == df['dia'].iloc[0]
+    assert reducida['dia'].iloc[-1] == df['dia'].iloc[-1]
+    assert serie_reducida(df, 'dia', 'ventas', puntos_max=100) is df
+    assert serie_reducida(df.iloc[:0], 'dia', 'ventas', puntos_max=6).empty
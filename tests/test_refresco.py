@@ -0,0 +1,77 @@
+"""Refresco: las sesiones reciben el valor anterior mientras se recarga."""
+import threading
+import time
+
+import pytest
+
+from refresco import Refresco
+
+
+class Fuente:
+    """Loader cuya versión cambia a pedido y que puede quedar bloqueado a mitad de carga."""
+
+    def __init__(self):
+        self.version = 1
+        self.liberar = threading.Event()
+        self.liberar.set()
+        self.cargando = threading.Event()
+        self.cargas = 0
+
+    def sondear(self):
+        return self.version
+
+    def cargar(self, version):
+        self.cargando.set()
+        assert self.liberar.wait(5)
+        self.cargas += 1
+        return f"datos v{version}"
+
+
+def esperar_version(refresco, version, intentos=200):
+    for _ in range(intentos):
+        if refresco.actual()[1] == version:
+            return
+        time.sleep(0.01)
+    pytest.fail(f"no llegó la versión {version}")
+
+
+def test_devuelve_el_valor_anterior_durante_la_recarga():
+    fuente = Fuente()
+    refresco = Refresco('prueba', fuente.cargar, fuente.sondear, intervalo=3600)
+    assert refresco.actual(espera=5) == ("datos v1", 1)
+
+    fuente.liberar.clear()
+    fuente.cargando.clear()
+    fuente.version = 2
+    refresco.pedir()
+    assert fuente.cargando.wait(5)
+    # La recarga está detenida dentro de cargar(): se sigue sirviendo la v1
+    assert refresco.actual(espera=0) == ("datos v1", 1)
+
+    fuente.liberar.set()
+    esperar_version(refresco, 2)
+    assert refresco.actual() == ("datos v2", 2)
+    assert refresco.ultima_carga['recargas'] == 2
+
+
+def test_sin_cambio_de_version_no_recarga():
+    fuente = Fuente()
+    refresco = Refresco('prueba', fuente.cargar, fuente.sondear, intervalo=3600)
+    refresco.actual(espera=5)
+    assert refresco.refrescar()
+    assert fuente.cargas == 1
+
+
+def test_error_conserva_el_valor_anterior():
+    fuente = Fuente()
+    refresco = Refresco('prueba', fuente.cargar, fuente.sondear, intervalo=3600)
+    refresco.actual(espera=5)
+
+    def fallar(version):
+        raise RuntimeError("base caída")
+
+    refresco._cargar = fallar
+    fuente.version = 2
+    assert not refresco.refrescar()
+    assert isinstance(refresco.error, RuntimeError)
+    assert refresco.actual()[0] == "datos v1"
@@ -0,0 +1,63 @@
+"""Ida y vuelta de los snapshots en disco."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from compactar import compactar, mes_anio
+import snapshots
+
+pytestmark = pytest.mark.skipif(not snapshots.ACTIVOS, reason="snapshots desactivados (sin pyarrow)")
+
+
+@pytest.fixture(autouse=True)
+def directorio(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots, 'DIR_SNAPSHOTS', str(tmp_path))
+
+
+def compras():
+    df = pd.DataFrame({
+        'id_compra': [1, 2, 3, 4],
+        'fecha_compra': pd.to_datetime(['2024-01-05', '2024-01-20', None, '2024-03-01']),
+        'monto': [10.5, 20.0, np.nan, 7.25],
+        'id_producto': [3.0, np.nan, 3.0, 8.0],
+        'ciudad': ['Cali', 'Lima', 'Cali', None],
+        'codigo': ['a1', 'b2', 'c3', 'd4'],
+    })
+    df['mes_anio'] = mes_anio(df['fecha_compra'])
+    return compactar(df)
+
+
+def test_ida_y_vuelta_conserva_tipos():
+    df = compras()
+    snapshots.guardar('ventas', 'k1', df)
+    leido = snapshots.leer('ventas', 'k1')
+    pd.testing.assert_frame_equal(leido, df)
+    assert leido['mes_anio'].cat.categories.dtype == df['mes_anio'].cat.categories.dtype
+    assert leido['id_producto'].dtype == df['id_producto'].dtype
+
+
+def test_dict_de_frames_y_frame_vacio():
+    datos = {'compras': compras(), 'vacio': compras().iloc[:0]}
+    snapshots.guardar('hotel', 'k1', datos)
+    leido = snapshots.leer('hotel', 'k1')
+    assert list(leido) == ['compras', 'vacio']
+    for nombre, df in datos.items():
+        pd.testing.assert_frame_equal(leido[nombre], df)
+
+
+def test_version_nueva_borra_la_anterior_y_ultimo_la_encuentra():
+    clave_1 = snapshots.clave('sqlite://', 'SELECT 1', version=1)
+    clave_2 = snapshots.clave('sqlite://', 'SELECT 1', version=2)
+    snapshots.guardar('ventas', clave_1, compras())
+    snapshots.guardar('ventas', clave_2, compras().iloc[:2])
+    assert snapshots.leer('ventas', clave_1) is None
+    clave, datos = snapshots.ultimo('ventas', 'sqlite://', 'SELECT 1')
+    assert clave == clave_2 and len(datos) == 2
+
+
+def test_cargar_crea_una_sola_vez():
+    llamadas = []
+    crear = lambda: llamadas.append(1) or compras()
+    snapshots.cargar('ventas', 'k1', crear)
+    pd.testing.assert_frame_equal(snapshots.cargar('ventas', 'k1', crear), compras())
+    assert len(llamadas) == 1
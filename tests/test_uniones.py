@@ -0,0 +1,62 @@
+"""unir_por_clave contra pd.merge."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from uniones import unir_por_clave
+
+TIPOS = pd.DataFrame({
+    'id_tipo': [3, 1, 2, 5],
+    'tipo': ['doble', 'simple', 'suite', 'familiar'],
+    'precio': [120.0, 80.0, 300.0, 200.0],
+})
+
+RESERVAS = pd.DataFrame({
+    'id_tipo': pd.array([1, 3, 7, None, 3, 2, 1], dtype='Int64'),   # 7 no existe, un nulo
+    'noches': [2, 1, 4, 3, 5, 1, 2],
+}, index=[10, 11, 12, 13, 14, 15, 16])
+
+
+def con_merge(df, tabla, clave, interna):
+    """pd.merge conservando el índice de ``df`` (unir_por_clave no lo reinicia)."""
+    unido = df.merge(tabla, on=clave, how='inner' if interna else 'left')
+    unido.index = df.index[df[clave].isin(tabla[clave])] if interna else df.index
+    return unido
+
+
+@pytest.mark.parametrize('interna', [False, True])
+@pytest.mark.parametrize('df', [
+    RESERVAS,
+    RESERVAS.iloc[:0],                                      # vacío
+    RESERVAS.iloc[[0]],                                     # una fila
+    RESERVAS.iloc[[2, 3]],                                  # ninguna coincide
+    RESERVAS.iloc[[0, 1, 4, 5]],                            # todas coinciden
+], ids=['todas', 'vacio', 'una', 'sin_coincidencias', 'completas'])
+def test_igual_a_merge(df, interna):
+    obtenido = unir_por_clave(df, TIPOS, 'id_tipo', interna=interna)
+    pd.testing.assert_frame_equal(obtenido, con_merge(df, TIPOS, 'id_tipo', interna),
+                                  check_dtype=False)
+
+
+def test_sin_coincidencia_queda_nulo():
+    obtenido = unir_por_clave(RESERVAS, TIPOS, 'id_tipo')
+    assert obtenido['tipo'].isna().tolist() == [False, False, True, True, False, False, False]
+    assert np.isnan(obtenido.loc[13, 'precio'])
+
+
+def test_tabla_de_busqueda_vacia():
+    obtenido = unir_por_clave(RESERVAS, TIPOS.iloc[:0], 'id_tipo')
+    assert obtenido['tipo'].isna().all() and len(obtenido) == len(RESERVAS)
+    assert unir_por_clave(RESERVAS, TIPOS.iloc[:0], 'id_tipo', interna=True).empty
+
+
+def test_solo_columnas_pedidas_y_sin_modificar():
+    antes = RESERVAS.copy()
+    obtenido = unir_por_clave(RESERVAS, TIPOS, 'id_tipo', columnas=['precio'])
+    assert list(obtenido.columns) == ['id_tipo', 'noches', 'precio']
+    pd.testing.assert_frame_equal(RESERVAS, antes)
+
+
+def test_clave_repetida():
+    with pytest.raises(ValueError):
+        unir_por_clave(RESERVAS, pd.concat([TIPOS, TIPOS.head(1)]), 'id_tipo')
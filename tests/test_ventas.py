@@ -0,0 +1,110 @@
+"""Carga incremental de ventas contra la carga completa, sobre una base SQLite chica."""
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+from conexion import get_engine
+from generar_datos import generar
+import snapshots
+import ventas
+import versiones
+
+
+@pytest.fixture
+def uri(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots, 'DIR_SNAPSHOTS', str(tmp_path / 'snapshots'))
+    monkeypatch.setattr(versiones, 'VIGENCIA', 0)
+    uri = f"sqlite:///{tmp_path / 'ventas.db'}"
+    generar('ventas', 300, uri, semilla=3)
+    return uri
+
+
+@pytest.fixture
+def lecturas(monkeypatch):
+    """Marcas de agua con las que se pidieron compras a la base."""
+    desde = []
+    leer = ventas.leer_ventas
+    monkeypatch.setattr(ventas, 'leer_ventas', lambda engine, ultimo_id: desde.append(ultimo_id)
+                        or leer(engine, ultimo_id))
+    return desde
+
+
+def ejecutar(uri, sql, **params):
+    with get_engine(uri).begin() as conn:
+        resultado = conn.execute(text(sql), params)
+        return resultado.scalar() if resultado.returns_rows else None
+
+
+def nueva_compra(uri, pago=None):
+    id_compra = ejecutar(uri, "SELECT MAX(id_compra) + 1 FROM compra")
+    ejecutar(uri, "INSERT INTO compra (id_compra, fecha_compra, monto, descuento, id_producto, id_cliente) "
+                  "SELECT :id, fecha_compra, monto, descuento, id_producto, id_cliente "
+                  "FROM compra WHERE id_compra = 1", id=id_compra)
+    if pago:
+        ejecutar(uri, f"INSERT INTO {pago} (id_compra) VALUES (:id)", id=id_compra)
+    return id_compra
+
+
+def compra_sin_pago(uri):
+    return ejecutar(uri, " ".join(
+        ["SELECT MIN(id_compra) FROM compra c WHERE 1 = 1"]
+        + [f"AND NOT EXISTS (SELECT 1 FROM {tabla} t WHERE t.id_compra = c.id_compra)"
+           for tabla in ('tipo_pago_qr', 'tipo_pago_tarjeta', 'tipo_pago_efectivo',
+                         'tipo_pago_transferencia')]
+    ))
+
+
+def filas(df):
+    """Filas como texto y en un orden fijo: el join puede repetir compras."""
+    texto = df.astype(str)
+    return texto.sort_values(list(texto.columns)).reset_index(drop=True)
+
+
+def assert_igual_a_carga_completa(uri, df):
+    completa = ventas.cargar(uri, incremental=False)
+    assert list(df.columns) == list(completa.columns)
+    pd.testing.assert_frame_equal(filas(df), filas(completa))
+
+
+def test_compras_nuevas_solo_piden_las_nuevas(uri, lecturas):
+    inicial = ventas.cargar(uri)
+    ultimo = int(inicial['id_compra'].max())
+    nueva_compra(uri)
+    nueva_compra(uri, pago='tipo_pago_qr')
+    df = ventas.cargar(uri)
+    assert lecturas == [0, ultimo]
+    assert len(df) > len(inicial)
+    assert_igual_a_carga_completa(uri, df)
+
+
+def test_pago_tardio_corrige_solo_el_tipo_de_pago(uri, lecturas):
+    inicial = ventas.cargar(uri)
+    id_compra = compra_sin_pago(uri)
+    assert set(inicial.loc[inicial['id_compra'] == id_compra, 'tipo_pago']) == {'SIN_REGISTRO'}
+
+    ejecutar(uri, "INSERT INTO tipo_pago_tarjeta (id_compra) VALUES (:id)", id=id_compra)
+    df = ventas.cargar(uri)
+    assert set(df.loc[df['id_compra'] == id_compra, 'tipo_pago']) == {'TARJETA'}
+    # El frame que ya tenían las sesiones no cambia
+    assert set(inicial.loc[inicial['id_compra'] == id_compra, 'tipo_pago']) == {'SIN_REGISTRO'}
+    assert lecturas == [0, int(inicial['id_compra'].max())]
+    assert_igual_a_carga_completa(uri, df)
+
+
+def test_reinicio_parte_del_snapshot(uri, lecturas):
+    ventas.cargar(uri)
+    nueva_compra(uri, pago='tipo_pago_efectivo')
+    antes = ventas.cargar(uri)
+    # Otro proceso (o un reinicio): sin estado en memoria
+    ventas.estado_ventas(uri).update(df=None, ultimo_id=0, marcas_pago=None, dimensiones=None)
+    df = ventas.cargar(uri)
+    assert lecturas[-1] == int(antes['id_compra'].max())
+    pd.testing.assert_frame_equal(df, antes)
+
+
+def test_dimension_nueva_recarga_todo(uri, lecturas):
+    ventas.cargar(uri)
+    ejecutar(uri, "INSERT INTO fabrica (pais, nombre) VALUES ('Chile', 'Nueva')")
+    df = ventas.cargar(uri)
+    assert lecturas == [0, 0]
+    assert_igual_a_carga_completa(uri, df)
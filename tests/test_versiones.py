@@ -0,0 +1,47 @@
+"""Los sondeos de versión cambian con cada tabla de origen de su dashboard."""
+import pytest
+from sqlalchemy import create_engine
+
+import consultas
+import generar_datos
+import versiones
+
+SONDEOS = [
+    pytest.param('fitness', consultas.VERSION_ASISTENCIAS, consultas.ORIGEN_ASISTENCIAS, id='fitness'),
+    pytest.param('ventas', consultas.VERSION_VENTAS, consultas.ORIGEN_VENTAS, id='ventas'),
+    pytest.param('ventas', consultas.DIMENSIONES_VENTAS, consultas.ORIGEN_DIMENSIONES_VENTAS,
+                 id='ventas-dimensiones'),
+    pytest.param('hotel', consultas.VERSION_HOTEL, consultas.ORIGEN_HOTEL, id='hotel'),
+    pytest.param('blog', consultas.VERSION_BLOG, consultas.ORIGEN_BLOG, id='blog'),
+]
+
+
+def base_vacia(esquema):
+    md = generar_datos.GENERADORES[esquema][0]()
+    engine = create_engine('sqlite://')
+    md.create_all(engine)
+    return engine, md
+
+
+def insertar(engine, md, tabla):
+    """Una fila con la clave primaria en 1 y lo demás NULL."""
+    tabla = md.tables[tabla]
+    with engine.begin() as conn:
+        conn.execute(tabla.insert().values({col.name: 1 for col in tabla.primary_key}))
+
+
+@pytest.mark.parametrize('esquema, sql, origen', SONDEOS)
+def test_cada_tabla_de_origen_cambia_la_version(esquema, sql, origen):
+    engine, md = base_vacia(esquema)
+    for tabla in origen:
+        antes = versiones.sondear(engine, sql)
+        insertar(engine, md, tabla)
+        assert versiones.sondear(engine, sql) != antes, tabla
+
+
+def test_dimensiones_de_ventas_no_cambian_con_compras_ni_pagos():
+    engine, md = base_vacia('ventas')
+    antes = versiones.sondear(engine, consultas.DIMENSIONES_VENTAS)
+    for tabla in set(consultas.ORIGEN_VENTAS) - set(consultas.ORIGEN_DIMENSIONES_VENTAS):
+        insertar(engine, md, tabla)
+    assert versiones.sondear(engine, consultas.DIMENSIONES_VENTAS) == antes
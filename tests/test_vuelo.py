@@ -0,0 +1,94 @@
+"""compartido: una sola ejecución por clave en vuelo."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import vuelo
+
+HILOS = 8
+
+
+class EventoContado(threading.Event):
+    """Event que cuenta cuántos hilos están esperándolo."""
+
+    def __init__(self):
+        super().__init__()
+        self.esperando = 0
+        self._contador = threading.Lock()
+
+    def wait(self, timeout=None):
+        with self._contador:
+            self.esperando += 1
+        return super().wait(timeout)
+
+
+class VueloContado(vuelo._Vuelo):
+    creados = []
+
+    def __init__(self):
+        super().__init__()
+        self.listo = EventoContado()
+        VueloContado.creados.append(self)
+
+
+@pytest.fixture
+def vuelos(monkeypatch):
+    VueloContado.creados = []
+    monkeypatch.setattr(vuelo, '_Vuelo', VueloContado)
+    return VueloContado.creados
+
+
+def en_vuelo(vuelos, cargar):
+    """Llama ``compartido`` desde HILOS hilos a la vez.
+
+    El cargador termina (con ``cargar()``) recién cuando los demás hilos ya
+    esperan su resultado.
+    """
+    soltar = threading.Event()
+    llamadas = []
+
+    def cargador():
+        llamadas.append(threading.current_thread().name)
+        assert soltar.wait(5)
+        return cargar()
+
+    with ThreadPoolExecutor(HILOS) as pool:
+        futuros = [pool.submit(vuelo.compartido, 'clave', cargador) for _ in range(HILOS)]
+        limite = time.monotonic() + 5
+        while not (vuelos and vuelos[0].listo.esperando == HILOS - 1):
+            assert time.monotonic() < limite, "los hilos no llegaron a esperar el vuelo"
+            time.sleep(0.001)
+        soltar.set()
+    return llamadas, futuros
+
+
+def test_un_solo_cargador_y_el_mismo_resultado(vuelos):
+    valor = object()
+    llamadas, futuros = en_vuelo(vuelos, lambda: valor)
+    assert len(llamadas) == 1
+    assert all(futuro.result() is valor for futuro in futuros)
+    assert len(vuelos) == 1 and vuelo._vuelos == {}
+
+
+def test_la_excepcion_llega_a_todos(vuelos):
+    error = RuntimeError("base caída")
+
+    def fallar():
+        raise error
+
+    llamadas, futuros = en_vuelo(vuelos, fallar)
+    assert len(llamadas) == 1
+    assert all(futuro.exception() is error for futuro in futuros)
+
+
+def test_al_terminar_la_siguiente_llamada_vuelve_a_ejecutar():
+    llamadas = []
+    for _ in range(2):
+        vuelo.compartido('clave', lambda: llamadas.append(1))
+    assert len(llamadas) == 2
+
+
+def test_claves_distintas_no_se_esperan():
+    assert vuelo.compartido('a', lambda: vuelo.compartido('b', lambda: 2)) == 2
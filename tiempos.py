@@ -0,0 +1,267 @@
+"""Tiempos por etapa de cada ejecución de los dashboards.
+
+Cada dashboard llama ``iniciar(nombre)`` al principio del script y
+``finalizar()`` al final. En el medio, las etapas se miden con
+
+    with tiempos.etapa("filtros"):
+        ...
+
+con el decorador ``@medido("tipos")``, o con ``registrar(etapa, segundos)``
+cuando el tiempo se acumula a mano (p. ej. la lectura en bloques, que
+alterna consulta y decodificación).
+
+Etapas:
+    consulta    SQL (incluye la transferencia de filas)
+    snapshot    lectura de un snapshot Arrow en disco
+    tipos       decodificación a dtypes, compactación y columnas derivadas
+    filtros     máscaras / índices de filtrado
+    agregacion  groupby y resúmenes (aciertos del cache incluidos, ~0 s)
+    figura      armado de la figura de Plotly
+    envio       serialización al navegador (st.plotly_chart / st.dataframe)
+    panel       total de un panel (contiene las anteriores)
+    carga       espera de una sesión a la primera carga en segundo plano
+                (refresco.py)
+
+``finalizar()`` agrega una línea JSON por ejecución a ``TIEMPOS_LOG`` y, si
+está habilitado, dibuja en el sidebar el panel "⏱ Rendimiento" con el
+desglose de esa ejecución y las métricas de checkout del pool de cada
+engine (``conexion.metricas``, acumuladas desde el arranque del proceso). El panel está oculto: se muestra con
+``?rendimiento=1`` en la URL o con ``RENDIMIENTO_PANEL=1``.
+
+Las ejecuciones solo de un fragment (un panel que se vuelve a ejecutar
+solo) se registran como ejecuciones propias desde ``paneles.py``.
+
+Fuera de una sesión de Streamlit (scripts, hilos propios) no se registra
+nada, salvo dentro de ``capturar()``: así ``refresco.py`` junta los spans de
+cada carga en segundo plano y la sesión los muestra con ``anotar_carga``.
+
+Variables de entorno:
+    TIEMPOS_LOG (datos/tiempos.jsonl; vacío para no escribir)
+    RENDIMIENTO_PANEL (0)
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+ARCHIVO_LOG = os.environ.get('TIEMPOS_LOG', os.path.join('datos', 'tiempos.jsonl'))
+PANEL_SIEMPRE = os.environ.get('RENDIMIENTO_PANEL', '0') == '1'
+
+ETAPAS = ['consulta', 'snapshot', 'tipos', 'filtros', 'agregacion', 'figura', 'envio', 'carga']
+# Sesiones cuya ejecución se recuerda (las sesiones cerradas no avisan)
+MAX_SESIONES = 500
+
+_ejecuciones = OrderedDict()
+_lock = threading.Lock()
+_lock_log = threading.Lock()
+_captura = threading.local()
+
+
+def _contexto():
+    return get_script_run_ctx(suppress_warning=True)
+
+
+def _actual():
+    ctx = _contexto()
+    if ctx is None:
+        return None
+    with _lock:
+        return _ejecuciones.get(ctx.session_id)
+
+
+def _pool():
+    # Import local: conexion importa tiempos
+    from conexion import metricas
+    from sqlalchemy.engine import make_url
+    return {make_url(uri).render_as_string(hide_password=True): m
+            for uri, m in metricas().items()}
+
+
+def _escribir(ejecucion):
+    if not ARCHIVO_LOG:
+        return
+    linea = json.dumps({
+        'inicio': ejecucion['inicio'],
+        'sesion': ejecucion['sesion'],
+        'dashboard': ejecucion['dashboard'],
+        'panel': ejecucion['panel'],
+        'total': round(ejecucion['total'], 6),
+        'etapas': {k: round(v, 6) for k, v in desglose(ejecucion).items()},
+        'spans': [[e, d, round(s, 6)] for e, d, s in ejecucion['spans']],
+        'cargas': ejecucion['cargas'],
+        'pool': _pool(),
+    }, ensure_ascii=False, default=str)
+    directorio = os.path.dirname(ARCHIVO_LOG)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with _lock_log, open(ARCHIVO_LOG, 'a', encoding='utf-8') as f:
+        f.write(linea + '\n')
+
+
+def _cerrar(ejecucion):
+    if ejecucion is None or ejecucion['escrita']:
+        return
+    ejecucion['total'] = time.perf_counter() - ejecucion['t0']
+    ejecucion['escrita'] = True
+    _escribir(ejecucion)
+
+
+def iniciar(dashboard, panel=None):
+    """Abre la ejecución actual de la sesión (y cierra la anterior si quedó abierta)."""
+    ctx = _contexto()
+    if ctx is None:
+        return
+    with _lock:
+        anterior = _ejecuciones.pop(ctx.session_id, None)
+        _ejecuciones[ctx.session_id] = {
+            'sesion': ctx.session_id,
+            'dashboard': dashboard,
+            'panel': panel,
+            'inicio': datetime.now().isoformat(timespec='milliseconds'),
+            't0': time.perf_counter(),
+            'spans': [],
+            'cargas': {},
+            'total': 0.0,
+            'escrita': False,
+        }
+        while len(_ejecuciones) > MAX_SESIONES:
+            _ejecuciones.popitem(last=False)
+    # Una ejecución cortada por st.stop() no llegó a finalizar()
+    _cerrar(anterior)
+
+
+def registrar(etapa, segundos, detalle=None):
+    """Agrega ``segundos`` a la ejecución actual (fuera de una sesión, a ``capturar``)."""
+    ejecucion = _actual()
+    if ejecucion is not None:
+        if not ejecucion['escrita']:
+            ejecucion['spans'].append((etapa, detalle, segundos))
+        return
+    spans = getattr(_captura, 'spans', None)
+    if spans is not None:
+        spans.append((etapa, detalle, segundos))
+
+
+@contextmanager
+def capturar():
+    """Junta en una lista los spans que registra este hilo fuera de una sesión."""
+    anterior = getattr(_captura, 'spans', None)
+    _captura.spans = spans = []
+    try:
+        yield spans
+    finally:
+        _captura.spans = anterior
+
+
+def anotar_carga(nombre, carga):
+    """Asocia a la ejecución actual la última carga en segundo plano de ``nombre``."""
+    ejecucion = _actual()
+    if ejecucion is not None and carga is not None:
+        ejecucion['cargas'][nombre] = carga
+
+
+@contextmanager
+def etapa(nombre, detalle=None):
+    """Mide el bloque como la etapa ``nombre`` de la ejecución actual."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar(nombre, time.perf_counter() - t0, detalle)
+
+
+def medido(nombre, detalle=None):
+    """Decorador: mide cada llamada a la función como la etapa ``nombre``."""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltorio(*args, **kwargs):
+            with etapa(nombre, detalle or funcion.__name__):
+                return funcion(*args, **kwargs)
+        return envoltorio
+    return decorador
+
+
+def desglose(ejecucion):
+    """Segundos por etapa (sin los totales de panel, que las contienen)."""
+    por_etapa = dict.fromkeys(ETAPAS, 0.0)
+    for nombre, _, segundos in ejecucion['spans']:
+        if nombre != 'panel':
+            por_etapa[nombre] = por_etapa.get(nombre, 0.0) + segundos
+    por_etapa['otros'] = max(ejecucion['total'] - sum(por_etapa.values()), 0.0)
+    return por_etapa
+
+
+def plotly_chart(fig, **kwargs):
+    """``st.plotly_chart`` midiendo la serialización de la figura."""
+    with etapa('envio', 'grafico'):
+        return st.plotly_chart(fig, **kwargs)
+
+
+@contextmanager
+def fragmento(nombre):
+    """Mide un panel; si se ejecuta solo (rerun del fragment) es una ejecución propia."""
+    ctx = _contexto()
+    anterior = _actual()
+    solo = ctx is not None and bool(ctx.fragment_ids_this_run) and anterior is not None
+    if solo:
+        iniciar(anterior['dashboard'], panel=nombre)
+    try:
+        with etapa('panel', nombre):
+            yield
+    finally:
+        if solo:
+            _cerrar(_actual())
+
+
+def _visible():
+    if PANEL_SIEMPRE:
+        return True
+    return st.query_params.get('rendimiento') == '1'
+
+
+def finalizar():
+    """Cierra la ejecución actual, la escribe en el log y dibuja el panel si está visible."""
+    ejecucion = _actual()
+    if ejecucion is None:
+        return
+    _cerrar(ejecucion)
+    if not _visible():
+        return
+
+    with st.sidebar.expander("⏱ Rendimiento (última ejecución)"):
+        por_etapa = desglose(ejecucion)
+        st.metric("Total", f"{ejecucion['total'] * 1000:,.0f} ms")
+        st.dataframe(
+            pd.DataFrame({
+                'etapa': list(por_etapa),
+                'ms': [round(s * 1000, 1) for s in por_etapa.values()],
+            }),
+            hide_index=True, use_container_width=True,
+        )
+        detalle = pd.DataFrame(ejecucion['spans'], columns=['etapa', 'detalle', 'segundos'])
+        if not detalle.empty:
+            detalle['ms'] = (detalle.pop('segundos') * 1000).round(1)
+            st.dataframe(detalle, hide_index=True, use_container_width=True)
+        for nombre, carga in ejecucion['cargas'].items():
+            st.caption(f"Última carga en segundo plano de {nombre}: "
+                       f"{carga['segundos'] * 1000:,.0f} ms ({carga['fin']})")
+            spans = pd.DataFrame(carga['spans'], columns=['etapa', 'detalle', 'segundos'])
+            if not spans.empty:
+                spans['ms'] = (spans.pop('segundos') * 1000).round(1)
+                st.dataframe(spans, hide_index=True, use_container_width=True)
+        pool = pd.DataFrame.from_dict(_pool(), orient='index')
+        if not pool.empty:
+            st.caption("Pool de conexiones (desde el arranque del proceso)")
+            pool['segundos_en_uso'] = pool['segundos_en_uso'].round(3)
+            st.dataframe(pool.rename_axis('engine').reset_index(),
+                         hide_index=True, use_container_width=True)
+        if ARCHIVO_LOG:
+            st.caption(f"Log: {ARCHIVO_LOG}")
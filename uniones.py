@@ -0,0 +1,47 @@
+"""Joins por clave entera con tablas de búsqueda chicas.
+
+``unir_por_clave`` agrega a un frame las columnas de una tabla cuya clave
+es única (una dimensión: tipos de habitación, métodos de pago...). No
+arma un hash join general como ``pd.merge``: busca cada clave en el
+índice de la dimensión (``get_indexer``) y copia las columnas con un
+``take`` por posición, sin reordenar ni duplicar filas.
+
+Para relaciones uno a muchos (un detalle con varios servicios) sigue
+haciendo falta ``pd.merge``.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+
+
+def posiciones(claves, tabla, clave):
+    """Posición en ``tabla`` de cada valor de ``claves`` (-1 si no está o es nulo)."""
+    indice = pd.Index(tabla[clave])
+    if not indice.is_unique:
+        raise ValueError(f"La clave '{clave}' de la tabla de búsqueda tiene valores repetidos")
+    return indice.get_indexer(claves)
+
+
+def unir_por_clave(df, tabla, clave, columnas=None, interna=False):
+    """``df`` con las ``columnas`` de ``tabla`` (todas menos la clave) según ``df[clave]``.
+
+    Sin coincidencia la fila queda con nulos (LEFT JOIN), o se descarta si
+    ``interna`` (JOIN). ``df`` no se modifica.
+    """
+    if columnas is None:
+        columnas = [col for col in tabla.columns if col != clave]
+    pos = posiciones(df[clave], tabla, clave)
+    if interna:
+        encontradas = pos >= 0
+        if not encontradas.all():
+            df, pos = df[encontradas], pos[encontradas]
+    faltan = (pos < 0).any()
+
+    nuevas = {}
+    for col in columnas:
+        valores = tabla[col].to_numpy()
+        if faltan:
+            nuevas[col] = take(valores, pos, allow_fill=True)
+        else:
+            nuevas[col] = valores[pos]
+    return df.assign(**{col: np.asarray(v) for col, v in nuevas.items()})
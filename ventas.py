@@ -0,0 +1,200 @@
+"""Carga de las compras (graficos.py).
+
+Fuera del script para que la usen tanto el dashboard (a través de
+``refresco.py``) como ``precalentar.py``. La carga es incremental: las
+compras son solo de inserción, así que cada recarga pide las filas con
+``id_compra`` mayor a la marca de agua y calcula las columnas derivadas
+solo para ellas. Las tablas de pago también son solo de inserción: un pago
+que llega después de su compra se detecta por la marca de agua de cada
+tabla de pago y solo se corrige el tipo de pago de esas compras. Solo un
+cambio en las dimensiones (``DIMENSIONES_VENTAS``: catálogos y clientes)
+obliga a volver a cargar todo.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from compactar import compactar, concatenar, mes_anio
+from conexion import get_engine, leer_en_bloques
+from consultas import (
+    COLUMNAS_PAGOS_TARDIOS, COLUMNAS_VENTAS, DIMENSIONES_VENTAS, MARCAS_PAGO,
+    ORIGEN_DIMENSIONES_VENTAS, ORIGEN_VENTAS, PAGOS_VENTAS, QUERY_PAGOS_TARDIOS,
+    QUERY_VENTAS, VERSION_VENTAS,
+)
+import snapshots
+import tiempos
+import versiones
+
+_estados = {}
+_lock = threading.Lock()
+
+# Textos por defecto de las columnas que vienen NULL por los LEFT JOIN
+RELLENO_VENTAS = {
+    'descuento': 0.0,
+    'pais_fabrica': 'Sin país',
+    'ciudad_cliente': 'Sin ciudad',
+    'ciudad_sucursal': 'Sin sucursal',
+    'tipo_pago': 'SIN_REGISTRO',
+}
+
+
+@tiempos.medido('tipos')
+def preparar_ventas(df):
+    """Nulos y columnas derivadas de un bloque de compras ya tipado."""
+    df = df.fillna(RELLENO_VENTAS)
+    df['monto_neto'] = df['monto'] - df['descuento']
+
+    # Columnas derivadas de fecha
+    df['anio'] = df['fecha_compra'].dt.year
+    df['mes'] = df['fecha_compra'].dt.month
+    df['dia'] = df['fecha_compra'].dt.day
+    df['mes_anio'] = mes_anio(df['fecha_compra'])  # ej: 2025-03
+
+    return df
+
+
+def leer_ventas(engine, ultimo_id):
+    """Compras con id_compra > ultimo_id, decodificadas a su tipo declarado."""
+    return leer_en_bloques(engine, QUERY_VENTAS, COLUMNAS_VENTAS,
+                           params={"ultimo_id": ultimo_id})
+
+
+def estado_ventas(db_uri):
+    """Estado de la carga incremental del proceso: frame acumulado y marcas de agua."""
+    with _lock:
+        return _estados.setdefault(db_uri, {
+            "lock": threading.Lock(),
+            "df": None,
+            "ultimo_id": 0,
+            "ultima_fecha": None,
+            "marcas_pago": None,
+            "dimensiones": None,
+        })
+
+
+def version(db_uri):
+    """Versión actual de las compras (sondeo de ``VERSION_VENTAS``)."""
+    return versiones.actual(get_engine(db_uri), VERSION_VENTAS, ORIGEN_VENTAS)
+
+
+def version_dimensiones(engine):
+    """Versión de las dimensiones (catálogos y clientes), sin compras ni pagos."""
+    return versiones.actual(engine, DIMENSIONES_VENTAS, ORIGEN_DIMENSIONES_VENTAS)
+
+
+def marcas_pago(engine):
+    """Último id de cada tabla de pago (``MARCAS_PAGO`` -> id)."""
+    with engine.connect() as conn:
+        fila = conn.execute(text(PAGOS_VENTAS)).one()
+    return dict(zip(MARCAS_PAGO, (int(v) for v in fila)))
+
+
+@tiempos.medido('tipos')
+def aplicar_pagos(df, pagos):
+    """``df`` con el tipo de pago de ``pagos`` (id_compra, tipo_pago). No modifica ``df``."""
+    tipos = (pagos.drop_duplicates('id_compra').set_index('id_compra')['tipo_pago']
+             .fillna(RELLENO_VENTAS['tipo_pago']))
+    afectadas = np.flatnonzero(df['id_compra'].isin(tipos.index).to_numpy())
+    if afectadas.size == 0:
+        return df
+    nuevos = df['id_compra'].iloc[afectadas].map(tipos).to_numpy()
+    columna = df['tipo_pago']
+    if isinstance(columna.dtype, pd.CategoricalDtype):
+        extra = pd.Index(nuevos).unique().difference(columna.cat.categories)
+        if len(extra):
+            columna = columna.cat.add_categories(extra)
+    columna = columna.copy()
+    columna.iloc[afectadas] = nuevos
+    # Las demás columnas se comparten con el frame anterior (copy-on-write)
+    return df.assign(tipo_pago=columna)
+
+
+def cargar_incremental(db_uri, estado, version_datos=None):
+    """Agrega al frame las compras nuevas y corrige el tipo de pago de las que recibieron pagos.
+
+    ``version_datos`` (el sondeo de ``VERSION_VENTAS``) no se usa: el
+    avance se decide con las marcas de agua. Solo un cambio en las
+    dimensiones obliga a cargar todo de nuevo.
+    """
+    engine = get_engine(db_uri)
+    # Los snapshots incrementales son de unas dimensiones dadas: van en la
+    # clave de la consulta, así que con otras no se encuentra ninguno
+    params = {"dimensiones": version_dimensiones(engine)}
+    with estado["lock"]:
+        if estado["dimensiones"] != params["dimensiones"]:
+            estado.update(df=None, ultimo_id=0, ultima_fecha=None, marcas_pago=None,
+                          dimensiones=params["dimensiones"])
+
+        if estado["df"] is None:
+            # Arranque del proceso: se parte del último snapshot en disco (de
+            # otra réplica o de antes del reinicio) y solo se piden las nuevas
+            _, previo = snapshots.ultimo("ventas", db_uri, QUERY_VENTAS, params)
+            if previo is not None and not previo["compras"].empty:
+                estado["df"] = previo["compras"]
+                estado["ultimo_id"] = int(previo["compras"]['id_compra'].max())
+                estado["ultima_fecha"] = previo["compras"]['fecha_compra'].max()
+                estado["marcas_pago"] = previo["marcas"].iloc[0].astype(int).to_dict()
+
+        # Las marcas se leen antes que las filas: un pago que llega entre
+        # medio se vuelve a aplicar en la próxima carga (es idempotente)
+        marcas = marcas_pago(engine)
+        ultimo_id = estado["ultimo_id"]
+        df = estado["df"]
+
+        nuevas = leer_ventas(engine, ultimo_id)
+        # Las compras son solo de inserción: las columnas derivadas se calculan
+        # únicamente para las filas nuevas.
+        nuevas = compactar(preparar_ventas(nuevas), "ventas")
+
+        cambios = not nuevas.empty
+        if df is not None and estado["marcas_pago"] != marcas:
+            # Pagos registrados después de su compra: solo se vuelve a pedir
+            # el tipo de pago de esas compras
+            pagos = leer_en_bloques(engine, QUERY_PAGOS_TARDIOS, COLUMNAS_PAGOS_TARDIOS,
+                                    params={"ultimo_id": ultimo_id, **estado["marcas_pago"]})
+            if not pagos.empty:
+                df = aplicar_pagos(df, pagos)
+                cambios = True
+
+        if df is None:
+            df = nuevas
+        elif not nuevas.empty:
+            df = concatenar(df, nuevas)
+
+        estado["df"] = df
+        estado["marcas_pago"] = marcas
+        if not nuevas.empty:
+            estado["ultimo_id"] = int(nuevas['id_compra'].max())
+            estado["ultima_fecha"] = nuevas['fecha_compra'].max()
+        if cambios:
+            # Las marcas de agua son la versión del snapshot
+            snapshots.guardar(
+                "ventas",
+                snapshots.clave(db_uri, QUERY_VENTAS, params,
+                                version=(estado["ultimo_id"], marcas)),
+                {"compras": df, "marcas": pd.DataFrame([marcas])},
+            )
+        return df
+
+
+def cargar(db_uri, version_datos=None, incremental=True):
+    """Compras de ``db_uri`` ya preparadas.
+
+    En modo incremental solo se consultan las compras nuevas (id_compra >
+    último cargado) y se agregan al frame ya cargado; el frame inicial de
+    cada proceso sale del último snapshot en disco.
+    """
+    if incremental:
+        return cargar_incremental(db_uri, estado_ventas(db_uri), version_datos)
+
+    engine = get_engine(db_uri)
+    if version_datos is None:
+        version_datos = version(db_uri)
+    # Otro nombre que el incremental: publicar uno no borra el otro
+    return snapshots.cargar(
+        "ventas_completa",
+        snapshots.clave(db_uri, QUERY_VENTAS, version=version_datos),
+        lambda: compactar(preparar_ventas(leer_ventas(engine, 0)), "ventas"),
+    )
@@ -0,0 +1,65 @@
+"""Sondeos de versión: detectan si cambiaron las tablas de un dashboard.
+
+Cada dashboard tiene una consulta ``VERSION_*`` (consultas.py) con un valor
+barato por tabla de origen (MAX de la PK de los hechos, COUNT de los
+catálogos) que cambia cuando cambian los datos. Los caches se indexan por
+esa versión en lugar de vencer a los 600 s: sin cambios no se recarga
+nada, y una ráfaga de inserciones se ve en el siguiente sondeo.
+
+En MySQL/MariaDB se agrega ``UPDATE_TIME`` de ``information_schema.TABLES``
+para las tablas ``ORIGEN_*`` del dashboard, que además detecta UPDATE y
+DELETE sobre filas ya cargadas (en InnoDB es NULL tras reiniciar el
+servidor hasta la próxima escritura; el resto del sondeo sigue valiendo).
+No se usa ``CHECKSUM TABLE``: sin ``CHECKSUM=1`` en la tabla recorre todas
+sus filas.
+
+Los dashboards sondean en cada ejecución. ``actual`` reutiliza el último
+resultado durante ``SONDEO_SEGUNDOS`` y las sesiones que sondean a la vez
+comparten una sola consulta (vuelo.py).
+
+Variables de entorno:
+    SONDEO_SEGUNDOS (2)
+"""
+import os
+import threading
+import time
+
+from sqlalchemy import bindparam, text
+
+import tiempos
+import vuelo
+
+VIGENCIA = float(os.environ.get('SONDEO_SEGUNDOS', '2'))
+
+SQL_UPDATE_TIME = text(
+    "SELECT TABLE_NAME, UPDATE_TIME FROM information_schema.TABLES "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN :tablas"
+).bindparams(bindparam('tablas', expanding=True))
+
+_ultimos = {}
+_lock = threading.Lock()
+
+
+@tiempos.medido('consulta', 'version_datos')
+def sondear(engine, sql, tablas=()):
+    """Versión de los datos según la consulta de sondeo ``sql`` (sin reutilizar)."""
+    with engine.connect() as conn:
+        partes = [str(v) for v in conn.execute(text(sql)).one()]
+        if tablas and engine.dialect.name in ('mysql', 'mariadb'):
+            filas = conn.execute(SQL_UPDATE_TIME, {'tablas': list(tablas)}).all()
+            partes += [f"{tabla}@{hora}" for tabla, hora in sorted(filas)]
+    return '|'.join(partes)
+
+
+def actual(engine, sql, tablas=(), vigencia=None):
+    """Versión de los datos, sondeada como mucho cada ``vigencia`` segundos."""
+    vigencia = VIGENCIA if vigencia is None else vigencia
+    clave = (engine.url, sql)
+    with _lock:
+        previo = _ultimos.get(clave)
+    if previo is not None and time.monotonic() - previo[0] < vigencia:
+        return previo[1]
+    version = vuelo.compartido(('version',) + clave, lambda: sondear(engine, sql, tablas))
+    with _lock:
+        _ultimos[clave] = (time.monotonic(), version)
+    return version
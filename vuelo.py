@@ -0,0 +1,78 @@
+"""Una sola carga en vuelo por clave (single-flight).
+
+Cuando vence una carga en hora pico, cada sesión que se ejecuta en ese
+momento disparaba su propia copia de la consulta pesada. Con
+``compartido(clave, funcion)`` solo el primero que llega ejecuta
+``funcion``; los que llegan mientras tanto esperan y reciben el mismo
+resultado (o la misma excepción). No es un cache: al terminar, la
+siguiente llamada vuelve a ejecutar.
+
+``bloqueo_archivo(ruta)`` extiende lo mismo a todos los procesos del host
+(réplicas del dashboard, ``precalentar.py``) con un ``flock`` exclusivo.
+Lo usa ``snapshots.cargar``: quien obtiene el bloqueo consulta y publica
+el snapshot, y los demás, al obtenerlo después, lo leen de disco.
+
+Sin ``fcntl`` (Windows) el bloqueo de archivo no hace nada y la
+coalescencia queda solo dentro de cada proceso.
+"""
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - fcntl solo existe en POSIX
+    fcntl = None
+
+_vuelos = {}
+_lock = threading.Lock()
+
+
+class _Vuelo:
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado = None
+        self.error = None
+
+
+def compartido(clave, funcion):
+    """Resultado de ``funcion()``; si ya hay una en vuelo para ``clave``, espera esa."""
+    with _lock:
+        vuelo = _vuelos.get(clave)
+        lider = vuelo is None
+        if lider:
+            vuelo = _vuelos[clave] = _Vuelo()
+
+    if not lider:
+        vuelo.listo.wait()
+        if vuelo.error is not None:
+            raise vuelo.error
+        return vuelo.resultado
+
+    try:
+        vuelo.resultado = funcion()
+        return vuelo.resultado
+    except BaseException as e:
+        vuelo.error = e
+        raise
+    finally:
+        with _lock:
+            del _vuelos[clave]
+        vuelo.listo.set()
+
+
+@contextmanager
+def bloqueo_archivo(ruta):
+    """Bloqueo exclusivo entre procesos del host sobre ``ruta`` (se crea si falta)."""
+    if fcntl is None:
+        yield
+        return
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with open(ruta, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)